@@ -0,0 +1,303 @@
+"""Offline benchmark of the web download engines against a shaped local HTTP server.
+
+Every scenario is served by a local server that can add latency, cap the bandwidth
+of each connection, turn Range support off and drop connections at random. Each
+engine/scenario pair runs in a fresh worker process, so CPU time and peak RSS are
+measured per run.
+
+Usage:
+    python benchmarks/http_benchmark.py                         # Run the default suite, print JSON
+    python benchmarks/http_benchmark.py -o results.json         # Save the results
+    python benchmarks/http_benchmark.py --compare baseline.json # Flag regressions against a baseline
+    python benchmarks/http_benchmark.py --scenario large --engine threaded --repeat 3
+"""
+import os
+import sys
+import json
+import time
+import random
+import socket
+import argparse
+import platform
+import tempfile
+import threading
+import subprocess
+import contextlib
+import statistics
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+MiB = 1024 * 1024
+
+# name -> server shaping and download settings
+SCENARIOS = {
+    "small": {"size": 1 * MiB},
+    "medium": {"size": 16 * MiB},
+    "large": {"size": 128 * MiB},
+    "latency": {"size": 16 * MiB, "latency": 0.05},
+    "capped": {"size": 16 * MiB, "bandwidth": 8 * MiB},
+    "no-range": {"size": 16 * MiB, "ranges": False},
+    "drops": {"size": 16 * MiB, "drop_rate": 0.05},
+    "fan-out": {"size": 256 * 1024, "count": 200, "latency": 0.01},
+}
+
+ENGINES = ("single", "threaded", "async")
+
+# Metrics compared against a baseline, and whether higher values are better
+METRICS = {"mbps": True, "ttfb": False, "cpu_seconds": False, "peak_rss_mb": False}
+
+# Absolute changes below these are treated as noise, whatever the relative change
+NOISE_FLOOR = {"mbps": 1.0, "ttfb": 0.01, "cpu_seconds": 0.05, "peak_rss_mb": 5.0}
+
+# Synthetic file contents, repeated as needed
+BLOCK = bytes(range(256)) * 4096
+
+
+class ShapedHandler(BaseHTTPRequestHandler):
+    """Serves /<size>/<name>.bin with the shaping options of the server."""
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, format, *args):
+        pass
+
+    def do_GET(self):
+        options = self.server.options
+        try:
+            size = int(self.path.strip("/").split("/")[0])
+        except ValueError:
+            self.send_error(404)
+            return
+
+        if options.get("latency"):
+            time.sleep(options["latency"])
+
+        start, end = 0, size - 1
+        range_header = self.headers.get("Range")
+        if range_header and options.get("ranges", True):
+            first, _, last = range_header.replace("bytes=", "").partition("-")
+            start = int(first)
+            end = min(int(last), size - 1) if last else size - 1
+            self.send_response(206)
+            self.send_header("Content-Range", f"bytes {start}-{end}/{size}")
+        else:
+            self.send_response(200)
+        self.send_header("Content-Length", str(end - start + 1))
+        self.send_header("ETag", '"benchmark"')
+        if options.get("ranges", True):
+            self.send_header("Accept-Ranges", "bytes")
+        self.end_headers()
+
+        # Drop the connection part way through some responses
+        drop_at = None
+        if random.random() < options.get("drop_rate", 0):
+            drop_at = start + random.randint(0, end - start)
+
+        bandwidth = options.get("bandwidth")
+        sent_since = time.monotonic()
+        position = start
+        while position <= end:
+            piece = min(64 * 1024, end - position + 1, len(BLOCK) - position % len(BLOCK))
+            if drop_at is not None and position + piece > drop_at:
+                self.connection.shutdown(socket.SHUT_RDWR)
+                self.close_connection = True
+                return
+            offset = position % len(BLOCK)
+            self.wfile.write(BLOCK[offset:offset + piece])
+            position += piece
+            if bandwidth:
+                # Pace this connection to the bandwidth cap
+                ahead = (position - start) / bandwidth - (time.monotonic() - sent_since)
+                if ahead > 0:
+                    time.sleep(ahead)
+
+
+class ShapedServer(ThreadingHTTPServer):
+    daemon_threads = True
+    request_queue_size = 512  # Room for the async engine's burst of connections
+
+    def __init__(self, options):
+        super().__init__(("127.0.0.1", 0), ShapedHandler)
+        self.options = options
+
+    def handle_error(self, request, client_address):
+        # Clients closing connections early is expected, e.g. after a range probe
+        pass
+
+
+def run_worker(spec):
+    """Run one download in this process and return its measurements."""
+    sys.path.insert(0, REPO_ROOT)
+    import video_downloader
+
+    downloader = video_downloader.VideoDownloader()
+    downloader.progress_interval = 0
+    downloader.connections = spec.get("connections", 4) if spec["engine"] != "single" else 1
+    output_path = spec["output_path"]
+
+    first_data = []
+    start = time.perf_counter()
+    cpu_start = time.process_time()
+
+    def on_progress(event):
+        if not first_data and event.downloaded_bytes:
+            first_data.append(time.perf_counter())
+
+    downloader.add_progress_listener(on_progress)
+
+    # Keep the downloader's own messages out of the JSON output
+    with contextlib.redirect_stdout(sys.stderr):
+        if spec["engine"] == "async":
+            jobs = downloader.download_web_videos(spec["urls"], output_path)
+            ok = all(job.status == "completed" for job in jobs)
+        elif len(spec["urls"]) == 1:
+            ok = bool(downloader.download_web_video(spec["urls"][0], output_path))
+        else:
+            queue = video_downloader.DownloadQueue(downloader, max_workers=spec.get("jobs", 8))
+            for url in spec["urls"]:
+                queue.submit(url, output_path=output_path)
+            queue.wait_all()
+            queue.shutdown()
+            ok = all(job.status == "completed" for job in queue.list_jobs())
+
+    seconds = time.perf_counter() - start
+    cpu_seconds = time.process_time() - cpu_start
+    downloader.close()
+
+    total = sum(entry.stat().st_size for entry in os.scandir(output_path) if entry.name.endswith(".bin"))
+    expected = spec["size"] * len(spec["urls"])
+    result = {
+        "ok": ok and total == expected,
+        "bytes": total,
+        "seconds": round(seconds, 4),
+        "mbps": round(total / seconds / 1e6, 2) if seconds else None,
+        "ttfb": round(first_data[0] - start, 4) if first_data else None,
+        "cpu_seconds": round(cpu_seconds, 4),
+        "peak_rss_mb": peak_rss_mb(),
+    }
+    if not result["ok"]:
+        result["error"] = f"Downloaded {total} of {expected} bytes"
+    return result
+
+
+def peak_rss_mb():
+    try:
+        import resource
+    except ImportError:
+        return None  # Not available on Windows
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports KiB, macOS bytes
+    return round(peak / (MiB if sys.platform == "darwin" else 1024), 1)
+
+
+def run_scenario(name, engine, repeat=1):
+    """Serve one scenario and download it with one engine, repeat times. Returns the median run."""
+    options = SCENARIOS[name]
+    server = ShapedServer(options)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    base = f"http://127.0.0.1:{server.server_address[1]}"
+    urls = [f"{base}/{options['size']}/{name}-{i}.bin" for i in range(options.get("count", 1))]
+
+    runs = []
+    try:
+        for _ in range(repeat):
+            with tempfile.TemporaryDirectory() as output_path:
+                spec = {"engine": engine, "urls": urls, "size": options["size"], "output_path": output_path}
+                # Each run gets a fresh process, so CPU time and peak RSS are its own
+                process = subprocess.run([sys.executable, os.path.abspath(__file__), "--worker", json.dumps(spec)],
+                                         capture_output=True, text=True)
+                if process.returncode != 0:
+                    runs.append({"ok": False, "error": process.stderr.strip().splitlines()[-1:]})
+                    continue
+                runs.append(json.loads(process.stdout.strip().splitlines()[-1]))
+    finally:
+        server.shutdown()
+        server.server_close()
+
+    result = {"scenario": name, "engine": engine, "files": len(urls), "size": options["size"], "runs": len(runs)}
+    good = [run for run in runs if run.get("ok")]
+    if not good:
+        result.update(ok=False, error=runs[-1].get("error") if runs else None)
+        return result
+    result["ok"] = len(good) == len(runs)
+    for key in ("seconds", "mbps", "ttfb", "cpu_seconds", "peak_rss_mb"):
+        values = [run[key] for run in good if run.get(key) is not None]
+        result[key] = statistics.median(values) if values else None
+    return result
+
+
+def compare(results, baseline, threshold):
+    """Return the metrics that got worse than the baseline by more than threshold (a fraction)."""
+    previous = {(r["scenario"], r["engine"]): r for r in baseline.get("results", [])}
+    regressions = []
+    for result in results:
+        old = previous.get((result["scenario"], result["engine"]))
+        if not old:
+            continue
+        if old.get("ok") and not result.get("ok"):
+            regressions.append({"scenario": result["scenario"], "engine": result["engine"], "metric": "ok",
+                                "baseline": True, "current": False})
+            continue
+        for metric, higher_is_better in METRICS.items():
+            before, now = old.get(metric), result.get(metric)
+            if not before or now is None or abs(now - before) < NOISE_FLOOR[metric]:
+                continue
+            change = (now - before) / before
+            if (-change if higher_is_better else change) > threshold:
+                regressions.append({"scenario": result["scenario"], "engine": result["engine"], "metric": metric,
+                                    "baseline": before, "current": now, "change": round(change, 3)})
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the web download engines against a shaped local server")
+    parser.add_argument("--scenario", action="append", choices=sorted(SCENARIOS),
+                        help="Scenario to run, can be repeated (default: all)")
+    parser.add_argument("--engine", action="append", choices=ENGINES,
+                        help="Engine to run, can be repeated (default: all)")
+    parser.add_argument("--repeat", type=int, default=1, help="Runs per scenario and engine, the median is reported")
+    parser.add_argument("-o", "--output", help="Write the JSON results to this file")
+    parser.add_argument("--compare", metavar="BASELINE", help="Compare against a results file and flag regressions")
+    parser.add_argument("--threshold", type=float, default=0.15,
+                        help="Relative change counted as a regression (default: 0.15)")
+    parser.add_argument("--worker", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.worker:
+        print(json.dumps(run_worker(json.loads(args.worker))))
+        return 0
+
+    results = []
+    for name in args.scenario or SCENARIOS:
+        for engine in args.engine or ENGINES:
+            print(f"Running {name} with the {engine} engine...", file=sys.stderr)
+            results.append(run_scenario(name, engine, max(1, args.repeat)))
+
+    report = {
+        "meta": {
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        },
+        "results": results,
+    }
+
+    exit_code = 0
+    if args.compare:
+        with open(args.compare, "r", encoding="utf-8") as f:
+            report["regressions"] = compare(results, json.load(f), args.threshold)
+        for regression in report["regressions"]:
+            print(f"[REGRESSION] {regression['scenario']}/{regression['engine']} {regression['metric']}: "
+                  f"{regression['baseline']} -> {regression['current']}", file=sys.stderr)
+        exit_code = 1 if report["regressions"] else 0
+
+    output = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            f.write(output + "\n")
+    print(output)
+    return exit_code
+
+
+if __name__ == "__main__":
+    sys.exit(main())
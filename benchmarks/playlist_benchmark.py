@@ -0,0 +1,443 @@
+"""Offline benchmark of the playlist code paths against a stand-in extractor.
+
+yt_dlp.YoutubeDL is replaced by a stand-in that returns synthetic flat playlists and
+fakes the download of each entry, with an optional per-entry latency and post-processing
+time (an FFmpeg merge or conversion, which runs outside the GIL). Each stage and
+playlist size runs in a fresh worker process and reports its wall time, the number of
+progress callbacks it made and its peak memory, so per-entry sleeps or quadratic loops
+show up as the playlist grows.
+
+Stages:
+    info    get_playlist_info() with a fetch progress callback
+    stream  iter_playlist_entries(), also reporting the time to the first entry
+    hydrate hydrate_playlist_entries() on the first 200 entries, without its rate cap
+    model   Select All / Invert / filter / range on the selection dialog's data model
+    dialog  Building the selection dialog and running Select All / Invert on it (needs a display)
+    full    download_youtube_playlist()
+    items   download_youtube_playlist_items() with every other entry
+    range   download_youtube_playlist_range() with the middle half of the playlist
+
+Usage:
+    python benchmarks/playlist_benchmark.py                         # Run the default suite, print JSON
+    python benchmarks/playlist_benchmark.py -o results.json         # Save the results
+    python benchmarks/playlist_benchmark.py --compare baseline.json # Flag regressions against a baseline
+    python benchmarks/playlist_benchmark.py --stage info --size 10000 --latency 0.001
+    python benchmarks/playlist_benchmark.py --stage full --size 100 --latency 0.01 --postprocess-time 0.05
+"""
+import os
+import sys
+import json
+import time
+import argparse
+import platform
+import tempfile
+import subprocess
+import contextlib
+import statistics
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+SIZES = (100, 1000, 10000)
+
+STAGES = ("info", "stream", "hydrate", "model", "dialog", "full", "items", "range")
+
+# Metrics compared against a baseline, all of them lower is better
+METRICS = ("seconds", "first_entry_seconds", "callbacks", "peak_rss_mb", "peak_alloc_mb")
+
+# Absolute changes below these are treated as noise, whatever the relative change
+NOISE_FLOOR = {"seconds": 0.05, "first_entry_seconds": 0.05, "callbacks": 5, "peak_rss_mb": 5.0, "peak_alloc_mb": 1.0}
+
+# Bytes reported for each fake download, in this many progress hook calls
+ENTRY_SIZE = 4 * 1024 * 1024
+HOOK_CALLS = 4
+
+
+class StandInYoutubeDL:
+    """Just enough of yt_dlp.YoutubeDL for the playlist code paths, returning synthetic results.
+
+    entries and latency are set by the worker: extract_info() returns a flat playlist of
+    that many entries, and both listing and downloading cost latency seconds per entry.
+    Post-processing a downloaded entry takes postprocess_time seconds.
+    """
+    entries = 0
+    latency = 0.0
+    postprocess_time = 0.0
+
+    def __init__(self, params=None):
+        self.params = dict(params or {})
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        return False
+
+    def extract_info(self, url, download=False, process=True, **kwargs):
+        if "watch?v=" in url:
+            return self.video_info(url.split("=")[-1])
+        entries = self.list_entries()
+        if process:
+            # yt-dlp resolves the whole listing before returning
+            entries = list(entries)
+        return {
+            '_type': 'playlist',
+            'id': 'PLbenchmark',
+            'title': f"Benchmark playlist ({self.entries} videos)",
+            'uploader': 'Benchmark',
+            'uploader_id': '@benchmark',
+            'webpage_url': url,
+            'extractor_key': 'YoutubeTab',
+            'playlist_count': self.entries,
+            'entries': entries,
+        }
+
+    def list_entries(self):
+        for index in range(1, self.entries + 1):
+            if self.latency:
+                time.sleep(self.latency)
+            yield self.make_entry(index)
+
+    @staticmethod
+    def make_entry(index):
+        video_id = f"vid{index:08d}"
+        return {
+            '_type': 'url',
+            'ie_key': 'Youtube',
+            'id': video_id,
+            'url': f"https://www.youtube.com/watch?v={video_id}",
+            'title': f"Synthetic video {index}",
+            'duration': 60 + index % 600,
+        }
+
+    def video_info(self, video_id):
+        if self.latency:
+            time.sleep(self.latency)
+        formats = [{'format_id': str(height), 'ext': 'mp4', 'height': height, 'vcodec': 'avc1', 'acodec': 'none',
+                    'filesize': height * 100000} for height in (360, 720, 1080)]
+        formats.append({'format_id': '140', 'ext': 'm4a', 'vcodec': 'none', 'acodec': 'mp4a', 'filesize': 3000000})
+        return {
+            'id': video_id,
+            'title': f"Synthetic video {video_id}",
+            'uploader': 'Benchmark',
+            'duration': 300,
+            'formats': formats,
+            'requested_formats': [formats[2], formats[3]],
+            'thumbnails': [{'url': f"https://i.ytimg.com/vi/{video_id}/{name}.jpg"} for name in ('default', 'hqdefault')],
+        }
+
+    def process_ie_result(self, ie_result, download=True, extra_info=None):
+        if self.latency:
+            time.sleep(self.latency)
+        info = dict(ie_result, **(extra_info or {}))
+        info.update(_type='video', extractor_key='Youtube', ext='mp4')
+        filename = f"{info.get('playlist_index', 0)} - {info['title']}.mp4"
+        step = ENTRY_SIZE // HOOK_CALLS
+        for downloaded in range(step, ENTRY_SIZE + 1, step):
+            self._call_hooks('progress_hooks', status='downloading', downloaded_bytes=downloaded,
+                             total_bytes=ENTRY_SIZE, filename=filename, info_dict=info, speed=None, eta=0)
+        self._call_hooks('progress_hooks', status='finished', downloaded_bytes=ENTRY_SIZE,
+                         total_bytes=ENTRY_SIZE, filename=filename, info_dict=info)
+        # Like yt-dlp, hand the downloaded file to post_process and carry on with what it returns
+        return self.post_process(filename, info)
+
+    def post_process(self, filename, info, files_to_move=None):
+        info['filepath'] = filename
+        self._call_hooks('postprocessor_hooks', status='started', postprocessor='Merger', info_dict=info)
+        if self.postprocess_time:
+            time.sleep(self.postprocess_time)
+        self._call_hooks('postprocessor_hooks', status='finished', postprocessor='Merger', info_dict=info)
+        # yt-dlp always ends with moving the files into place
+        for status in ('started', 'finished'):
+            self._call_hooks('postprocessor_hooks', status=status, postprocessor='MoveFiles', info_dict=info)
+        return info
+
+    def _call_hooks(self, name, **d):
+        for hook in self.params.get(name) or []:
+            hook(dict(d))
+
+    def sanitize_info(self, info):
+        return info
+
+
+class StandInModule:
+    """Takes the place of the yt_dlp module, with YoutubeDL replaced by the stand-in."""
+    YoutubeDL = StandInYoutubeDL
+
+    def __init__(self, real):
+        self._real = real
+
+    def __getattr__(self, name):
+        return getattr(self._real, name)
+
+
+def run_worker(spec):
+    """Run one stage for one playlist size in this process and return its measurements."""
+    sys.path.insert(0, REPO_ROOT)
+    import tracemalloc
+    import video_downloader
+
+    StandInYoutubeDL.entries = spec["size"]
+    StandInYoutubeDL.latency = spec.get("latency", 0.0)
+    StandInYoutubeDL.postprocess_time = spec.get("postprocess_time", 0.0)
+    video_downloader.yt_dlp = StandInModule(video_downloader.yt_dlp)
+
+    downloader = video_downloader.VideoDownloader()
+    # Every run starts cold and leaves nothing behind in the user's cache
+    downloader.use_metadata_cache = False
+    downloader.use_download_archive = False
+    downloader.progress_interval = 0
+
+    callbacks = [0]
+
+    def count(*args):
+        callbacks[0] += 1
+
+    url = "https://www.youtube.com/playlist?list=PLbenchmark"
+    size = spec["size"]
+    stage = spec["stage"]
+    result = {}
+
+    if stage in ("hydrate", "model", "dialog"):
+        # Building the input is not part of the measurement
+        with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+            playlist_info = downloader.get_playlist_info(url)
+    if stage == "dialog":
+        try:
+            import tkinter as tk
+            root = tk.Tk()
+        except Exception as e:
+            # No display, e.g. on a headless CI machine
+            downloader.close()
+            return {"ok": True, "skipped": f"Tk unavailable: {e}"}
+        root.withdraw()
+
+    tracemalloc.start()
+    start = time.perf_counter()
+    with tempfile.TemporaryDirectory() as output_path, \
+            open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+        if stage == "info":
+            info = downloader.get_playlist_info(url, count)
+            ok = bool(info) and len(info["videos"]) == size
+        elif stage == "stream":
+            first = None
+            listed = 0
+            for video in downloader.iter_playlist_entries(url, fetch_progress_callback=count):
+                if first is None:
+                    first = time.perf_counter() - start
+                listed += 1
+            ok = listed == size
+            result["first_entry_seconds"] = round(first, 4) if first is not None else None
+        elif stage == "hydrate":
+            videos = playlist_info["videos"][:200]
+            downloader.hydration_rate = None
+            details = downloader.hydrate_playlist_entries(videos, fetch_progress_callback=count)
+            ok = len(details) == len(videos) and all(details)
+        elif stage == "model":
+            ok = run_model(video_downloader.PlaylistSelectionModel(playlist_info["videos"]))
+        elif stage == "dialog":
+            ok, result = run_dialog(root, playlist_info, count)
+        else:
+            downloader.add_progress_listener(count)
+            if stage == "full":
+                ok = downloader.download_youtube_playlist(url, "highest", output_path)
+            elif stage == "items":
+                indices = list(range(1, size + 1, 2))
+                ok = downloader.download_youtube_playlist_items(url, "highest", output_path, video_indices=indices)
+            else:
+                range_str = f"{size // 4 + 1}-{size * 3 // 4}"
+                ok = downloader.download_youtube_playlist_range(url, "highest", output_path, range_str=range_str)
+    seconds = time.perf_counter() - start
+    peak_alloc = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    downloader.close()
+
+    result.update({
+        "ok": bool(ok),
+        "seconds": round(seconds, 4),
+        "callbacks": callbacks[0],
+        "peak_rss_mb": peak_rss_mb(),
+        "peak_alloc_mb": round(peak_alloc / (1024 * 1024), 2),
+    })
+    return result
+
+
+def run_model(model):
+    """Run the bulk operations of the selection dialog on its model, returning whether they worked."""
+    model.select_all()
+    model.invert()
+    matching = len(model.set_filter("7"))
+    model.select_all()
+    model.set_filter("")
+    filtered_ok = model.selected_count == matching and len(model.selected_indices()) == matching
+    model.select_range(len(model) // 4 + 1, len(model) * 3 // 4)
+    return filtered_ok and model.selected_count == len(model) * 3 // 4 - len(model) // 4
+
+
+def run_dialog(root, playlist_info, count):
+    """Build the selection dialog, run Select All and Invert Selection, then confirm it."""
+    import tkinter as tk
+    from tkinter import ttk
+    import video_downloader
+
+    dialogs = []
+    # Return straight away instead of waiting for the user to close the dialog
+    root.wait_window = dialogs.append
+    gui = type("DialogHost", (), {})()
+    gui.root = root
+    gui.playlist_info = playlist_info
+    gui.selected_videos = []
+    gui.status_var = tk.StringVar(root)
+    gui.status_var.trace_add("write", count)
+
+    timings = {}
+    start = time.perf_counter()
+    video_downloader.DownloaderGUI.select_playlist_videos(gui)
+    root.update()
+    timings["build_seconds"] = round(time.perf_counter() - start, 4)
+
+    buttons = {}
+    pending = list(dialogs)
+    while pending:
+        widget = pending.pop()
+        if isinstance(widget, ttk.Button):
+            buttons[str(widget.cget("text"))] = widget
+        pending.extend(widget.winfo_children())
+
+    for label in ("Select All", "Invert Selection", "Select All"):
+        start = time.perf_counter()
+        buttons[label].invoke()
+        root.update()
+        key = label.lower().replace(" ", "_") + "_seconds"
+        timings[key] = round(timings.get(key, 0) + time.perf_counter() - start, 4)
+
+    buttons["Download Selected"].invoke()
+    root.update()
+    root.destroy()
+    return len(gui.selected_videos) == playlist_info["total_videos"], timings
+
+
+def peak_rss_mb():
+    try:
+        import resource
+    except ImportError:
+        return None  # Not available on Windows
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports KiB, macOS bytes
+    return round(peak / (1024 * 1024 if sys.platform == "darwin" else 1024), 1)
+
+
+def run_stage(stage, size, latency=0.0, repeat=1, timeout=None, postprocess_time=0.0):
+    """Run one stage for one playlist size, repeat times. Returns the median run."""
+    runs = []
+    for _ in range(repeat):
+        spec = {"stage": stage, "size": size, "latency": latency, "postprocess_time": postprocess_time}
+        # Each run gets a fresh process, so peak RSS is its own
+        try:
+            process = subprocess.run([sys.executable, os.path.abspath(__file__), "--worker", json.dumps(spec)],
+                                     capture_output=True, text=True, timeout=timeout)
+        except subprocess.TimeoutExpired:
+            runs.append({"ok": False, "error": f"Timed out after {timeout} seconds"})
+            continue
+        if process.returncode != 0:
+            runs.append({"ok": False, "error": process.stderr.strip().splitlines()[-1:]})
+            continue
+        runs.append(json.loads(process.stdout.strip().splitlines()[-1]))
+
+    result = {"stage": stage, "size": size, "latency": latency, "runs": len(runs)}
+    if runs and all(run.get("skipped") for run in runs):
+        result.update(ok=True, skipped=runs[0]["skipped"])
+        return result
+    good = [run for run in runs if run.get("ok")]
+    if not good:
+        result.update(ok=False, error=runs[-1].get("error") if runs else None)
+        return result
+    result["ok"] = len(good) == len(runs)
+    keys = [key for key in good[0] if key not in ("ok", "skipped", "error")]
+    for key in keys:
+        values = [run[key] for run in good if run.get(key) is not None]
+        result[key] = statistics.median(values) if values else None
+    return result
+
+
+def compare(results, baseline, threshold):
+    """Return the metrics that got worse than the baseline by more than threshold (a fraction)."""
+    previous = {(r["stage"], r["size"]): r for r in baseline.get("results", [])}
+    regressions = []
+    for result in results:
+        old = previous.get((result["stage"], result["size"]))
+        if not old or result.get("skipped") or old.get("skipped"):
+            continue
+        if old.get("ok") and not result.get("ok"):
+            regressions.append({"stage": result["stage"], "size": result["size"], "metric": "ok",
+                                "baseline": True, "current": False})
+            continue
+        for metric in METRICS:
+            before, now = old.get(metric), result.get(metric)
+            if not before or now is None or abs(now - before) < NOISE_FLOOR[metric]:
+                continue
+            change = (now - before) / before
+            if change > threshold:
+                regressions.append({"stage": result["stage"], "size": result["size"], "metric": metric,
+                                    "baseline": before, "current": now, "change": round(change, 3)})
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the playlist code paths against a stand-in extractor")
+    parser.add_argument("--stage", action="append", choices=STAGES,
+                        help="Stage to run, can be repeated (default: all)")
+    parser.add_argument("--size", action="append", type=int,
+                        help="Playlist size to run, can be repeated (default: 100, 1000 and 10000)")
+    parser.add_argument("--latency", type=float, default=0.0,
+                        help="Seconds the stand-in extractor spends on each entry (default: 0)")
+    parser.add_argument("--postprocess-time", type=float, default=0.0,
+                        help="Seconds the stand-in spends post-processing each downloaded entry (default: 0)")
+    parser.add_argument("--repeat", type=int, default=1, help="Runs per stage and size, the median is reported")
+    parser.add_argument("--timeout", type=float, default=300,
+                        help="Seconds before a run is counted as failed (default: 300)")
+    parser.add_argument("-o", "--output", help="Write the JSON results to this file")
+    parser.add_argument("--compare", metavar="BASELINE", help="Compare against a results file and flag regressions")
+    parser.add_argument("--threshold", type=float, default=0.15,
+                        help="Relative change counted as a regression (default: 0.15)")
+    parser.add_argument("--worker", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.worker:
+        print(json.dumps(run_worker(json.loads(args.worker))))
+        return 0
+
+    results = []
+    for stage in args.stage or STAGES:
+        for size in args.size or SIZES:
+            print(f"Running {stage} with {size} entries...", file=sys.stderr)
+            results.append(run_stage(stage, size, args.latency, max(1, args.repeat), args.timeout,
+                                     args.postprocess_time))
+
+    report = {
+        "meta": {
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        },
+        "results": results,
+    }
+
+    exit_code = 0
+    if args.compare:
+        with open(args.compare, "r", encoding="utf-8") as f:
+            report["regressions"] = compare(results, json.load(f), args.threshold)
+        for regression in report["regressions"]:
+            print(f"[REGRESSION] {regression['stage']}/{regression['size']} {regression['metric']}: "
+                  f"{regression['baseline']} -> {regression['current']}", file=sys.stderr)
+        exit_code = 1 if report["regressions"] else 0
+
+    output = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            f.write(output + "\n")
+    print(output)
+    return exit_code
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,162 @@
+"""Startup time benchmark of video_downloader.py.
+
+Each scenario runs in a fresh interpreter and reports the median wall time of the whole
+process, and which heavy dependencies it loaded. Scenarios that load a dependency they
+don't need are flagged, e.g. --help importing yt-dlp or a headless path importing Tk.
+
+Usage:
+    python benchmarks/startup_benchmark.py                         # Run all scenarios, print JSON
+    python benchmarks/startup_benchmark.py -o results.json         # Save the results
+    python benchmarks/startup_benchmark.py --compare baseline.json # Flag regressions against a baseline
+    python benchmarks/startup_benchmark.py --scenario help --repeat 20
+"""
+import os
+import sys
+import json
+import time
+import argparse
+import platform
+import subprocess
+import statistics
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Modules that are slow to import, and which of them each scenario is expected to load
+HEAVY_MODULES = ("yt_dlp", "requests", "imageio_ffmpeg", "tkinter", "colorama", "asyncio")
+
+# name -> (code run by the worker, heavy modules it may load)
+SCENARIOS = {
+    # Interpreter startup alone, for reference
+    "python": ("pass", ()),
+    "import": ("import video_downloader", ()),
+    "help": ("import video_downloader\n"
+             "sys.argv = ['video_downloader.py', '--help']\n"
+             "with contextlib.redirect_stdout(io.StringIO()):\n"
+             "    try:\n"
+             "        video_downloader.main()\n"
+             "    except SystemExit:\n"
+             "        pass", ()),
+    "downloader": ("import video_downloader\n"
+                   "video_downloader.VideoDownloader().close()", ()),
+    "web-session": ("import video_downloader\n"
+                    "downloader = video_downloader.VideoDownloader()\n"
+                    "downloader._get_http_session()\n"
+                    "downloader.close()", ("requests",)),
+    "ffmpeg": ("import video_downloader\n"
+               "video_downloader.VideoDownloader().ffmpeg_path", ("imageio_ffmpeg",)),
+}
+
+# Absolute changes below this many seconds are treated as noise, whatever the relative change
+NOISE_FLOOR = 0.01
+
+
+def run_worker(name):
+    """Run one scenario in this process and return the heavy modules it loaded."""
+    import io
+    import contextlib
+    sys.path.insert(0, REPO_ROOT)
+    code, _ = SCENARIOS[name]
+    exec(code, {"sys": sys, "io": io, "contextlib": contextlib})
+    return {"loaded": [module for module in HEAVY_MODULES if module in sys.modules]}
+
+
+def run_scenario(name, repeat):
+    """Time repeat fresh processes running one scenario. Returns the median run."""
+    times = []
+    loaded = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        process = subprocess.run([sys.executable, os.path.abspath(__file__), "--worker", name],
+                                 capture_output=True, text=True)
+        times.append(time.perf_counter() - start)
+        if process.returncode != 0:
+            return {"scenario": name, "ok": False, "error": process.stderr.strip().splitlines()[-1:]}
+        loaded = json.loads(process.stdout.strip().splitlines()[-1])["loaded"]
+
+    # The worker itself imports some of the heavy modules' dependencies, never the modules
+    unexpected = [module for module in loaded if module not in SCENARIOS[name][1]]
+    return {
+        "scenario": name,
+        "ok": not unexpected,
+        "runs": repeat,
+        "seconds": round(statistics.median(times), 4),
+        "min_seconds": round(min(times), 4),
+        "loaded": loaded,
+        "unexpected": unexpected,
+    }
+
+
+def compare(results, baseline, threshold):
+    """Return the scenarios that got slower than the baseline by more than threshold (a fraction)."""
+    previous = {r["scenario"]: r for r in baseline.get("results", [])}
+    regressions = []
+    for result in results:
+        old = previous.get(result["scenario"])
+        if not old:
+            continue
+        if old.get("ok") and not result.get("ok"):
+            regressions.append({"scenario": result["scenario"], "metric": "ok", "baseline": True, "current": False})
+            continue
+        before, now = old.get("seconds"), result.get("seconds")
+        if not before or now is None or abs(now - before) < NOISE_FLOOR:
+            continue
+        change = (now - before) / before
+        if change > threshold:
+            regressions.append({"scenario": result["scenario"], "metric": "seconds",
+                                "baseline": before, "current": now, "change": round(change, 3)})
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the startup time of video_downloader.py")
+    parser.add_argument("--scenario", action="append", choices=list(SCENARIOS),
+                        help="Scenario to run, can be repeated (default: all)")
+    parser.add_argument("--repeat", type=int, default=10, help="Runs per scenario, the median is reported")
+    parser.add_argument("-o", "--output", help="Write the JSON results to this file")
+    parser.add_argument("--compare", metavar="BASELINE", help="Compare against a results file and flag regressions")
+    parser.add_argument("--threshold", type=float, default=0.15,
+                        help="Relative change counted as a regression (default: 0.15)")
+    parser.add_argument("--worker", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.worker:
+        print(json.dumps(run_worker(args.worker)))
+        return 0
+
+    results = []
+    for name in args.scenario or SCENARIOS:
+        print(f"Running {name}...", file=sys.stderr)
+        results.append(run_scenario(name, max(1, args.repeat)))
+
+    report = {
+        "meta": {
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        },
+        "results": results,
+    }
+
+    exit_code = 0
+    for result in results:
+        if result.get("unexpected"):
+            print(f"[UNEXPECTED IMPORT] {result['scenario']}: {', '.join(result['unexpected'])}", file=sys.stderr)
+            exit_code = 1
+    if args.compare:
+        with open(args.compare, "r", encoding="utf-8") as f:
+            report["regressions"] = compare(results, json.load(f), args.threshold)
+        for regression in report["regressions"]:
+            print(f"[REGRESSION] {regression['scenario']} {regression['metric']}: "
+                  f"{regression['baseline']} -> {regression['current']}", file=sys.stderr)
+        exit_code = 1 if report["regressions"] else exit_code
+
+    output = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            f.write(output + "\n")
+    print(output)
+    return exit_code
+
+
+if __name__ == "__main__":
+    sys.exit(main())
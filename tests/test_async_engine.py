@@ -0,0 +1,219 @@
+"""Tests of the asyncio web download engine against a local asyncio.start_server."""
+import asyncio
+import os
+import re
+import sys
+import tempfile
+import threading
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from video_downloader import ProgressEvent, ResumeJournal, VideoDownloader, async_http_get
+
+DATA = bytes(range(256)) * 1024  # 256 KiB
+
+
+class FileServer:
+    """HTTP/1.1 server for the files in self.files, running on an event loop of its own.
+
+    Paths under /chunked/ are sent with chunked transfer encoding and without range support.
+    A path in self.truncate closes the connection after that many body bytes.
+    """
+    def __init__(self):
+        self.files = {'/video.mp4': DATA}
+        self.etag = '"v1"'
+        self.truncate = {}
+        self.requests = []  # (path, headers) of each request
+        self.next_version = None  # (files, etag) put in place after the next request
+        self._loop = asyncio.new_event_loop()
+        self._server = None
+        self.url = None
+
+    def start(self):
+        ready = threading.Event()
+
+        async def serve():
+            self._server = await asyncio.start_server(self._handle, '127.0.0.1', 0)
+            self.url = f"http://127.0.0.1:{self._server.sockets[0].getsockname()[1]}"
+            ready.set()
+
+        self._thread = threading.Thread(target=self._loop.run_forever, daemon=True)
+        self._thread.start()
+        asyncio.run_coroutine_threadsafe(serve(), self._loop)
+        ready.wait(5)
+
+    def stop(self):
+        async def close():
+            self._server.close()
+            await self._server.wait_closed()
+
+        asyncio.run_coroutine_threadsafe(close(), self._loop).result(5)
+        self._loop.call_soon_threadsafe(self._loop.stop)
+        self._thread.join(5)
+        self._loop.close()
+
+    async def _handle(self, reader, writer):
+        try:
+            _, path, _ = (await reader.readline()).decode('latin-1').split(' ', 2)
+            headers = {}
+            while True:
+                line = await reader.readline()
+                if line in (b'\r\n', b''):
+                    break
+                name, _, value = line.decode('latin-1').partition(':')
+                headers[name.strip().lower()] = value.strip()
+            self.requests.append((path, headers))
+            await self._respond(writer, path, headers)
+            if self.next_version:
+                (self.files, self.etag), self.next_version = self.next_version, None
+        finally:
+            writer.close()
+
+    async def _respond(self, writer, path, headers):
+        chunked = path.startswith('/chunked/')
+        data = self.files.get(path[len('/chunked'):] if chunked else path)
+        if data is None:
+            writer.write(b"HTTP/1.1 404 Not Found\r\nContent-Length: 0\r\n\r\n")
+            return
+
+        head = f"ETag: {self.etag}\r\n"
+        match = re.match(r'bytes=(\d+)-(\d*)$', headers.get('range', ''))
+        if_range = headers.get('if-range')
+        if match and not chunked and if_range in (None, self.etag):
+            start = int(match.group(1))
+            end = int(match.group(2)) if match.group(2) else len(data) - 1
+            body = data[start:end + 1]
+            head = f"HTTP/1.1 206 Partial Content\r\nContent-Range: bytes {start}-{end}/{len(data)}\r\n" + head
+        else:
+            body = data
+            head = "HTTP/1.1 200 OK\r\n" + head
+
+        if chunked:
+            writer.write((head + "Transfer-Encoding: chunked\r\n\r\n").encode())
+            for i in range(0, len(body), 10000):
+                part = body[i:i + 10000]
+                writer.write(f"{len(part):x}\r\n".encode() + part + b"\r\n")
+            writer.write(b"0\r\n\r\n")
+        else:
+            writer.write((head + f"Content-Length: {len(body)}\r\n\r\n").encode())
+            writer.write(body[:self.truncate.get(path, len(body))])
+        await writer.drain()
+
+
+class ServerTestCase(unittest.TestCase):
+    def setUp(self):
+        self.server = FileServer()
+        self.server.start()
+        self.addCleanup(self.server.stop)
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.output_path = tmp.name
+
+
+class AsyncHttpGetTest(ServerTestCase):
+    def fetch(self, path, headers=None):
+        async def get():
+            response = await async_http_get(self.server.url + path, headers, timeout=5)
+            try:
+                body = b''.join([chunk async for chunk in response.iter_content(65536)])
+            finally:
+                await response.aclose()
+            return response, body
+
+        return asyncio.run(get())
+
+    def test_reads_the_whole_body(self):
+        response, body = self.fetch('/video.mp4')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.headers['etag'], '"v1"')
+        self.assertEqual(body, DATA)
+
+    def test_range_request(self):
+        response, body = self.fetch('/video.mp4', {'Range': 'bytes=100-199'})
+        self.assertEqual(response.status_code, 206)
+        self.assertEqual(body, DATA[100:200])
+
+    def test_chunked_body(self):
+        response, body = self.fetch('/chunked/video.mp4')
+        self.assertEqual(response.headers['Transfer-Encoding'], 'chunked')
+        self.assertEqual(body, DATA)
+
+    def test_truncated_body_raises(self):
+        self.server.truncate['/video.mp4'] = 1000
+        with self.assertRaises(ConnectionError):
+            self.fetch('/video.mp4')
+
+
+class DownloadWebVideosTest(ServerTestCase):
+    def download(self, path):
+        downloader = VideoDownloader()
+        jobs = downloader.download_web_videos([self.server.url + path], self.output_path)
+        return jobs[0], os.path.join(self.output_path, os.path.basename(path))
+
+    def write_partial(self, done, etag='"v1"'):
+        """Leave a half-finished download of /video.mp4 with its journal, as a crash would."""
+        file_path = os.path.join(self.output_path, 'video.mp4')
+        with open(file_path, 'wb') as f:
+            f.write(DATA[:done] + bytes(len(DATA) - done))
+        ResumeJournal(file_path, self.server.url + '/video.mp4', len(DATA), etag, ranges=[[0, done]]).save()
+
+    def test_full_download(self):
+        job, file_path = self.download('/video.mp4')
+        self.assertEqual(job.status, "completed")
+        self.assertEqual(job.last_event.phase, ProgressEvent.COMPLETED)
+        with open(file_path, 'rb') as f:
+            self.assertEqual(f.read(), DATA)
+        self.assertFalse(os.path.exists(file_path + ResumeJournal.SUFFIX))
+
+    def test_resume_with_matching_if_range(self):
+        self.write_partial(100000)
+        job, file_path = self.download('/video.mp4')
+        self.assertEqual(job.status, "completed")
+        with open(file_path, 'rb') as f:
+            self.assertEqual(f.read(), DATA)
+        _, headers = self.server.requests[-1]
+        self.assertEqual(headers['range'], f"bytes=100000-{len(DATA) - 1}")
+        self.assertEqual(headers['if-range'], '"v1"')
+        self.assertFalse(os.path.exists(file_path + ResumeJournal.SUFFIX))
+
+    def test_resume_with_mismatched_if_range_restarts(self):
+        self.write_partial(100000)
+        # The file changes on the server between the probe and the resumed request
+        changed = bytes(reversed(DATA))
+        self.server.next_version = ({'/video.mp4': changed}, '"v2"')
+        job, file_path = self.download('/video.mp4')
+        self.assertEqual(job.status, "completed")
+        self.assertEqual(self.server.requests[-1][1]['if-range'], '"v1"')
+        with open(file_path, 'rb') as f:
+            self.assertEqual(f.read(), changed)
+
+    def test_chunked_body(self):
+        job, file_path = self.download('/chunked/video.mp4')
+        self.assertEqual(job.status, "completed")
+        with open(file_path, 'rb') as f:
+            self.assertEqual(f.read(), DATA)
+
+    def test_progress_events_carry_speed_and_eta(self):
+        self.server.files['/big.mp4'] = DATA * 8
+        downloader = VideoDownloader()
+        downloader.progress_interval = 0
+        events = []
+        downloader.add_progress_listener(events.append)
+        job, = downloader.download_web_videos([self.server.url + '/big.mp4'], self.output_path)
+        self.assertEqual(job.status, "completed")
+        measured = [e for e in events if e.phase == ProgressEvent.DOWNLOADING and e.speed]
+        self.assertTrue(measured)
+        self.assertTrue(all(e.speed > 0 and e.eta is not None for e in measured))
+        self.assertIn("ETA", measured[0].message)
+
+    def test_truncated_body_ends_in_error(self):
+        self.server.truncate['/video.mp4'] = 1000
+        job, file_path = self.download('/video.mp4')
+        self.assertEqual(job.status, "failed")
+        self.assertEqual(job.last_event.phase, ProgressEvent.ERROR)
+        self.assertIn("Connection closed", job.last_event.message)
+
+
+if __name__ == "__main__":
+    unittest.main()
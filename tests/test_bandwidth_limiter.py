@@ -0,0 +1,117 @@
+"""Tests of BandwidthLimiter, the token bucket shared by all transfers, on a fake clock."""
+import os
+import sys
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from video_downloader import BandwidthLimiter
+
+
+class FakeClock:
+    """Stands in for time.monotonic and time.sleep, only moving when slept on or advanced."""
+    def __init__(self, now=100.0):
+        self.now = now
+        self.sleeps = []
+
+    def __call__(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.sleeps.append(seconds)
+        self.now += seconds
+
+
+def make_limiter(rate=1000, burst=None):
+    clock = FakeClock()
+    return BandwidthLimiter(rate, burst, clock=clock, sleep=clock.sleep), clock
+
+
+class TokenBucketTest(unittest.TestCase):
+    def test_unlimited_never_waits(self):
+        limiter, _ = make_limiter(None)
+        self.assertEqual(limiter.reserve(10**9), 0)
+
+    def test_starts_with_a_full_burst(self):
+        limiter, _ = make_limiter(1000)
+        self.assertEqual(limiter.reserve(1000), 0)
+        self.assertAlmostEqual(limiter.reserve(500), 0.5)
+
+    def test_refills_at_the_rate(self):
+        limiter, clock = make_limiter(1000)
+        limiter.reserve(1000)
+        clock.now += 0.25
+        self.assertEqual(limiter.reserve(250), 0)
+        self.assertAlmostEqual(limiter.reserve(250), 0.25)
+
+    def test_refill_is_capped_by_the_burst(self):
+        limiter, clock = make_limiter(1000, burst=2000)
+        limiter.reserve(2000)
+        clock.now += 60
+        self.assertEqual(limiter.reserve(2000), 0)
+        self.assertAlmostEqual(limiter.reserve(1000), 1.0)
+
+    def test_consume_sleeps_in_short_steps(self):
+        limiter, clock = make_limiter(1000)
+        limiter.reserve(1000)
+        limiter.consume(500)
+        self.assertAlmostEqual(sum(clock.sleeps), 0.5)
+        self.assertTrue(all(step <= 0.1 + 1e-9 for step in clock.sleeps))
+
+
+class FairShareTest(unittest.TestCase):
+    def test_a_job_alone_gets_the_whole_rate(self):
+        limiter, _ = make_limiter(1000)
+        self.assertEqual(limiter.reserve(1000, key="a"), 0)
+
+    def test_active_jobs_split_the_rate(self):
+        limiter, _ = make_limiter(1000)
+        limiter.reserve(0, key="b")
+        # Job a may run one burst ahead of its 500 B/s share, so 1000 more bytes take a second
+        self.assertAlmostEqual(limiter.reserve(1000, key="a"), 1.0)
+
+    def test_a_busy_job_does_not_hold_back_another(self):
+        limiter, clock = make_limiter(1000)
+        limiter.reserve(0, key="b")
+        limiter.reserve(500, key="a")
+        limiter.reserve(500, key="a")
+        clock.now += 1
+        # b hasn't used its share, so it isn't held back by the bytes a sent
+        self.assertEqual(limiter.reserve(500, key="b"), 0)
+
+    def test_idle_jobs_stop_counting(self):
+        limiter, clock = make_limiter(1000)
+        limiter.reserve(0, key="b")
+        clock.now += 2
+        self.assertEqual(limiter.reserve(1000, key="a"), 0)
+
+
+class ShouldStopTest(unittest.TestCase):
+    def test_stops_waiting_early(self):
+        limiter, clock = make_limiter(1000)
+        limiter.reserve(1000)
+        checks = []
+
+        def should_stop():
+            checks.append(clock.now)
+            return len(checks) > 3
+
+        limiter.consume(5000, should_stop=should_stop)
+        self.assertEqual(len(clock.sleeps), 3)
+        self.assertLess(sum(clock.sleeps), 0.5)
+
+    def test_rate_change_stops_waiting(self):
+        limiter, clock = make_limiter(1000)
+        limiter.reserve(1000)
+
+        def should_stop():
+            if clock.sleeps:
+                limiter.set_rate(None)
+            return False
+
+        limiter.consume(5000, should_stop=should_stop)
+        self.assertEqual(len(clock.sleeps), 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
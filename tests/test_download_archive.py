@@ -0,0 +1,105 @@
+"""Tests of DownloadArchive and of archived videos being skipped."""
+import os
+import sys
+import tempfile
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from video_downloader import DownloadArchive, DownloadJob, FFmpegProbe, ProgressEvent, VideoDownloader
+
+
+class ArchiveTestCase(unittest.TestCase):
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.tmp = tmp.name
+        self.path = os.path.join(self.tmp, "archive", "archive.txt")
+
+
+class MakeKeyTest(unittest.TestCase):
+    def test_extracted_info(self):
+        self.assertEqual(DownloadArchive.make_key({'extractor_key': 'Youtube', 'id': 'abc123'}), "youtube abc123")
+
+    def test_flat_playlist_entry(self):
+        entry = {'_type': 'url', 'ie_key': 'Youtube', 'id': 'abc123', 'url': "https://www.youtube.com/watch?v=abc123"}
+        self.assertEqual(DownloadArchive.make_key(entry), "youtube abc123")
+
+    def test_needs_extractor_and_id(self):
+        self.assertIsNone(DownloadArchive.make_key({'id': 'abc123'}))
+        self.assertIsNone(DownloadArchive.make_key({'ie_key': 'Youtube', 'url': "https://example.com"}))
+
+
+class KeyForUrlTest(unittest.TestCase):
+    def test_youtube_video_urls(self):
+        for url in ("https://www.youtube.com/watch?v=abc123",
+                    "https://m.youtube.com/watch?feature=share&v=abc123&list=PL1",
+                    "https://youtu.be/abc123",
+                    "https://www.youtube.com/shorts/abc123"):
+            self.assertEqual(DownloadArchive.key_for_url(url), "youtube abc123", url)
+
+    def test_urls_without_a_video_id(self):
+        self.assertIsNone(DownloadArchive.key_for_url("https://www.youtube.com/playlist?list=PL1"))
+        self.assertIsNone(DownloadArchive.key_for_url("https://example.com/watch?v=abc123"))
+        self.assertIsNone(DownloadArchive.key_for_url("https://notyoutube.com/watch?v=abc123"))
+
+
+class ArchiveFileTest(ArchiveTestCase):
+    def test_writes_one_line_per_video(self):
+        archive = DownloadArchive(self.path)
+        archive.add("youtube abc123")
+        archive.add("youtube def456")
+        archive.add("youtube abc123")
+        archive.add(None)
+        with open(self.path, encoding='utf-8') as f:
+            self.assertEqual(f.read(), "youtube abc123\nyoutube def456\n")
+        self.assertEqual(len(archive), 2)
+
+    def test_reads_an_existing_archive(self):
+        os.makedirs(os.path.dirname(self.path))
+        with open(self.path, 'w', encoding='utf-8') as f:
+            f.write("youtube abc123\n\nvimeo 42\n")
+        archive = DownloadArchive(self.path)
+        self.assertIn("youtube abc123", archive)
+        self.assertIn("vimeo 42", archive)
+        self.assertNotIn("youtube def456", archive)
+        self.assertNotIn(None, archive)
+        self.assertEqual(len(archive), 2)
+
+    def test_missing_archive_is_empty(self):
+        self.assertEqual(len(DownloadArchive(self.path)), 0)
+
+
+class SkipTest(ArchiveTestCase):
+    def make_downloader(self):
+        downloader = VideoDownloader()
+        downloader.use_metadata_cache = False
+        downloader.ffmpeg = FFmpegProbe(os.path.join(self.tmp, "ffmpeg.json"), os.path.join(self.tmp, "no-ffmpeg"))
+        downloader.download_archive = DownloadArchive(self.path)
+        downloader.download_archive.add("youtube abc123")
+        downloader.use_download_archive = True
+        return downloader
+
+    def test_archived_video_is_reported_skipped(self):
+        downloader = self.make_downloader()
+        url = "https://www.youtube.com/watch?v=abc123"
+        job = downloader._create_job(url)
+        self.assertTrue(downloader.download_video(url, "highest", self.tmp, job=job))
+        self.assertEqual(job.last_event.phase, ProgressEvent.SKIPPED)
+        self.assertEqual(job.status, "skipped")
+
+    def test_archived_playlist_entries_are_not_downloaded(self):
+        downloader = self.make_downloader()
+        downloader.download_archive.add("youtube def456")
+        info = {
+            'playlist_count': 2,
+            'requested_entries': [1, 2],
+            'entries': [{'_type': 'url', 'ie_key': 'Youtube', 'id': video_id,
+                         'url': f"https://www.youtube.com/watch?v={video_id}"} for video_id in ("abc123", "def456")],
+        }
+        job = DownloadJob("https://www.youtube.com/playlist?list=PL1")
+        self.assertEqual(downloader._download_playlist_entries(info, {}, job), 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
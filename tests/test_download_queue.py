@@ -0,0 +1,185 @@
+"""Tests of DownloadJob's control flags and DownloadQueue, with a stub in place of the real downloads."""
+import os
+import sys
+import threading
+import time
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from video_downloader import DownloadJob, DownloadQueue, ProgressEvent, VideoDownloader
+
+
+def wait_until(condition, timeout=5):
+    deadline = time.monotonic() + timeout
+    while not condition():
+        if time.monotonic() > deadline:
+            raise AssertionError("Timed out waiting for the condition")
+        time.sleep(0.005)
+
+
+class StubDownloader(VideoDownloader):
+    """VideoDownloader whose downloads just run until released, honouring pause and cancel like the real ones."""
+    def __init__(self):
+        super().__init__()
+        self.release = threading.Event()
+        self.running = 0
+        self.max_running = 0
+        self.runs = 0
+        self._lock = threading.Lock()
+
+    def download_video(self, url, quality="highest", output_path=None, progress_callback=None,
+                       playlist_option=None, playlist_items=None, resume=False, job=None):
+        job.is_paused = False
+        job.status = "downloading"
+        with self._lock:
+            self.runs += 1
+            self.running += 1
+            self.max_running = max(self.max_running, self.running)
+        try:
+            while not self.release.wait(0.005):
+                if job.is_held and not job.hold():
+                    break
+                if job.should_cancel or job.is_paused:
+                    break
+            result = not (job.should_cancel or job.is_paused)
+            if result:
+                job.report(ProgressEvent.COMPLETED, 100, "Download complete")
+        finally:
+            with self._lock:
+                self.running -= 1
+        job.finish(result)
+        return result
+
+
+class DownloadJobTest(unittest.TestCase):
+    def test_finish_sets_the_final_status(self):
+        job = DownloadJob("https://example.com/a.mp4")
+        self.assertEqual(job.status, "queued")
+        job.finish(True)
+        self.assertEqual(job.status, "completed")
+        self.assertTrue(job.is_done)
+
+        failed = DownloadJob("https://example.com/b.mp4")
+        failed.finish(False)
+        self.assertEqual(failed.status, "failed")
+
+        skipped = DownloadJob("https://example.com/c.mp4")
+        skipped.report(ProgressEvent.SKIPPED, 100, "Skipped")
+        skipped.finish(True)
+        self.assertEqual(skipped.status, "skipped")
+
+    def test_pause_only_applies_to_running_jobs(self):
+        job = DownloadJob("https://example.com/a.mp4")
+        self.assertFalse(job.pause())
+        job.status = "downloading"
+        self.assertTrue(job.pause())
+        self.assertTrue(job.is_held)
+        self.assertFalse(job.pause("teardown"))
+
+    def test_hold_blocks_until_resumed(self):
+        job = DownloadJob("https://example.com/a.mp4")
+        events = []
+        job.listeners.append(events.append)
+        job.status = "downloading"
+        job.pause("hold")
+        results = []
+        holder = threading.Thread(target=lambda: results.append(job.hold()))
+        holder.start()
+        wait_until(lambda: job.status == "paused")
+        self.assertTrue(holder.is_alive())
+        self.assertTrue(job.resume())
+        holder.join(5)
+        self.assertEqual(results, [True])
+        self.assertEqual(job.status, "downloading")
+        self.assertEqual([e.phase for e in events], [ProgressEvent.PAUSED, ProgressEvent.DOWNLOADING])
+
+    def test_cancel_wakes_a_held_job(self):
+        job = DownloadJob("https://example.com/a.mp4")
+        job.status = "downloading"
+        job.pause("hold")
+        results = []
+        holder = threading.Thread(target=lambda: results.append(job.hold()))
+        holder.start()
+        wait_until(lambda: job.status == "paused")
+        self.assertTrue(job.cancel())
+        holder.join(5)
+        self.assertEqual(results, [False])
+        job.finish(False)
+        self.assertEqual(job.status, "cancelled")
+
+    def test_teardown_pause_leaves_the_job_unfinished(self):
+        job = DownloadJob("https://example.com/a.mp4")
+        job.status = "downloading"
+        job.pause("teardown")
+        job.finish(False)
+        self.assertEqual(job.status, "paused")
+        self.assertFalse(job.is_done)
+        self.assertFalse(job.resume())
+        # Cancelling a torn-down job finishes it right away
+        self.assertTrue(job.cancel())
+        self.assertEqual(job.status, "cancelled")
+        self.assertTrue(job.is_done)
+        self.assertFalse(job.cancel())
+
+    def test_progress_due(self):
+        job = DownloadJob("https://example.com/a.mp4")
+        self.assertTrue(job.progress_due(60))
+        self.assertFalse(job.progress_due(60))
+        self.assertTrue(job.progress_due(0))
+
+
+class DownloadQueueTest(unittest.TestCase):
+    def setUp(self):
+        self.downloader = StubDownloader()
+        self.queue = DownloadQueue(self.downloader, max_workers=2)
+        self.addCleanup(self.queue.shutdown, cancel=True)
+
+    def submit(self, count):
+        return [self.queue.submit(f"https://example.com/{i}.mp4") for i in range(count)]
+
+    def test_runs_at_most_max_workers_at_once(self):
+        jobs = self.submit(5)
+        wait_until(lambda: self.downloader.running == 2)
+        time.sleep(0.05)
+        self.assertEqual(self.downloader.max_running, 2)
+        self.assertEqual([job.status for job in jobs[2:]], ["queued"] * 3)
+        self.downloader.release.set()
+        self.assertTrue(self.queue.wait_all(5))
+        self.assertEqual(self.downloader.max_running, 2)
+        self.assertEqual({job.status for job in jobs}, {"completed"})
+        self.assertEqual(self.queue.list_jobs(), jobs)
+
+    def test_cancelled_queued_job_never_runs(self):
+        jobs = self.submit(3)
+        wait_until(lambda: self.downloader.running == 2)
+        self.assertTrue(self.queue.cancel(jobs[2].id))
+        self.downloader.release.set()
+        self.assertTrue(self.queue.wait_all(5))
+        self.assertEqual(jobs[2].status, "cancelled")
+        self.assertEqual(self.downloader.runs, 2)
+
+    def test_teardown_pause_requeues_on_resume(self):
+        job, = self.submit(1)
+        wait_until(lambda: self.downloader.running == 1)
+        self.assertTrue(self.queue.pause(job.id, "teardown"))
+        wait_until(lambda: self.downloader.running == 0)
+        self.assertEqual(job.status, "paused")
+        self.downloader.release.set()
+        self.assertTrue(self.queue.resume(job.id))
+        self.assertTrue(self.queue.wait(job.id, 5))
+        self.assertEqual(job.status, "completed")
+        self.assertEqual(self.downloader.runs, 2)
+
+    def test_shutdown_with_cancel(self):
+        jobs = self.submit(4)
+        wait_until(lambda: self.downloader.running == 2)
+        self.queue.shutdown(cancel=True)
+        self.assertEqual(self.downloader.running, 0)
+        self.assertEqual({job.status for job in jobs}, {"cancelled"})
+        self.assertTrue(all(job.is_done for job in jobs))
+        self.assertEqual(self.downloader.runs, 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,114 @@
+"""Tests of MetadataCache, the on-disk cache of extract_info results, on a fake clock."""
+import os
+import sys
+import tempfile
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from video_downloader import MetadataCache
+
+OPTIONS = {'extract_flat': False}
+
+
+class FakeClock:
+    def __init__(self, now=1000000.0):
+        self.now = now
+
+    def __call__(self):
+        return self.now
+
+
+class MetadataCacheTestCase(unittest.TestCase):
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.path = os.path.join(tmp.name, "cache", "metadata.sqlite3")
+        self.clock = FakeClock()
+
+    def make_cache(self, **kwargs):
+        cache = MetadataCache(self.path, clock=self.clock, **kwargs)
+        self.addCleanup(cache.close)
+        return cache
+
+
+class TtlTest(MetadataCacheTestCase):
+    def test_returns_fresh_entries(self):
+        cache = self.make_cache(ttl=60)
+        cache.put("a", {'id': 'a', 'title': "A"})
+        self.clock.now += 60
+        self.assertEqual(cache.get("a"), {'id': 'a', 'title': "A"})
+
+    def test_drops_expired_entries(self):
+        cache = self.make_cache(ttl=60)
+        cache.put("a", {'id': 'a'})
+        self.clock.now += 61
+        self.assertIsNone(cache.get("a"))
+
+    def test_reading_does_not_extend_the_ttl(self):
+        cache = self.make_cache(ttl=60)
+        cache.put("a", {'id': 'a'})
+        self.clock.now += 40
+        cache.get("a")
+        self.clock.now += 40
+        self.assertIsNone(cache.get("a"))
+
+    def test_survives_reopening(self):
+        self.make_cache().put("a", {'id': 'a'})
+        self.assertEqual(self.make_cache().get("a"), {'id': 'a'})
+
+    def test_skips_unserializable_info(self):
+        cache = self.make_cache()
+        cache.put("a", {'entries': iter([])})
+        self.assertIsNone(cache.get("a"))
+
+
+class LruTest(MetadataCacheTestCase):
+    def test_evicts_least_recently_used(self):
+        cache = self.make_cache(max_entries=2)
+        cache.put("a", {'id': 'a'})
+        self.clock.now += 1
+        cache.put("b", {'id': 'b'})
+        self.clock.now += 1
+        cache.get("a")  # b is now the least recently used
+        self.clock.now += 1
+        cache.put("c", {'id': 'c'})
+        self.assertIsNone(cache.get("b"))
+        self.assertEqual(cache.get("a"), {'id': 'a'})
+        self.assertEqual(cache.get("c"), {'id': 'c'})
+
+    def test_clear(self):
+        cache = self.make_cache()
+        cache.put("a", {'id': 'a'})
+        cache.clear()
+        self.assertIsNone(cache.get("a"))
+
+
+class MakeKeyTest(unittest.TestCase):
+    def test_youtube_video_urls_share_a_key(self):
+        key = MetadataCache.make_key("https://www.youtube.com/watch?v=abc123", OPTIONS)
+        for url in ("https://youtube.com/watch?v=abc123&t=42s",
+                    "https://m.youtube.com/watch?feature=share&v=abc123",
+                    "https://youtu.be/abc123"):
+            self.assertEqual(MetadataCache.make_key(url, OPTIONS), key)
+        self.assertTrue(key.startswith("youtube:video:abc123|"))
+
+    def test_playlist_id_wins_over_video_id(self):
+        key = MetadataCache.make_key("https://www.youtube.com/watch?v=abc123&list=PL1", OPTIONS)
+        self.assertEqual(key, MetadataCache.make_key("https://www.youtube.com/playlist?list=PL1", OPTIONS))
+        self.assertTrue(key.startswith("youtube:playlist:PL1|"))
+
+    def test_other_sites_keep_their_url(self):
+        url = "https://example.com/watch?v=abc123"
+        self.assertEqual(MetadataCache.make_key(url, OPTIONS).split("|")[0], url)
+        self.assertNotEqual(MetadataCache.make_key(url, OPTIONS),
+                            MetadataCache.make_key("https://www.youtube.com/watch?v=abc123", OPTIONS))
+
+    def test_options_are_part_of_the_key(self):
+        url = "https://www.youtube.com/watch?v=abc123"
+        self.assertNotEqual(MetadataCache.make_key(url, {'extract_flat': True}), MetadataCache.make_key(url, OPTIONS))
+        self.assertEqual(MetadataCache.make_key(url, {'a': 1, 'b': 2}), MetadataCache.make_key(url, {'b': 2, 'a': 1}))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,97 @@
+"""Tests of PlaylistSelectionModel, the data model behind the playlist selection dialog."""
+import os
+import sys
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from video_downloader import PlaylistSelectionModel
+
+
+def make_model(count=10):
+    return PlaylistSelectionModel([{'index': i, 'title': f"Video {i}"} for i in range(1, count + 1)])
+
+
+class SelectRangeTest(unittest.TestCase):
+    def test_checks_range_and_unchecks_the_rest(self):
+        model = make_model()
+        model.set_selected(0, True)
+        model.set_selected(9, True)
+        model.select_range(3, 5)
+        self.assertEqual(model.selected_indices(), [3, 4, 5])
+        self.assertEqual(model.selected_count, 3)
+
+    def test_clamps_to_the_playlist(self):
+        model = make_model()
+        model.select_range(0, 99)
+        self.assertEqual(model.selected_count, 10)
+        model.select_range(8, 20)
+        self.assertEqual(model.selected_indices(), [8, 9, 10])
+
+    def test_empty_range(self):
+        model = make_model()
+        model.select_all()
+        model.select_range(5, 4)
+        self.assertEqual(model.selected_indices(), [])
+        self.assertEqual(model.selected_count, 0)
+
+
+class InvertTest(unittest.TestCase):
+    def test_flips_every_row(self):
+        model = make_model()
+        model.select_range(1, 3)
+        model.invert()
+        self.assertEqual(model.selected_indices(), [4, 5, 6, 7, 8, 9, 10])
+        self.assertEqual(model.selected_count, 7)
+
+    def test_twice_restores_selection(self):
+        model = make_model()
+        model.toggle(2)
+        model.toggle(6)
+        model.invert()
+        model.invert()
+        self.assertEqual(model.selected_indices(), [3, 7])
+        self.assertEqual(model.selected_count, 2)
+
+    def test_only_flips_filtered_rows(self):
+        model = make_model(20)
+        model.set_selected(1, True)  # Video 2, hidden by the filter below
+        model.set_selected(9, True)  # Video 10
+        model.set_filter("video 1")  # Videos 1 and 10-19
+        model.invert()
+        self.assertEqual(model.selected_indices(), [1, 2] + list(range(11, 20)))
+        self.assertEqual(model.selected_count, 11)
+
+
+class FilterTest(unittest.TestCase):
+    def test_matches_title_and_index_ignoring_case(self):
+        model = make_model(12)
+        self.assertEqual(list(model.set_filter("VIDEO 1")), [0, 9, 10, 11])
+        self.assertEqual(list(model.set_filter("  12 ")), [11])
+
+    def test_clearing_shows_every_row(self):
+        model = make_model()
+        model.set_filter("video 3")
+        self.assertEqual(list(model.set_filter("")), list(range(10)))
+        self.assertEqual(model.filter_text, "")
+
+    def test_bulk_changes_only_touch_filtered_rows(self):
+        model = make_model(12)
+        model.set_selected(1, True)  # Video 2, hidden by the filter below
+        model.set_filter("video 1")
+        model.select_all()
+        self.assertEqual(model.selected_indices(), [1, 2, 10, 11, 12])
+        model.select_none()
+        self.assertEqual(model.selected_indices(), [2])
+        self.assertEqual(model.selected_count, 1)
+
+    def test_selection_survives_filter_changes(self):
+        model = make_model()
+        model.set_filter("video 4")
+        model.select_all()
+        model.set_filter("")
+        self.assertEqual(model.selected_indices(), [4])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,117 @@
+"""Tests of ResumeJournal, the on-disk record of a partial web download."""
+import os
+import sys
+import tempfile
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from video_downloader import ResumeJournal
+
+URL = "https://example.com/video.mp4"
+
+
+def make_journal(ranges=None, total_size=1000, etag='"abc"', last_modified=None):
+    return ResumeJournal("/nonexistent/video.mp4", URL, total_size, etag, last_modified, ranges)
+
+
+class AddRangeTest(unittest.TestCase):
+    def test_keeps_ranges_sorted(self):
+        journal = make_journal()
+        journal.add_range(500, 600)
+        journal.add_range(100, 200)
+        self.assertEqual(journal.ranges, [[100, 200], [500, 600]])
+
+    def test_merges_overlapping_and_adjacent_ranges(self):
+        journal = make_journal([[0, 100], [300, 400]])
+        journal.add_range(100, 150)
+        self.assertEqual(journal.ranges, [[0, 150], [300, 400]])
+        journal.add_range(120, 350)
+        self.assertEqual(journal.ranges, [[0, 400]])
+
+    def test_range_inside_an_existing_one(self):
+        journal = make_journal([[0, 500]])
+        journal.add_range(100, 200)
+        self.assertEqual(journal.ranges, [[0, 500]])
+
+
+class MissingRangesTest(unittest.TestCase):
+    def test_empty_journal_misses_everything(self):
+        self.assertEqual(make_journal().missing_ranges(), [(0, 1000)])
+
+    def test_gaps_between_and_after_ranges(self):
+        journal = make_journal([[100, 200], [500, 600]])
+        self.assertEqual(journal.missing_ranges(), [(0, 100), (200, 500), (600, 1000)])
+
+    def test_complete_journal(self):
+        self.assertEqual(make_journal([[0, 1000]]).missing_ranges(), [])
+
+    def test_completed_bytes(self):
+        self.assertEqual(make_journal().completed_bytes(), 0)
+        self.assertEqual(make_journal([[0, 100], [300, 450]]).completed_bytes(), 250)
+
+
+class MatchesTest(unittest.TestCase):
+    def test_same_file(self):
+        self.assertTrue(make_journal().matches(URL, 1000, '"abc"', None))
+
+    def test_changed_url_size_or_etag(self):
+        journal = make_journal()
+        self.assertFalse(journal.matches("https://example.com/other.mp4", 1000, '"abc"', None))
+        self.assertFalse(journal.matches(URL, 999, '"abc"', None))
+        self.assertFalse(journal.matches(URL, 1000, '"def"', None))
+
+    def test_falls_back_to_last_modified(self):
+        modified = "Wed, 21 Oct 2015 07:28:00 GMT"
+        journal = make_journal(etag=None, last_modified=modified)
+        self.assertTrue(journal.matches(URL, 1000, None, modified))
+        self.assertFalse(journal.matches(URL, 1000, None, "Thu, 22 Oct 2015 07:28:00 GMT"))
+
+    def test_needs_a_validator(self):
+        self.assertFalse(make_journal(etag=None).matches(URL, 1000, None, None))
+
+    def test_weak_etag_uses_last_modified_for_if_range(self):
+        modified = "Wed, 21 Oct 2015 07:28:00 GMT"
+        self.assertEqual(make_journal(etag='W/"abc"', last_modified=modified).if_range_value(), modified)
+        self.assertEqual(make_journal().if_range_value(), '"abc"')
+
+
+class SaveLoadTest(unittest.TestCase):
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.file_path = os.path.join(tmp.name, "video.mp4")
+
+    def test_round_trip(self):
+        with open(self.file_path, 'wb') as f:
+            f.write(bytes(1000))
+        ResumeJournal(self.file_path, URL, 1000, '"abc"', "Wed, 21 Oct 2015 07:28:00 GMT", [[0, 100], [200, 300]]).save()
+        journal = ResumeJournal.load(self.file_path)
+        self.assertEqual((journal.url, journal.total_size, journal.etag, journal.last_modified),
+                         (URL, 1000, '"abc"', "Wed, 21 Oct 2015 07:28:00 GMT"))
+        self.assertEqual(journal.ranges, [[0, 100], [200, 300]])
+        self.assertFalse(os.path.exists(journal.path + ".tmp"))
+
+    def test_save_takes_a_ranges_snapshot(self):
+        journal = ResumeJournal(self.file_path, URL, 1000, '"abc"', ranges=[[0, 100]])
+        snapshot = [list(r) for r in journal.ranges]
+        journal.add_range(100, 500)
+        journal.save(snapshot)
+        self.assertEqual(ResumeJournal.load(self.file_path).ranges, [[0, 100]])
+
+    def test_missing_or_unreadable_journal(self):
+        self.assertIsNone(ResumeJournal.load(self.file_path))
+        with open(self.file_path + ResumeJournal.SUFFIX, 'w') as f:
+            f.write("{not json")
+        self.assertIsNone(ResumeJournal.load(self.file_path))
+
+    def test_delete(self):
+        journal = ResumeJournal(self.file_path, URL, 1000, '"abc"')
+        journal.save()
+        journal.delete()
+        self.assertFalse(os.path.exists(journal.path))
+        journal.delete()  # Deleting twice is fine
+
+
+if __name__ == "__main__":
+    unittest.main()
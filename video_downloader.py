@@ -1,21 +1,58 @@
 import os
 import sys
 import re
-import tkinter as tk
-from tkinter import ttk, filedialog, messagebox, simpledialog
-import yt_dlp
-import requests
+import importlib
 # tqdm is used by the _progress_hook for yt-dlp and directly for web downloads
 # from tqdm import tqdm # tqdm is not directly used, yt-dlp hook provides percentage
 import urllib.parse # Changed from from urllib.parse import urlparse
 import argparse
 import threading
-import colorama
-import imageio_ffmpeg
 import logging
 import time
+import itertools
+import json
+import hashlib
+import sqlite3
+import subprocess
+import functools
+import contextlib
+from concurrent.futures import Future, ThreadPoolExecutor, wait
 
-colorama.init()
+
+class LazyModule:
+    """Placeholder for a module that is imported the first time one of its attributes is used."""
+    def __init__(self, name):
+        self.__dict__['_name'] = name
+        self.__dict__['_module'] = None
+
+    def _load(self):
+        module = self.__dict__['_module']
+        if module is None:
+            module = importlib.import_module(self._name)
+            self.__dict__['_module'] = module
+        return module
+
+    def __getattr__(self, attr):
+        return getattr(self._load(), attr)
+
+    def __setattr__(self, attr, value):
+        setattr(self._load(), attr, value)
+
+
+# Heavy dependencies are only imported when they're first used, so --help, web
+# downloads and headless use don't pay for yt-dlp's extractors or for Tk
+yt_dlp = LazyModule("yt_dlp")
+requests = LazyModule("requests")
+imageio_ffmpeg = LazyModule("imageio_ffmpeg")
+tk = LazyModule("tkinter")
+ttk = LazyModule("tkinter.ttk")
+filedialog = LazyModule("tkinter.filedialog")
+messagebox = LazyModule("tkinter.messagebox")
+simpledialog = LazyModule("tkinter.simpledialog")
+# Only the asyncio web engine needs these
+asyncio = LazyModule("asyncio")
+ssl = LazyModule("ssl")
+http_client = LazyModule("http.client")
 
 # Custom logger to filter out specific warnings
 class YTDLPFilter(logging.Filter):
@@ -29,6 +66,940 @@ class YTDLPFilter(logging.Filter):
 yt_dlp_logger = logging.getLogger("yt_dlp")
 yt_dlp_logger.addFilter(YTDLPFilter())
 
+
+class BandwidthLimiter:
+    """Token bucket capping the download bandwidth of every transfer that draws from it.
+    
+    Transfers pass their job as key, and each recently active job gets an equal share
+    of the rate, however many connections it uses. clock and sleep can be replaced,
+    e.g. by fakes in tests.
+    """
+    def __init__(self, rate=None, burst=None, clock=time.monotonic, sleep=time.sleep):
+        self._clock = clock
+        self._sleep = sleep
+        self._lock = threading.Lock()
+        self._tokens = float('inf')  # Start with a full bucket
+        self._last = clock()
+        self._job_clock = {}  # Per job: time by which its fair share has paid for what it consumed
+        self._job_seen = {}  # Per job: when it last consumed
+        self._generation = 0  # Bumped on every rate change to wake up waiting transfers
+        self.set_rate(rate, burst)
+
+    def set_rate(self, rate, burst=None):
+        """Change the limit in bytes per second, None or 0 removes it. burst defaults to one second's worth."""
+        with self._lock:
+            self.rate = rate or None
+            self.burst = burst or self.rate
+            self._generation += 1
+            # Keep the bucket full while unlimited, so a new limit starts with a whole burst
+            self._tokens = min(self._tokens, self.burst) if self.rate else float('inf')
+
+    def reserve(self, nbytes, key=None):
+        """Take nbytes from the bucket and return how many seconds to wait before using them."""
+        with self._lock:
+            rate = self.rate
+            if not rate:
+                return 0
+            now = self._clock()
+            
+            # Refill the shared bucket, then go into debt for this transfer if needed
+            self._tokens = min(self.burst, self._tokens + (now - self._last) * rate)
+            self._last = now
+            self._tokens -= nbytes
+            delay = -self._tokens / rate if self._tokens < 0 else 0
+            
+            if key is not None:
+                # Jobs that haven't transferred anything for a second don't count towards the split
+                self._job_seen[key] = now
+                for other, seen in list(self._job_seen.items()):
+                    if now - seen > 1.0:
+                        del self._job_seen[other]
+                        self._job_clock.pop(other, None)
+                share = rate / len(self._job_seen)
+                # Each job may run ahead of its share by up to one burst
+                clock = max(self._job_clock.get(key, 0), now - self.burst / rate) + nbytes / share
+                self._job_clock[key] = clock
+                delay = max(delay, clock - now)
+            return delay
+
+    def consume(self, nbytes, key=None, should_stop=None):
+        """Wait until nbytes may be transferred, or until should_stop() returns True."""
+        generation = self._generation
+        deadline = self._clock() + self.reserve(nbytes, key)
+        # Sleep in short steps so a cancel, pause or new rate isn't stuck behind a long wait
+        while not (should_stop and should_stop()) and generation == self._generation:
+            remaining = deadline - self._clock()
+            if remaining <= 0:
+                break
+            self._sleep(min(remaining, 0.1))
+
+    async def consume_async(self, nbytes, key=None, should_stop=None):
+        """Like consume, but waits without blocking the event loop."""
+        generation = self._generation
+        deadline = self._clock() + self.reserve(nbytes, key)
+        while not (should_stop and should_stop()) and generation == self._generation:
+            remaining = deadline - self._clock()
+            if remaining <= 0:
+                break
+            await asyncio.sleep(min(remaining, 0.1))
+
+
+# Shared by every VideoDownloader, so the limit applies to the whole process
+bandwidth_limiter = BandwidthLimiter()
+
+
+def is_youtube_host(netloc):
+    """Whether a URL's netloc is youtube.com, youtu.be or one of their subdomains."""
+    host = netloc.rpartition("@")[2].split(":")[0].lower()
+    return any(host == domain or host.endswith("." + domain)
+               for domain in ("youtube.com", "youtu.be", "youtube-nocookie.com"))
+
+
+class MetadataCache:
+    """On-disk cache of yt-dlp extract_info results, with a TTL and LRU eviction."""
+    def __init__(self, path=None, ttl=3600, max_entries=500, clock=time.time):
+        self.path = path or os.path.join(os.path.expanduser("~"), ".cache", "video_downloader", "metadata.sqlite3")
+        self.ttl = ttl  # Seconds before an entry is considered stale
+        self.max_entries = max_entries  # Least recently used entries beyond this are evicted
+        self._clock = clock
+        self._conn = None
+        self._lock = threading.Lock()
+
+    def _connect(self):
+        if self._conn is None:
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+            self._conn = sqlite3.connect(self.path, check_same_thread=False)
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS info ("
+                "key TEXT PRIMARY KEY, data TEXT NOT NULL, created REAL NOT NULL, accessed REAL NOT NULL)"
+            )
+            self._conn.execute("CREATE INDEX IF NOT EXISTS info_accessed ON info (accessed)")
+        return self._conn
+
+    @staticmethod
+    def make_key(url, options):
+        """Build a cache key from the video or playlist id and the extraction options."""
+        parsed = urllib.parse.urlparse(url)
+        query = urllib.parse.parse_qs(parsed.query)
+        # Other sites use v= and list= too, their URLs are keyed as they are
+        if not is_youtube_host(parsed.netloc):
+            media_id = url
+        elif "list" in query:
+            media_id = f"youtube:playlist:{query['list'][0]}"
+        elif "v" in query:
+            media_id = f"youtube:video:{query['v'][0]}"
+        elif parsed.netloc.endswith("youtu.be") and parsed.path.strip("/"):
+            media_id = f"youtube:video:{parsed.path.strip('/')}"
+        else:
+            media_id = url
+        options_hash = hashlib.sha1(json.dumps(options, sort_keys=True).encode()).hexdigest()[:16]
+        return f"{media_id}|{options_hash}"
+
+    def get(self, key):
+        """Return the cached info dict for key, or None if it's missing or expired."""
+        now = self._clock()
+        try:
+            with self._lock:
+                conn = self._connect()
+                row = conn.execute("SELECT data, created FROM info WHERE key = ?", (key,)).fetchone()
+                if row is None:
+                    return None
+                if now - row[1] > self.ttl:
+                    conn.execute("DELETE FROM info WHERE key = ?", (key,))
+                    conn.commit()
+                    return None
+                conn.execute("UPDATE info SET accessed = ? WHERE key = ?", (now, key))
+                conn.commit()
+            return json.loads(row[0])
+        except (sqlite3.Error, ValueError) as e:
+            print(f"[WARN] Metadata cache read failed: {e}")
+            return None
+
+    def put(self, key, info):
+        """Store an info dict and evict the least recently used entries over max_entries."""
+        try:
+            data = json.dumps(info)
+        except (TypeError, ValueError):
+            return  # Not serializable, e.g. lazily paged playlist entries
+        now = self._clock()
+        try:
+            with self._lock:
+                conn = self._connect()
+                conn.execute("INSERT OR REPLACE INTO info (key, data, created, accessed) VALUES (?, ?, ?, ?)",
+                             (key, data, now, now))
+                conn.execute("DELETE FROM info WHERE key IN "
+                             "(SELECT key FROM info ORDER BY accessed DESC LIMIT -1 OFFSET ?)", (self.max_entries,))
+                conn.commit()
+        except sqlite3.Error as e:
+            print(f"[WARN] Metadata cache write failed: {e}")
+
+    def clear(self):
+        """Remove every cached entry."""
+        try:
+            with self._lock:
+                conn = self._connect()
+                conn.execute("DELETE FROM info")
+                conn.commit()
+        except sqlite3.Error as e:
+            print(f"[WARN] Metadata cache clear failed: {e}")
+
+    def close(self):
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+
+class DownloadArchive:
+    """Record of finished downloads, one "<extractor> <id>" line per video like yt-dlp's --download-archive."""
+    def __init__(self, path=None):
+        self.path = path or os.path.join(os.path.expanduser("~"), ".cache", "video_downloader", "archive.txt")
+        self._keys = None  # Loaded from disk on first use
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def make_key(info):
+        """Build the archive key for an info dict or flat playlist entry, or None if it has no id yet."""
+        extractor = info.get('extractor_key') or info.get('ie_key')
+        video_id = info.get('id')
+        if not extractor or not video_id:
+            return None
+        return f"{extractor.lower()} {video_id}"
+
+    @staticmethod
+    def key_for_url(url):
+        """Build the archive key for a YouTube video URL without extracting it, or None for other URLs."""
+        parsed = urllib.parse.urlparse(url)
+        query = urllib.parse.parse_qs(parsed.query)
+        if not is_youtube_host(parsed.netloc):
+            return None
+        if parsed.netloc.endswith("youtu.be") and parsed.path.strip("/"):
+            return f"youtube {parsed.path.strip('/')}"
+        if "youtube.com" in parsed.netloc:
+            if "v" in query:
+                return f"youtube {query['v'][0]}"
+            if parsed.path.startswith("/shorts/"):
+                return f"youtube {parsed.path.split('/')[2]}"
+        return None
+
+    def _load(self):
+        if self._keys is None:
+            self._keys = set()
+            try:
+                with open(self.path, 'r', encoding='utf-8') as f:
+                    self._keys.update(line.strip() for line in f if line.strip())
+            except FileNotFoundError:
+                pass
+            except OSError as e:
+                print(f"[WARN] Could not read download archive {self.path}: {e}")
+        return self._keys
+
+    def __contains__(self, key):
+        with self._lock:
+            return key is not None and key in self._load()
+
+    def __len__(self):
+        with self._lock:
+            return len(self._load())
+
+    def add(self, key):
+        """Record a finished download, appending it to the archive file."""
+        if key is None:
+            return
+        with self._lock:
+            keys = self._load()
+            if key in keys:
+                return
+            try:
+                os.makedirs(os.path.dirname(self.path), exist_ok=True)
+                with open(self.path, 'a', encoding='utf-8') as f:
+                    f.write(key + "\n")
+            except OSError as e:
+                print(f"[WARN] Could not update download archive {self.path}: {e}")
+            keys.add(key)
+
+
+class PostprocessTracker:
+    """yt-dlp postprocessor hook recording the videos that went through all of their post-processing.
+    
+    yt-dlp only moves a video's files into place after a successful download, as its last
+    post-processing step, and a step that fails never reports that it finished.
+    """
+    def __init__(self):
+        self.finished = []  # Info dicts of the videos that completed
+        self._unfinished = set()
+
+    def __call__(self, d):
+        name = d.get('postprocessor')
+        if d['status'] == 'started':
+            self._unfinished.add(name)
+        elif d['status'] == 'finished':
+            self._unfinished.discard(name)
+            if name == 'MoveFiles':
+                if not self._unfinished:
+                    self.finished.append(d.get('info_dict') or {})
+                self._unfinished.clear()
+
+
+@functools.lru_cache(maxsize=None)
+def deferred_postprocess_ydl_class():
+    """YoutubeDL subclass that downloads without post-processing, leaving it to run_deferred().
+
+    yt-dlp calls post_process() from inside process_info(), so the override only records its
+    arguments. Built on first use, since subclassing needs yt_dlp imported.
+    """
+    class DeferredPostprocessYoutubeDL(yt_dlp.YoutubeDL):
+        def __init__(self, *args, **kwargs):
+            super().__init__(*args, **kwargs)
+            self.deferred = []  # (filename, info, files_to_move) of each downloaded video
+
+        def post_process(self, filename, info, files_to_move=None):
+            # yt-dlp strips the keys a format shares with its video once it's downloaded
+            self.deferred.append((filename, dict(info), files_to_move))
+            info['filepath'] = filename
+            return info
+
+        def run_deferred(self):
+            """Post-process the recorded videos, once process_ie_result() has returned."""
+            deferred, self.deferred = self.deferred, []
+            for filename, info, files_to_move in deferred:
+                super().post_process(filename, info, files_to_move)
+
+    return DeferredPostprocessYoutubeDL
+
+
+class FFmpegProbe:
+    """Location, version, encoders and muxers of the FFmpeg binary, probed once and cached on disk.
+    
+    The cache is checked against the binary's size and mtime, so an updated binary is probed
+    again. While it's valid, later runs don't even need to import imageio-ffmpeg.
+    """
+    def __init__(self, path=None, binary=None):
+        self.path = path or os.path.join(os.path.expanduser("~"), ".cache", "video_downloader", "ffmpeg.json")
+        self.binary = binary  # FFmpeg to probe, found through imageio-ffmpeg if None
+        self._info = None
+        self._probed = False
+        self._lock = threading.Lock()
+
+    def get(self):
+        """Return {'path', 'version', 'encoders', 'muxers'}, or None if FFmpeg wasn't found.
+        
+        encoders maps each encoder name to its flags, e.g. 'A....D' for an audio encoder or
+        'V.FS..' for video with frame and slice threading. encoders and muxers are None if
+        the binary couldn't be probed.
+        """
+        with self._lock:
+            if not self._probed:
+                self._probed = True
+                self._info = self._load() or self._probe()
+            return self._info
+
+    @property
+    def exe(self):
+        info = self.get()
+        return info['path'] if info else None
+
+    def has_encoder(self, name):
+        """True if FFmpeg has the encoder, or if that's unknown."""
+        info = self.get()
+        return not info or info['encoders'] is None or name in info['encoders']
+
+    def has_muxer(self, name):
+        """True if FFmpeg has the muxer, or if that's unknown."""
+        info = self.get()
+        return not info or info['muxers'] is None or name in info['muxers']
+
+    def _stamp(self, binary):
+        stat = os.stat(binary)
+        return {'size': stat.st_size, 'mtime_ns': stat.st_mtime_ns}
+
+    def _load(self):
+        """Return the cached info if it still describes the binary that would be used."""
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                cached = json.load(f)
+            # A different binary was asked for, or imageio-ffmpeg would now pick another one
+            if cached.get('binary') != self.binary:
+                return None
+            if not self.binary and cached.get('env') != os.environ.get('IMAGEIO_FFMPEG_EXE'):
+                return None
+            if self._stamp(cached['path']) != cached['stamp']:
+                return None
+            return {key: cached[key] for key in ('path', 'version', 'encoders', 'muxers')}
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError, KeyError, TypeError) as e:
+            print(f"[WARN] Ignoring FFmpeg probe cache {self.path}: {e}")
+            return None
+
+    def _probe(self):
+        binary = self.binary
+        if not binary:
+            try:
+                binary = imageio_ffmpeg.get_ffmpeg_exe()
+            except Exception as e:
+                print(f"[WARN] Could not get FFmpeg path from imageio-ffmpeg: {e}")
+                print("[WARN] yt-dlp will try to find FFmpeg in system PATH. Merging high-quality streams might fail if not found.")
+                return None
+        
+        info = {'path': binary, 'version': None, 'encoders': None, 'muxers': None}
+        try:
+            version = self._run(binary, '-version')
+            info['version'] = version.splitlines()[0] if version else None
+            info['encoders'] = {name: flags for flags, name in self._table(self._run(binary, '-encoders'))}
+            info['muxers'] = sorted({name for flags, names in self._table(self._run(binary, '-muxers'))
+                                     if 'E' in flags for name in names.split(',')})
+        except (OSError, subprocess.SubprocessError) as e:
+            # Still usable, postprocessing just can't pick a path based on capabilities
+            print(f"[WARN] Could not probe FFmpeg at {binary}: {e}")
+            return info
+        
+        try:
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+            temp_path = self.path + ".tmp"
+            with open(temp_path, 'w', encoding='utf-8') as f:
+                json.dump(dict(info, stamp=self._stamp(binary), binary=self.binary,
+                               env=os.environ.get('IMAGEIO_FFMPEG_EXE')), f)
+            os.replace(temp_path, self.path)
+        except OSError as e:
+            print(f"[WARN] Could not save FFmpeg probe cache {self.path}: {e}")
+        return info
+
+    @staticmethod
+    def _run(binary, option):
+        result = subprocess.run([binary, '-hide_banner', option], capture_output=True, text=True,
+                                timeout=30, check=True)
+        return result.stdout
+
+    @staticmethod
+    def _table(output):
+        """Yield (flags, name) for each row of an -encoders or -muxers listing."""
+        rows = False
+        for line in output.splitlines():
+            parts = line.split()
+            if not rows:
+                # Rows start after the dashed line that ends the legend
+                rows = bool(parts) and set(parts[0]) == {'-'}
+                continue
+            if len(parts) >= 2:
+                yield parts[0], parts[1]
+
+
+class RemoteFileChangedError(Exception):
+    """The remote file no longer matches the validators saved in a resume journal."""
+
+
+class ResumeJournal:
+    """On-disk record of a partial web download, kept next to the file as <file>.vdjournal.
+    
+    It stores the URL, the ETag/Last-Modified validators and the byte ranges already
+    written, so a download can continue after a crash or restart.
+    """
+    SUFFIX = ".vdjournal"
+
+    def __init__(self, file_path, url, total_size, etag=None, last_modified=None, ranges=None):
+        self.file_path = file_path
+        self.url = url
+        self.total_size = total_size
+        self.etag = etag
+        self.last_modified = last_modified
+        self.ranges = [list(r) for r in ranges or []]  # Sorted, non-overlapping [start, end) pairs
+
+    @property
+    def path(self):
+        return self.file_path + self.SUFFIX
+
+    @classmethod
+    def load(cls, file_path):
+        """Read the journal for file_path, or return None if there is no usable one."""
+        try:
+            with open(file_path + cls.SUFFIX, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            return cls(file_path, data['url'], data['total_size'], data.get('etag'),
+                       data.get('last_modified'), data.get('ranges'))
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError, KeyError, TypeError) as e:
+            print(f"[WARN] Ignoring unreadable resume journal for {file_path}: {e}")
+            return None
+
+    def save(self, ranges=None):
+        """Write the journal atomically, after flushing the file data it describes to disk.
+        
+        ranges is a copy of self.ranges taken earlier, for callers that must not hold their
+        lock through the write.
+        """
+        if os.path.exists(self.file_path):
+            fd = os.open(self.file_path, os.O_RDWR)
+            try:
+                os.fsync(fd)
+            finally:
+                os.close(fd)
+        data = {
+            'url': self.url,
+            'total_size': self.total_size,
+            'etag': self.etag,
+            'last_modified': self.last_modified,
+            'ranges': self.ranges if ranges is None else ranges,
+        }
+        tmp_path = self.path + ".tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(data, f)
+        os.replace(tmp_path, self.path)
+
+    def delete(self):
+        try:
+            os.remove(self.path)
+        except FileNotFoundError:
+            pass
+
+    def if_range_value(self):
+        """Validator for an If-Range header. Weak ETags aren't allowed there, so fall back to Last-Modified."""
+        if self.etag and not self.etag.startswith('W/'):
+            return self.etag
+        return self.last_modified
+
+    def matches(self, url, total_size, etag, last_modified):
+        """Check whether the journal describes the same remote file."""
+        if self.url != url or self.total_size != total_size or not self.if_range_value():
+            return False
+        if self.etag and etag:
+            return self.etag == etag
+        return self.last_modified == last_modified
+
+    def add_range(self, start, end):
+        """Mark bytes [start, end) as written, merging with neighbouring ranges."""
+        merged = []
+        for r in self.ranges:
+            if r[1] < start or r[0] > end:
+                merged.append(r)
+            else:
+                start, end = min(start, r[0]), max(end, r[1])
+        merged.append([start, end])
+        merged.sort()
+        self.ranges = merged
+
+    def completed_bytes(self):
+        return sum(end - start for start, end in self.ranges)
+
+    def missing_ranges(self):
+        """Return the [start, end) ranges that still have to be downloaded."""
+        missing = []
+        position = 0
+        for start, end in self.ranges:
+            if start > position:
+                missing.append((position, start))
+            position = max(position, end)
+        if position < self.total_size:
+            missing.append((position, self.total_size))
+        return missing
+
+
+class AsyncHTTPResponse:
+    """HTTP/1.1 response read from asyncio streams, just enough for streaming downloads."""
+    def __init__(self, url, reader, writer, timeout):
+        self.url = url
+        self.status_code = None
+        self.headers = requests.structures.CaseInsensitiveDict()
+        self._reader = reader
+        self._writer = writer
+        self._timeout = timeout
+
+    async def _read(self, awaitable):
+        return await asyncio.wait_for(awaitable, self._timeout)
+
+    async def _read_head(self):
+        # Skip interim 1xx responses
+        while self.status_code is None or 100 <= self.status_code < 200:
+            status_line = await self._read(self._reader.readline())
+            parts = status_line.decode('latin-1').split(None, 2)
+            if len(parts) < 2 or not parts[0].startswith('HTTP/'):
+                raise ConnectionError(f"Invalid HTTP response from {self.url}")
+            self.status_code = int(parts[1])
+            self.headers.clear()
+            while True:
+                line = await self._read(self._reader.readline())
+                if line in (b'\r\n', b'\n', b''):
+                    break
+                name, _, value = line.decode('latin-1').partition(':')
+                self.headers[name.strip()] = value.strip()
+
+    def raise_for_status(self):
+        if self.status_code >= 400:
+            raise requests.HTTPError(f"{self.status_code} Error for url: {self.url}")
+
+    async def iter_content(self, chunk_size=1024*1024):
+        """Yield the body in chunks of at most chunk_size bytes."""
+        if self.headers.get('Transfer-Encoding', '').lower() == 'chunked':
+            while True:
+                size_line = await self._read(self._reader.readline())
+                size = int(size_line.split(b';')[0].strip() or b'0', 16)
+                if size == 0:
+                    return
+                while size:
+                    data = await self._read(self._reader.read(min(chunk_size, size)))
+                    if not data:
+                        raise ConnectionError(f"Connection closed in the middle of {self.url}")
+                    size -= len(data)
+                    yield data
+                await self._read(self._reader.readline())  # CRLF after each chunk
+        
+        length = self.headers.get('Content-Length')
+        remaining = int(length) if length is not None else None
+        while remaining is None or remaining > 0:
+            data = await self._read(self._reader.read(chunk_size if remaining is None else min(chunk_size, remaining)))
+            if not data:
+                if remaining:
+                    raise ConnectionError(f"Connection closed with {remaining} bytes of {self.url} left")
+                return
+            if remaining is not None:
+                remaining -= len(data)
+            yield data
+
+    async def aclose(self):
+        self._writer.close()
+        try:
+            await self._writer.wait_closed()
+        except Exception:
+            pass
+
+
+@functools.lru_cache(maxsize=None)
+def default_ssl_context():
+    """SSL context shared by all async connections, since loading the CA certificates is slow."""
+    return ssl.create_default_context()
+
+
+async def async_http_get(url, headers=None, timeout=30, max_redirects=5):
+    """Send a GET request over asyncio streams and return the response once its headers are read."""
+    for _ in range(max_redirects + 1):
+        parsed = urllib.parse.urlsplit(url)
+        secure = parsed.scheme == 'https'
+        reader, writer = await asyncio.wait_for(
+            asyncio.open_connection(parsed.hostname, parsed.port or (443 if secure else 80),
+                                    ssl=default_ssl_context() if secure else None),
+            timeout)
+        
+        path = (parsed.path or '/') + (f"?{parsed.query}" if parsed.query else '')
+        host = parsed.hostname if parsed.port is None else f"{parsed.hostname}:{parsed.port}"
+        lines = [f"GET {path} HTTP/1.1", f"Host: {host}", "User-Agent: video_downloader",
+                 "Accept-Encoding: identity", "Connection: close"]
+        lines += [f"{name}: {value}" for name, value in (headers or {}).items()]
+        writer.write(("\r\n".join(lines) + "\r\n\r\n").encode('latin-1'))
+        
+        response = AsyncHTTPResponse(url, reader, writer, timeout)
+        try:
+            await asyncio.wait_for(writer.drain(), timeout)
+            await response._read_head()
+        except BaseException:
+            await response.aclose()
+            raise
+        
+        if response.status_code in (301, 302, 303, 307, 308) and 'Location' in response.headers:
+            url = urllib.parse.urljoin(url, response.headers['Location'])
+            await response.aclose()
+            continue
+        return response
+    raise ConnectionError(f"Too many redirects for {url}")
+
+
+class ChunkSizer:
+    """Reusable read buffer for one transfer, sized from the measured throughput.
+    
+    Each read should take about target_interval seconds: small reads keep pause and
+    cancel responsive on slow links, large ones save syscalls on fast ones.
+    """
+    def __init__(self, initial=1024*1024, minimum=64*1024, maximum=8*1024*1024, target_interval=0.25):
+        self.minimum = minimum
+        self.maximum = max(minimum, maximum)
+        self.target_interval = target_interval
+        self.size = min(max(initial, self.minimum), self.maximum)
+        self._rate = None  # Smoothed bytes per second
+        self._last = None
+        self._buffer = bytearray()
+
+    def view(self):
+        """Return the buffer to read the next chunk into. It only grows, never shrinks."""
+        if len(self._buffer) < self.size:
+            self._buffer = bytearray(self.size)
+        return memoryview(self._buffer)[:self.size]
+
+    def start(self):
+        """Start timing the transfer from now."""
+        self._last = time.monotonic()
+
+    def skip_sample(self):
+        """Don't measure the current chunk, e.g. because the transfer was held while handling it."""
+        self._last = None
+
+    def update(self, nbytes):
+        """Record that a chunk of nbytes was read and handled, and resize for the next read."""
+        now = time.monotonic()
+        if self._last is not None and now > self._last:
+            rate = nbytes / (now - self._last)
+            self._rate = rate if self._rate is None else 0.7 * self._rate + 0.3 * rate
+            # Powers of two between the bounds, so small changes in speed don't resize every time
+            size = self.minimum
+            while size < self.maximum and size * 2 <= self._rate * self.target_interval:
+                size *= 2
+            self.size = min(size, self.maximum)
+        self._last = now
+
+
+class TransferSpeed:
+    """Smoothed speed and ETA of a web transfer, measured from the byte counts of its progress events.
+    
+    Sampling at progress events rather than per chunk lets the segments of one download
+    share a meter, which must then be updated under their progress lock.
+    """
+    def __init__(self):
+        self.rate = None  # Smoothed bytes per second
+        self._last = None  # (time, bytes downloaded) of the previous sample
+
+    def start(self, downloaded=0):
+        """Start timing the transfer from now, with downloaded bytes already done."""
+        self._last = (time.monotonic(), downloaded)
+
+    def skip_sample(self):
+        """Don't measure up to the next update, e.g. because the transfer was held meanwhile."""
+        self._last = None
+
+    def update(self, downloaded, total=None):
+        """Record the bytes downloaded so far and return (speed, eta), each None until known."""
+        now = time.monotonic()
+        if self._last is not None and now > self._last[0]:
+            rate = (downloaded - self._last[1]) / (now - self._last[0])
+            self.rate = rate if self.rate is None else 0.7 * self.rate + 0.3 * rate
+        self._last = (now, downloaded)
+        eta = int((total - downloaded) / self.rate) if self.rate and total else None
+        return self.rate, eta
+
+
+class ProgressCoalescer:
+    """Forward fetch progress events to a callback at a fixed maximum rate.
+    
+    Events with force_update=True (state changes, completion, errors) are always delivered,
+    right after the most recent event held back by the rate, if any. Other events arriving
+    faster than max_rate are held back; call flush() to deliver the last one when the
+    fetch ends without a forced event.
+    """
+    def __init__(self, callback, max_rate=10):
+        self.callback = callback
+        self.interval = 1.0 / max_rate if max_rate else 0
+        self._last_emit = 0.0
+        self._pending = None
+        self._lock = threading.Lock()
+
+    def __call__(self, current, total, status_text, force_update=False):
+        now = time.monotonic()
+        with self._lock:
+            if not force_update and now - self._last_emit < self.interval:
+                self._pending = (current, total, status_text, force_update)
+                return
+            pending = self._pending if force_update else None
+            self._pending = None
+            self._last_emit = now
+        if pending:
+            self.callback(*pending)
+        self.callback(current, total, status_text, force_update)
+
+    def flush(self):
+        """Deliver the last held-back event, if any."""
+        with self._lock:
+            pending, self._pending = self._pending, None
+            self._last_emit = time.monotonic()
+        if pending:
+            self.callback(*pending)
+
+
+class ProgressEvent:
+    """A structured progress update for one download job."""
+    __slots__ = ('job_id', 'phase', 'percent', 'message', 'downloaded_bytes', 'total_bytes',
+                 'speed', 'eta', 'playlist_index', 'playlist_count', 'chunk_size')
+    
+    # Phases while a download runs
+    EXTRACTING = "extracting"
+    DOWNLOADING = "downloading"
+    MERGING = "merging"
+    POSTPROCESSING = "post-processing"
+    # Final phases of a download run
+    PAUSED = "paused"
+    COMPLETED = "completed"
+    CANCELLED = "cancelled"
+    ERROR = "error"
+    SKIPPED = "skipped"  # Nothing to do, e.g. the video is in the download archive
+    FINAL_PHASES = frozenset((PAUSED, COMPLETED, CANCELLED, ERROR, SKIPPED))
+
+    def __init__(self, job_id, phase, percent, message="", downloaded_bytes=None, total_bytes=None,
+                 speed=None, eta=None, playlist_index=None, playlist_count=None, chunk_size=None):
+        self.job_id = job_id
+        self.phase = phase
+        self.percent = int(percent)
+        self.message = message
+        self.downloaded_bytes = downloaded_bytes
+        self.total_bytes = total_bytes
+        self.speed = speed  # Bytes per second
+        self.eta = eta  # Seconds
+        self.playlist_index = playlist_index
+        self.playlist_count = playlist_count
+        self.chunk_size = chunk_size  # Current read size of a web transfer, in bytes
+
+    def __repr__(self):
+        return f"<ProgressEvent job={self.job_id} {self.phase} {self.percent}% {self.message!r}>"
+
+    @property
+    def is_final(self):
+        return self.phase in self.FINAL_PHASES
+
+
+class DownloadJob:
+    """State and control handles for a single download."""
+    _ids = itertools.count(1)
+
+    def __init__(self, url, quality="best", output_path=None, playlist_option=None,
+                 playlist_items=None, progress_callback=None):
+        self.id = next(DownloadJob._ids)
+        self.url = url
+        self.quality = quality
+        self.output_path = output_path
+        self.playlist_option = playlist_option
+        self.playlist_items = playlist_items
+        self.progress_callback = progress_callback  # Legacy (percent, status) callback
+        self.listeners = []  # Called with a ProgressEvent for every update
+        self.last_event = None
+        
+        # queued, downloading, paused, completed, skipped, cancelled or failed
+        self.status = "queued"
+        self.progress = 0
+        self.status_text = ""
+        self.result = None
+        
+        # Control flags checked by the download loops. A "teardown" pause sets is_paused and
+        # stops the download, a "hold" pause sets is_held and blocks the transfer in place.
+        self.is_paused = False
+        self.is_held = False
+        self.should_cancel = False
+        self.downloaded_bytes = 0
+        self._hook_bytes = {}  # Bytes seen so far per file by the yt-dlp progress hook
+        self.resume_file = None
+        self._done = threading.Event()
+        self._resumed = threading.Event()
+        self._resumed.set()
+        self._hold_lock = threading.Lock()
+        self._last_progress = 0.0
+
+    def __repr__(self):
+        return f"<DownloadJob {self.id} {self.status} {self.progress}% {self.url}>"
+
+    @property
+    def is_done(self):
+        return self._done.is_set()
+
+    def report(self, phase, percent, message, **fields):
+        """Record a progress update and send it to the progress callback and event listeners."""
+        event = ProgressEvent(self.id, phase, percent, message, **fields)
+        self.progress = event.percent
+        self.status_text = message
+        self.last_event = event
+        if self.progress_callback:
+            self.progress_callback(event.percent, message)
+        for listener in tuple(self.listeners):
+            listener(event)
+        return event
+
+    def progress_due(self, interval):
+        """Return True if at least interval seconds passed since the last progress update was due."""
+        now = time.monotonic()
+        if now - self._last_progress < interval:
+            return False
+        self._last_progress = now
+        return True
+
+    def pause(self, mode="hold"):
+        """Ask a running download to pause, either holding its transfer open or tearing it down."""
+        if self.status != "downloading" or self.is_paused or self.is_held:
+            return False
+        if mode == "teardown":
+            self.is_paused = True
+        else:
+            self._resumed.clear()
+            self.is_held = True
+        return True
+
+    def resume(self):
+        """Wake a held download. Returns False if it isn't held, e.g. it was torn down and needs restarting."""
+        if not self.is_held:
+            return False
+        self.is_held = False
+        self._resumed.set()
+        return True
+
+    def hold(self, report=None, percent=None):
+        """Block the calling transfer while the job is held. Returns False if it was cancelled meanwhile."""
+        self._enter_hold(report, percent)
+        self._resumed.wait()
+        return self._leave_hold(report, percent)
+
+    async def hold_async(self, report=None, percent=None):
+        """Like hold, but waits without blocking the event loop."""
+        self._enter_hold(report, percent)
+        while not self._resumed.is_set():
+            await asyncio.sleep(0.05)
+        return self._leave_hold(report, percent)
+
+    def _enter_hold(self, report, percent):
+        # Several transfers of one job can be held at once, only the first reports the pause
+        with self._hold_lock:
+            if self.is_held and self.status == "downloading":
+                self.status = "paused"
+                (report or self.report)(ProgressEvent.PAUSED, self.progress if percent is None else percent,
+                                        "Download paused", downloaded_bytes=self.downloaded_bytes)
+
+    def _leave_hold(self, report, percent):
+        with self._hold_lock:
+            if self.status == "paused" and not self.should_cancel:
+                self.status = "downloading"
+                (report or self.report)(ProgressEvent.DOWNLOADING, self.progress if percent is None else percent,
+                                        "Resuming download...")
+        return not self.should_cancel
+
+    def cancel(self):
+        """Ask the download to stop, or cancel it right away if it isn't running."""
+        if self.is_done:
+            return False
+        # A held download still has a transfer running, which will notice the cancel once woken
+        torn_down = self.status == "paused" and not self.is_held
+        self.should_cancel = True
+        self.is_paused = False
+        self.is_held = False
+        self._resumed.set()
+        if torn_down:
+            self.finish(False)
+        return True
+
+    def finish(self, result):
+        """Record the outcome of a download run. Waiters are only woken if it didn't just pause."""
+        self.result = result
+        # A hold that arrives after the last chunk has nothing left to hold
+        self.is_held = False
+        self._resumed.set()
+        if self.should_cancel:
+            self.status = "cancelled"
+        elif self.is_paused:
+            self.status = "paused"
+            return
+        elif not result:
+            self.status = "failed"
+        else:
+            skipped = self.last_event is not None and self.last_event.phase == ProgressEvent.SKIPPED
+            self.status = "skipped" if skipped else "completed"
+        self._done.set()
+
+    def wait(self, timeout=None):
+        """Block until the download completes, fails or is cancelled."""
+        return self._done.wait(timeout)
+
+
 class VideoDownloader:
     def __init__(self):
         self.download_path = os.path.join(os.path.expanduser("~"), "Downloads")
@@ -42,25 +1013,171 @@ class VideoDownloader:
             "highest": "best",
             "audio only": "audio"  # Add audio-only option
         }
-        self.ffmpeg_path = None
-        try:
-            self.ffmpeg_path = imageio_ffmpeg.get_ffmpeg_exe()
-        except Exception as e:
-            print(f"[WARN] Could not get FFmpeg path from imageio-ffmpeg: {e}")
-            print("[WARN] yt-dlp will try to find FFmpeg in system PATH. Merging high-quality streams might fail if not found.")
-            
-        # Download control attributes
-        self.download_process = None
-        self.is_downloading = False
-        self.is_paused = False
-        self.should_cancel = False
-        self.current_url = None
-        self.current_output_path = None
-        self.current_quality = None
-        self.current_playlist_option = None
-        self.current_playlist_items = None
-        self.downloaded_bytes = 0
-        self.resume_file = None
+        # FFmpeg location and capabilities, probed the first time a download may need to merge
+        # or convert and cached on disk until the binary changes
+        self.ffmpeg = FFmpegProbe()
+        # Extracted audio is converted to this codec, unless FFmpeg has no encoder for it
+        self.audio_codec = "mp3"
+        self.audio_quality = "192"
+            
+        # Job driven by the single-download API (download_video, pause/resume/cancel_download).
+        # Concurrent downloads go through DownloadQueue, which keeps one DownloadJob per download.
+        self.current_job = None
+        
+        # Cache of extract_info results, so repeated probes of a URL skip network extraction
+        self.metadata_cache = MetadataCache()
+        self.use_metadata_cache = True
+        
+        # Videos that finished downloading, skipped before extraction on later runs. The archive
+        # only knows video ids, not the quality or folder, so like yt-dlp's it is opt-in.
+        self.download_archive = DownloadArchive()
+        self.use_download_archive = False
+        
+        # Called with a ProgressEvent for every update of every download
+        self._progress_listeners = []
+        
+        # Max fetch progress updates per second sent to fetch_progress_callback
+        self.fetch_progress_rate = 10
+        
+        # Minimum seconds between progress updates sent for a download. Byte counts are
+        # still recorded on every chunk, and final states are always sent.
+        self.progress_interval = 0.1
+        
+        # Number of playlist entries downloaded at the same time
+        self.playlist_workers = 3
+        
+        # Full details of playlist entries are fetched this many at a time, starting at most
+        # hydration_rate extractions per second (None for no limit), see hydrate_playlist_entries
+        self.hydration_workers = 10
+        self.hydration_rate = 10
+        
+        # Merging, audio extraction and remuxing of playlist entries run on their own pool of
+        # postprocess_workers threads (None for one per CPU core), so the next entries download
+        # meanwhile. Once postprocess_queue_size entries (None for twice the workers) are waiting
+        # or being processed, finished downloads wait for a free slot before the next one starts.
+        self.postprocess_workers = None
+        self.postprocess_queue_size = None
+        
+        # Multi-connection settings for web downloads
+        self.connections = 4  # Number of parallel connections per web download
+        self.min_segment_size = 1024 * 1024  # Don't split files into segments smaller than 1 MiB
+        self.segment_retries = 3  # Reconnects of a failing segment in a row before the download gives up
+        # Read sizes of web transfers adapt to their throughput, so each read takes about
+        # chunk_interval seconds, starting at chunk_size and within min/max_chunk_size
+        self.chunk_size = 1024 * 1024
+        self.min_chunk_size = 64 * 1024
+        self.max_chunk_size = 8 * 1024 * 1024
+        self.chunk_interval = 0.25
+        self.journal_interval = 1.0  # Seconds between resume journal saves during a web download
+        
+        # Transfers run at once by the asyncio engine (download_web_videos)
+        self.async_concurrency = 100
+        
+        # Process-wide bandwidth limit, see set_rate_limit
+        self.bandwidth = bandwidth_limiter
+        
+        # "hold" pauses block transfers in place so resuming is instant, "teardown" stops
+        # them and starts the download again on resume, which suits long pauses better
+        self.pause_mode = "hold"
+        
+        # Shared HTTP connection pool for web downloads, created on first use
+        self.http_pool_connections = 10  # Number of hosts to keep a connection pool for
+        self.http_pool_maxsize = 16  # Keep-alive connections per host, should be >= connections
+        self.http_max_retries = 3  # Retries for failed connects and 5xx responses
+        self.http_timeout = 30  # Connect/read timeout in seconds
+        self._http_adapter = None
+        self._http_local = threading.local()
+        self._http_lock = threading.Lock()
+
+    def _get_http_session(self):
+        """Return this thread's HTTP session, backed by the shared connection pool."""
+        session = getattr(self._http_local, 'session', None)
+        if session is None:
+            with self._http_lock:
+                if self._http_adapter is None:
+                    # allowed_methods needs urllib3 1.26, see requirements.txt
+                    from urllib3.util.retry import Retry
+                    retries = Retry(
+                        total=self.http_max_retries,
+                        backoff_factor=0.5,
+                        status_forcelist=[500, 502, 503, 504],
+                        allowed_methods=["GET", "HEAD"],
+                    )
+                    self._http_adapter = requests.adapters.HTTPAdapter(
+                        pool_connections=self.http_pool_connections,
+                        pool_maxsize=self.http_pool_maxsize,
+                        max_retries=retries,
+                    )
+            # Sessions aren't thread-safe, so each thread gets its own one
+            # mounted on the same adapter to share keep-alive connections
+            session = requests.Session()
+            # Uncompressed bodies can be read straight into our buffers, see _iter_into
+            session.headers['Accept-Encoding'] = 'identity'
+            session.mount("http://", self._http_adapter)
+            session.mount("https://", self._http_adapter)
+            self._http_local.session = session
+        return session
+
+    def _http_get(self, url, **kwargs):
+        """Send a GET request through the shared connection pool."""
+        kwargs.setdefault('timeout', self.http_timeout)
+        return self._get_http_session().get(url, **kwargs)
+
+    def close(self):
+        """Close the shared HTTP connection pool and the metadata cache."""
+        if self.metadata_cache:
+            self.metadata_cache.close()
+        with self._http_lock:
+            if self._http_adapter is not None:
+                self._http_adapter.close()
+                self._http_adapter = None
+            # Every thread picks up a fresh session on its next request
+            self._http_local = threading.local()
+
+    @property
+    def ffmpeg_path(self):
+        """Path of the FFmpeg binary from imageio-ffmpeg, or None to let yt-dlp search the PATH."""
+        return self.ffmpeg.exe
+
+    @ffmpeg_path.setter
+    def ffmpeg_path(self, path):
+        self.ffmpeg = FFmpegProbe(binary=path)
+
+    # FFmpeg encoder used for each audio_codec, where the names differ
+    AUDIO_ENCODERS = {"mp3": "libmp3lame", "opus": "libopus", "vorbis": "libvorbis"}
+
+    def _audio_postprocessors(self):
+        """Postprocessors extracting the audio track, copied as-is if FFmpeg can't encode audio_codec."""
+        codec = self.audio_codec
+        encoder = self.AUDIO_ENCODERS.get(codec, codec)
+        if codec != "best" and not self.ffmpeg.has_encoder(encoder):
+            print(f"[WARN] FFmpeg has no {encoder} encoder, keeping the original audio codec")
+            codec = "best"  # yt-dlp copies the stream instead of transcoding it
+        return [{
+            'key': 'FFmpegExtractAudio',
+            'preferredcodec': codec,
+            'preferredquality': self.audio_quality,
+        }]
+
+    def _merge_output_format(self):
+        """Container that separate video and audio streams are copied into, without re-encoding."""
+        if self.ffmpeg.has_muxer('mp4'):
+            return 'mp4'
+        # Matroska takes any codec, so the streams can still be copied
+        return 'mkv' if self.ffmpeg.has_muxer('matroska') else None
+
+    @property
+    def is_downloading(self):
+        return self.current_job is not None and self.current_job.status == "downloading"
+
+    @property
+    def is_paused(self):
+        job = self.current_job
+        return job is not None and (job.is_paused or job.is_held)
+
+    @property
+    def should_cancel(self):
+        return self.current_job is not None and self.current_job.should_cancel
 
     def validate_url(self, url):
         """Validate if the URL is valid."""
@@ -80,15 +1197,20 @@ class VideoDownloader:
         """Check if the URL is a YouTube playlist."""
         return "playlist" in url or "list=" in url
 
-    def get_playlist_info(self, url, fetch_progress_callback=None):
-        """Get information about a YouTube playlist."""
+    def get_playlist_info(self, url, fetch_progress_callback=None, flat=True):
+        """Get information about a YouTube playlist.
+        
+        With flat=True only the playlist listing is fetched, which already has the index, id,
+        title and duration of every entry. Use get_playlist_entry_details() for the rest.
+        """
         try:
             # Use different options to properly extract playlist videos
             ydl_opts = {
                 'quiet': False,  # Enable output for debugging
                 'ignoreerrors': True,
                 'skip_download': True,
-                'extract_flat': False,  # Don't use extract_flat, get full info
+                # Flat extraction only reads the playlist pages instead of resolving every video
+                'extract_flat': 'in_playlist' if flat else False,
                 'noplaylist': False,
                 'force_generic_extractor': False,
                 'logger': yt_dlp_logger,  # Use our filtered logger
@@ -98,6 +1220,7 @@ class VideoDownloader:
             print(f"Fetching playlist info for {url}")
             
             # Update callback if provided
+            fetch_progress_callback = self._coalesce_fetch_progress(fetch_progress_callback)
             if fetch_progress_callback:
                 fetch_progress_callback(0, 1, "Fetching playlist info...", True)
             
@@ -106,7 +1229,7 @@ class VideoDownloader:
                 if fetch_progress_callback:
                     fetch_progress_callback(0, 0, "Fetching playlist info...", True)
                     
-                basic_info = ydl.extract_info(url, download=False, process=True)
+                basic_info = self._extract_info(ydl, url)
                 if not basic_info:
                     print("Failed to get playlist info")
                     return None
@@ -131,7 +1254,7 @@ class VideoDownloader:
                         if fetch_progress_callback:
                             fetch_progress_callback(0, 0, "Retrying with direct playlist URL...", True)
                         try:
-                            basic_info = ydl.extract_info(direct_url, download=False)
+                            basic_info = self._extract_info(ydl, direct_url)
                             entries = basic_info.get('entries', [])
                         except Exception as e:
                             print(f"Error with direct URL: {e}")
@@ -142,8 +1265,6 @@ class VideoDownloader:
                 print(f"Found playlist: {playlist_title} with {total_videos} videos")
                 if fetch_progress_callback:
                     fetch_progress_callback(0, total_videos, f"Found playlist: {playlist_title} with {total_videos} videos", True)
-                    # Small delay to let UI update
-                    time.sleep(0.2)
                 
                 # Create a list of video details
                 videos = []
@@ -155,47 +1276,19 @@ class VideoDownloader:
                     current_video = i + 1
                     if fetch_progress_callback:
                         msg = f"Processing video {current_video}/{total_videos}: {entry.get('title', f'Video {current_video}')}"
-                        print(f"Calling callback with: {msg}")
+                        # Rate-limited by the coalescer, so this never slows down the loop
                         fetch_progress_callback(current_video, total_videos, msg, False)
-                        
-                        # Force UI update with small sleep between videos
-                        if i % 3 == 0:  # Sleep every 3 videos to avoid too much slowdown
-                            time.sleep(0.1)
                     
                     print(f"Processing video {current_video}/{total_videos}: {entry.get('title', f'Video {current_video}')}")
                     
                     if not entry:
                         continue
-                        
-                    duration = entry.get('duration', 0)
-                    total_duration += duration
                     
-                    # Format duration
-                    mins, secs = divmod(duration, 60)
-                    hours, mins = divmod(mins, 60)
-                    if hours > 0:
-                        duration_str = f"{hours}:{mins:02d}:{secs:02d}"
-                    else:
-                        duration_str = f"{mins}:{secs:02d}"
-                    
-                    title = entry.get('title', f'Video {i+1}')
-                    
-                    videos.append({
-                        'index': i + 1,
-                        'title': title,
-                        'id': entry.get('id', ''),
-                        'url': entry.get('webpage_url', ''),
-                        'duration': duration,
-                        'duration_str': duration_str
-                    })
+                    video = self._playlist_entry_record(current_video, entry)
+                    total_duration += video['duration']
+                    videos.append(video)
                 
-                # Format total duration
-                hours, remainder = divmod(total_duration, 3600)
-                minutes, seconds = divmod(remainder, 60)
-                if hours > 0:
-                    total_duration_str = f"{hours}h {minutes}m {seconds}s"
-                else:
-                    total_duration_str = f"{minutes}m {seconds}s"
+                total_duration_str = self._format_total_duration(total_duration)
                 
                 # Final progress update
                 if fetch_progress_callback:
@@ -217,57 +1310,294 @@ class VideoDownloader:
                 fetch_progress_callback(0, 0, f"Error: {str(e)}", True)
             return None
 
+    def iter_playlist_entries(self, url, start=1, limit=None, page_size=100,
+                              fetch_progress_callback=None, playlist_callback=None):
+        """Yield the entries of a playlist as they are listed, in the format of get_playlist_info()'s videos.
+        
+        Long playlists are listed page_size entries at a time, and only as far as they're
+        consumed, so the first entries arrive after the first page. start is the 1-based
+        index of the first entry, limit the maximum number of entries. Stop early by
+        breaking out of the loop or closing the generator. playlist_callback is called with
+        the playlist's title, id and total_videos (None if not known yet) before the first entry.
+        """
+        ydl_opts = {
+            'quiet': True,
+            'no_warnings': True,
+            'ignoreerrors': True,
+            'skip_download': True,
+            'extract_flat': 'in_playlist',
+            'noplaylist': False,
+            'logger': yt_dlp_logger,  # Use our filtered logger
+            'no_color': True,  # Disable color codes in output
+        }
+        fetch_progress_callback = self._coalesce_fetch_progress(fetch_progress_callback)
+        if fetch_progress_callback:
+            fetch_progress_callback(0, 0, "Fetching playlist info...", True)
+        
+        with yt_dlp.YoutubeDL(ydl_opts) as ydl:
+            # A complete listing from get_playlist_info() or an earlier full iteration
+            info = cache_key = None
+            if self.use_metadata_cache and self.metadata_cache:
+                options = {name: ydl.params.get(name) for name in ('extract_flat', 'format', 'playlist_items', 'noplaylist')}
+                cache_key = self.metadata_cache.make_key(url, options)
+                info = self.metadata_cache.get(cache_key)
+                if info is not None:
+                    print(f"Using cached info for {url}")
+                    cache_key = None  # Nothing to store afterwards
+            
+            if info is None:
+                # process=False leaves the entries as yt-dlp's lazy generator or paged list,
+                # which only fetches the playlist pages that are actually read
+                info = ydl.extract_info(url, download=False, process=False)
+                for _ in range(5):
+                    if not info or info.get('_type') not in ('url', 'url_transparent'):
+                        break
+                    info = ydl.extract_info(info['url'], download=False, ie_key=info.get('ie_key'), process=False)
+            if not info:
+                print("Failed to get playlist info")
+                if fetch_progress_callback:
+                    fetch_progress_callback(0, 0, "Failed to get playlist info", True)
+                return
+            
+            total = info.get('playlist_count')
+            entries = info.get('entries') or []
+            if isinstance(entries, list):
+                total = total or len(entries)
+            if playlist_callback:
+                playlist_callback({
+                    'title': info.get('title', 'Unknown Playlist'),
+                    'id': info.get('id'),
+                    'total_videos': total,
+                })
+            
+            # A complete listing is cached for the download that usually follows
+            listed = [] if cache_key and start == 1 and limit is None else None
+            index = start - 1
+            count = 0
+            try:
+                for page in self._playlist_pages(entries, start, page_size):
+                    for entry in page:
+                        index += 1
+                        if listed is not None:
+                            listed.append(entry)
+                        if not entry:
+                            continue
+                        yield self._playlist_entry_record(index, entry)
+                        count += 1
+                        if limit is not None and count >= limit:
+                            return
+                    if fetch_progress_callback:
+                        fetch_progress_callback(index, total or 0, f"Fetched {index} videos", False)
+            finally:
+                # Stopping early sends no final event, so deliver the last held-back one
+                if fetch_progress_callback:
+                    fetch_progress_callback.flush()
+            
+            if listed is not None:
+                playlist = {key: info.get(key) for key in ('_type', 'id', 'title', 'uploader', 'uploader_id', 'webpage_url', 'extractor_key')}
+                playlist.update(playlist_count=len(listed), entries=listed)
+                self.metadata_cache.put(cache_key, ydl.sanitize_info(playlist))
+            if fetch_progress_callback:
+                fetch_progress_callback(index, index, f"Completed fetching {index} videos", True)
+
+    @staticmethod
+    def _playlist_pages(entries, start, page_size):
+        """Yield lists of up to page_size raw entries, starting at the 1-based index start."""
+        if hasattr(entries, 'getslice'):
+            # yt-dlp's PagedList only downloads the pages a slice covers
+            for offset in itertools.count(start - 1, page_size):
+                page = entries.getslice(offset, offset + page_size)
+                if not page:
+                    return
+                yield page
+        else:
+            iterator = itertools.islice(iter(entries), start - 1, None)
+            for page in iter(lambda: list(itertools.islice(iterator, page_size)), []):
+                yield page
+
+    @staticmethod
+    def _playlist_entry_record(index, entry):
+        """Turn a flat playlist entry into a record of the videos list of get_playlist_info()."""
+        # Flat entries may not know their duration, and it can be a float
+        duration = int(entry.get('duration') or 0)
+        mins, secs = divmod(duration, 60)
+        hours, mins = divmod(mins, 60)
+        if hours > 0:
+            duration_str = f"{hours}:{mins:02d}:{secs:02d}"
+        else:
+            duration_str = f"{mins}:{secs:02d}"
+        return {
+            'index': index,
+            'title': entry.get('title') or f'Video {index}',
+            'id': entry.get('id', ''),
+            'url': entry.get('webpage_url') or entry.get('url', ''),
+            'duration': duration,
+            'duration_str': duration_str
+        }
+
+    @staticmethod
+    def _format_total_duration(total_duration):
+        hours, remainder = divmod(total_duration, 3600)
+        minutes, seconds = divmod(remainder, 60)
+        if hours > 0:
+            return f"{hours}h {minutes}m {seconds}s"
+        return f"{minutes}m {seconds}s"
+
+    def _extract_info(self, ydl, url, cached=True):
+        """Run ydl.extract_info(url, download=False), serving repeated lookups from the metadata cache.
+        
+        With cached=False the info is always extracted afresh, e.g. because its signed format
+        URLs may have expired in the cache, and only stored for later lookups.
+        """
+        key = None
+        if self.use_metadata_cache and self.metadata_cache:
+            # Options that change what extract_info returns are part of the key
+            options = {name: ydl.params.get(name) for name in ('extract_flat', 'format', 'playlist_items', 'noplaylist')}
+            key = self.metadata_cache.make_key(url, options)
+            info = self.metadata_cache.get(key) if cached else None
+            if info is not None:
+                print(f"Using cached info for {url}")
+                return info
+        
+        info = ydl.extract_info(url, download=False)
+        if info and key:
+            self.metadata_cache.put(key, ydl.sanitize_info(info))
+        return info
+
+    def add_progress_listener(self, listener):
+        """Subscribe to the ProgressEvents of all downloads started from now on."""
+        self._progress_listeners.append(listener)
+
+    def remove_progress_listener(self, listener):
+        if listener in self._progress_listeners:
+            self._progress_listeners.remove(listener)
+
+    def _create_job(self, url, quality="best", output_path=None, playlist_option=None,
+                    playlist_items=None, progress_callback=None):
+        """Create a DownloadJob that reports to this downloader's progress listeners."""
+        job = DownloadJob(url, quality, output_path, playlist_option, playlist_items, progress_callback)
+        job.listeners = self._progress_listeners
+        return job
+
+    def _coalesce_fetch_progress(self, fetch_progress_callback):
+        """Wrap a fetch progress callback so it is called at most fetch_progress_rate times per second."""
+        if fetch_progress_callback is None or isinstance(fetch_progress_callback, ProgressCoalescer):
+            return fetch_progress_callback
+        return ProgressCoalescer(fetch_progress_callback, self.fetch_progress_rate)
+
+    def get_playlist_entry_details(self, video, fetch_progress_callback=None):
+        """Fetch full details for one entry of a flat playlist listing, caching them on the entry."""
+        if video.get('details') is None:
+            video['details'] = self.get_video_info(video.get('url') or video.get('id'), fetch_progress_callback)
+        return video['details']
+
+    def hydrate_playlist_entries(self, videos, cancel_event=None, result_callback=None, fetch_progress_callback=None):
+        """Fetch full details (formats, filesize, thumbnails...) of some playlist entries in parallel.
+        
+        videos are records from get_playlist_info() or iter_playlist_entries(). Returns their
+        details in the same order, with None for entries that failed or were skipped.
+        result_callback(i, video, details) is called as each entry finishes, in completion
+        order. Setting cancel_event stops starting extractions and returns without waiting
+        for the running ones.
+        """
+        cancel_event = cancel_event or threading.Event()
+        fetch_progress_callback = self._coalesce_fetch_progress(fetch_progress_callback)
+        # A token bucket counting extractions instead of bytes
+        limiter = BandwidthLimiter(self.hydration_rate)
+        results = [None] * len(videos)
+        finished = [0]
+        lock = threading.Lock()
+        
+        def hydrate(i, video):
+            if cancel_event.is_set():
+                return
+            if video.get('details') is None:
+                # Details fetched before don't count against the rate
+                limiter.consume(1, should_stop=cancel_event.is_set)
+                if cancel_event.is_set():
+                    return
+            details = self.get_playlist_entry_details(video)
+            results[i] = details
+            with lock:
+                finished[0] += 1
+                count = finished[0]
+            if cancel_event.is_set():
+                return
+            if result_callback:
+                result_callback(i, video, details)
+            if fetch_progress_callback:
+                fetch_progress_callback(count, len(videos), f"Fetched details of {count}/{len(videos)} videos", False)
+        
+        executor = ThreadPoolExecutor(max_workers=max(1, min(self.hydration_workers, len(videos))))
+        futures = [executor.submit(hydrate, i, video) for i, video in enumerate(videos)]
+        try:
+            pending = set(futures)
+            # Wake up regularly to notice a cancel
+            while pending and not cancel_event.is_set():
+                _, pending = wait(pending, timeout=0.1)
+        finally:
+            for future in futures:
+                future.cancel()
+            executor.shutdown(wait=not cancel_event.is_set())
+        
+        if fetch_progress_callback and not cancel_event.is_set():
+            fetch_progress_callback(finished[0], len(videos), f"Fetched details of {finished[0]}/{len(videos)} videos", True)
+        return results
+
     def download_video(self, url, quality="best", output_path=None, progress_callback=None, 
-                      playlist_option=None, playlist_items=None, resume=False):
+                      playlist_option=None, playlist_items=None, resume=False, job=None):
         """Download video from YouTube or web."""
-        if not resume:
-            # Save current download parameters for resume capability
-            self.current_url = url
-            self.current_quality = quality
-            self.current_playlist_option = playlist_option
-            self.current_playlist_items = playlist_items
-            self.should_cancel = False
-            self.is_paused = False
+        if job is None:
+            if resume and self.current_job:
+                job = self.current_job
+            else:
+                # Save current download parameters for resume capability
+                job = self._create_job(url, quality, output_path, playlist_option, playlist_items, progress_callback)
+                self.current_job = job
+        if progress_callback:
+            job.progress_callback = progress_callback
+        job.is_paused = False
         
         if not output_path:
             output_path = self.download_path
             
-        self.current_output_path = output_path
+        job.output_path = output_path
             
         if not os.path.exists(output_path):
             os.makedirs(output_path)
             
-        self.is_downloading = True
+        job.status = "downloading"
         
+        result = False
         try:
             if self.is_youtube_url(url):
                 if self.is_playlist(url):
                     if playlist_option == "specific":
                         result = self.download_youtube_playlist_items(url, quality, output_path, 
-                                                                progress_callback, playlist_items)
+                                                                progress_callback, playlist_items, job=job)
                     elif playlist_option == "range":
                         result = self.download_youtube_playlist_range(url, quality, output_path, 
-                                                                progress_callback, playlist_items)
+                                                                progress_callback, playlist_items, job=job)
                     else:  # Default to full playlist
-                        result = self.download_youtube_playlist(url, quality, output_path, progress_callback)
+                        result = self.download_youtube_playlist(url, quality, output_path, progress_callback, job=job)
                 else:
-                    result = self.download_youtube_video(url, quality, output_path, progress_callback)
+                    result = self.download_youtube_video(url, quality, output_path, progress_callback, job=job)
             else:
-                result = self.download_web_video(url, output_path, progress_callback)
+                result = self.download_web_video(url, output_path, progress_callback, job=job)
                 
-            self.is_downloading = False
             return result
         except Exception as e:
             print(f"Error in download_video: {str(e)}")
-            self.is_downloading = False
             return False
         finally:
+            job.finish(result)
             # Make sure to reset if the download completed or failed with an exception
-            if not self.is_paused:
+            if job is self.current_job and not job.is_paused:
                 self.reset_download_state()
 
-    def download_youtube_video(self, url, quality="best", output_path=None, progress_callback=None):
+    def download_youtube_video(self, url, quality="best", output_path=None, progress_callback=None, job=None):
         """Download a YouTube video with selected quality, attempting to merge audio and video."""
+        job = job or self._create_job(url, quality, output_path, progress_callback=progress_callback)
         try:
             q_val = self.quality_options.get(quality, "best")
             
@@ -275,11 +1605,7 @@ class VideoDownloader:
             if q_val == "audio":
                 format_selector = 'bestaudio/best'  # Select best audio quality
                 output_template = os.path.join(output_path, '%(title)s.%(ext)s')
-                postprocessors = [{
-                    'key': 'FFmpegExtractAudio',
-                    'preferredcodec': 'mp3',
-                    'preferredquality': '192',
-                }]
+                postprocessors = self._audio_postprocessors()
             else:
                 # More robust format selection that better handles SABR streaming issues
                 if q_val == "best":
@@ -291,14 +1617,16 @@ class VideoDownloader:
                 output_template = os.path.join(output_path, '%(title)s.%(ext)s')
                 postprocessors = []
 
+            tracker = PostprocessTracker()
             ydl_opts = {
                 'format': format_selector,
                 'outtmpl': output_template,
-                'progress_hooks': [lambda d: self._progress_hook(d, progress_callback)],
+                'progress_hooks': [lambda d: self._progress_hook(d, job)],
+                'postprocessor_hooks': [lambda d: self._postprocessor_hook(d, job), tracker],
                 'quiet': True,
                 'no_warnings': True,
                 'ignoreerrors': True,
-                'merge_output_format': 'mp4' if q_val != "audio" else None,  # Don't merge for audio-only
+                'merge_output_format': self._merge_output_format() if q_val != "audio" else None,  # Don't merge for audio-only
                 'continuedl': True,  # Continue partially downloaded files
                 'noprogress': False,
                 'logger': yt_dlp_logger,  # Use our filtered logger
@@ -309,122 +1637,195 @@ class VideoDownloader:
             if self.ffmpeg_path:
                 ydl_opts['ffmpeg_location'] = self.ffmpeg_path
             
+            if self._in_archive(DownloadArchive.key_for_url(url)):
+                print(f"Skipping {url}, it is already in the download archive")
+                job.report(ProgressEvent.SKIPPED, 100, "Skipped: already in the download archive")
+                return True
+            
+            job.report(ProgressEvent.EXTRACTING, 0, "Extracting video information...")
             with yt_dlp.YoutubeDL(ydl_opts) as ydl:
-                info = ydl.extract_info(url, download=False)
+                # The download needs format URLs that are still valid, which cached info can't promise
+                info = self._extract_info(ydl, url, cached=False)
                 if info:
                     print(f"Title: {info.get('title')}")
                     print(f"Duration: {info.get('duration')} seconds")
                     
-                    if progress_callback:
-                        progress_callback(0, f"Starting download: {info.get('title')}")
+                    job.report(ProgressEvent.DOWNLOADING, 0, f"Starting download: {info.get('title')}")
                     
                     # Store current download info for pause/resume
-                    self.resume_file = os.path.join(output_path, f"{info.get('title')}.%(ext)s")
+                    job.resume_file = os.path.join(output_path, f"{info.get('title')}.%(ext)s")
                     
                     # Check if we should cancel before starting download
-                    if self.should_cancel:
-                        if progress_callback:
-                            progress_callback(0, "Download cancelled")
+                    if job.should_cancel:
+                        job.report(ProgressEvent.CANCELLED, 0, "Download cancelled")
                         return False
                     
-                    # Download the video, but check for pause/cancel signals
-                    ydl.download([url])
+                    # Download from the info we already have instead of extracting the URL again
+                    ydl.process_ie_result(info, download=True)
+                    self._archive_finished(tracker, job)
                     
                     # If download was paused, return False to prevent reset
-                    if self.is_paused:
+                    if job.is_paused:
                         return False
                         
                     # If download completed successfully
-                    if progress_callback and not self.should_cancel:
-                        progress_callback(100, "Download complete")
+                    if not job.should_cancel:
+                        job.report(ProgressEvent.COMPLETED, 100, "Download complete")
                         print(f"Downloaded successfully to {output_path}")
                         return True
-                    elif self.should_cancel:
-                        if progress_callback:
-                            progress_callback(0, "Download cancelled")
+                    elif job.should_cancel:
+                        job.report(ProgressEvent.CANCELLED, 0, "Download cancelled")
                         return False
             
             return False
             
         except Exception as e:
+            # Pausing and cancelling stop yt-dlp by raising from the progress hook
+            if job.is_paused or job.should_cancel:
+                return False
             print(f"Error downloading YouTube video: {str(e)}")
-            if progress_callback:
-                progress_callback(0, f"Error: {str(e)}")
+            job.report(ProgressEvent.ERROR, 0, f"Error: {str(e)}")
             return False
             
-    def _progress_hook(self, d, progress_callback):
-        if not progress_callback:
+    def set_rate_limit(self, rate, burst=None):
+        """Limit the bandwidth of all downloads in bytes per second. None or 0 removes the limit."""
+        self.bandwidth.set_rate(rate, burst)
+
+    def _in_archive(self, key):
+        return self.use_download_archive and self.download_archive is not None and key in self.download_archive
+
+    def _archive_finished(self, tracker, job):
+        """Add the videos a PostprocessTracker saw finish to the archive, unless the job was paused or cancelled."""
+        if not self.use_download_archive or self.download_archive is None or job.should_cancel or job.is_paused:
             return
+        for info in tracker.finished:
+            self.download_archive.add(DownloadArchive.make_key(info))
+
+    @staticmethod
+    def _hook_total(d):
+        """Total size of a yt-dlp progress hook's download, estimated if need be, or 0 if unknown."""
+        return d.get('total_bytes') or d.get('total_bytes_estimate') or 0
+
+    @classmethod
+    def _hook_percent(cls, d):
+        """Percentage of a yt-dlp progress hook's download, or None if its size is unknown."""
+        total = cls._hook_total(d)
+        if not total:
+            return None
+        return min(100, int((d.get('downloaded_bytes') or 0) * 100 / total))
+
+    def _progress_hook(self, d, job, report=None):
+        report = report or job.report
+            
+        # A held pause blocks yt-dlp right here, keeping its connection open until resumed
+        if job.is_held:
+            job.hold(report, self._hook_percent(d))
             
         # Check for pause or cancel
-        if self.should_cancel:
+        if job.should_cancel:
             d['status'] = 'cancelled'
-            progress_callback(0, "Download cancelled")
-            return
+            report(ProgressEvent.CANCELLED, 0, "Download cancelled")
+            # Make yt-dlp stop the download by raising a controlled exception
+            raise Exception("Download cancelled by user")
             
-        if self.is_paused:
+        if job.is_paused:
             d['status'] = 'paused'
-            progress_callback(d.get('downloaded_bytes', 0) / d.get('total_bytes', 1) * 100, "Download paused")
+            percent = self._hook_percent(d)
+            report(ProgressEvent.PAUSED, job.progress if percent is None else percent, "Download paused")
             # Make yt-dlp stop the download by raising a controlled exception
             raise Exception("Download paused by user")
             
-        if d['status'] == 'downloading':
-            p = d.get('_percent_str', '0%').strip()
-            self.downloaded_bytes = d.get('downloaded_bytes', 0)
+        status = d['status']
+        if status == 'downloading':
+            # This runs for every chunk, so only record the byte count unless an update is due
+            downloaded = d.get('downloaded_bytes') or 0
+            job.downloaded_bytes = downloaded
+            
+            # Blocking here throttles yt-dlp, so it draws from the same bandwidth limit as web downloads
+            filename = d.get('filename')
+            delta = downloaded - job._hook_bytes.get(filename, 0)
+            job._hook_bytes[filename] = downloaded
+            if delta > 0:
+                self.bandwidth.consume(delta, job.id, lambda: job.should_cancel or job.is_paused or job.is_held)
+            if not job.progress_due(self.progress_interval):
+                return
+            
+            total = self._hook_total(d)
+            progress = self._hook_percent(d) or 0
             
             # Get video information for better status display
-            filename = d.get('filename', '').split(os.sep)[-1]
-            video_title = d.get('info_dict', {}).get('title', filename)
+            info = d.get('info_dict') or {}
+            video_title = info.get('title') or os.path.basename(d.get('filename', ''))
             
             # For playlists, show which video out of total
-            playlist_info = d.get('info_dict', {}).get('playlist_info', {})
-            playlist_count = d.get('info_dict', {}).get('playlist_count', 0)
-            playlist_index = d.get('info_dict', {}).get('playlist_index', 0)
-            playlist_title = d.get('info_dict', {}).get('playlist_title', '')
-            
-            # Get ETA information if available
-            eta = d.get('eta', None)
-            eta_str = ""
-            if eta is not None:
-                # Format ETA
-                if eta < 60:
-                    eta_str = f" - ETA: {eta}s"
-                else:
-                    minutes, seconds = divmod(eta, 60)
-                    hours, minutes = divmod(minutes, 60)
-                    if hours > 0:
-                        eta_str = f" - ETA: {hours}h {minutes}m {seconds}s"
-                    else:
-                        eta_str = f" - ETA: {minutes}m {seconds}s"
+            playlist_count = info.get('playlist_count') or 0
+            playlist_index = info.get('playlist_index') or 0
+            
+            eta = d.get('eta')
+            eta_str = self._eta_suffix(eta)
                         
             # Build the status message
-            status_msg = f"Downloading: {p}{eta_str}"
+            status_msg = f"Downloading: {progress}%{eta_str}"
             if video_title:
                 if playlist_count > 0 and playlist_index > 0:
-                    status_msg = f"Downloading video {playlist_index}/{playlist_count}: {video_title} - {p}{eta_str}"
+                    status_msg = f"Downloading video {playlist_index}/{playlist_count}: {video_title} - {progress}%{eta_str}"
                 else:
-                    status_msg = f"Downloading: {video_title} - {p}{eta_str}"
+                    status_msg = f"Downloading: {video_title} - {progress}%{eta_str}"
                     
-            try:
-                progress = int(float(p.replace('%', '')))
-                progress_callback(progress, status_msg)
-            except:
-                progress_callback(0, status_msg)
-        elif d['status'] == 'finished':
+            report(ProgressEvent.DOWNLOADING, progress, status_msg,
+                   downloaded_bytes=downloaded, total_bytes=total or None, speed=d.get('speed'), eta=eta,
+                   playlist_index=playlist_index or None, playlist_count=playlist_count or None)
+        elif status == 'finished':
             # Get video information
-            filename = d.get('filename', '').split(os.sep)[-1]
-            video_title = d.get('info_dict', {}).get('title', filename)
+            info = d.get('info_dict') or {}
+            video_title = info.get('title') or os.path.basename(d.get('filename', ''))
             
             # For playlists, show which video out of total
-            playlist_count = d.get('info_dict', {}).get('playlist_count', 0)
-            playlist_index = d.get('info_dict', {}).get('playlist_index', 0)
+            playlist_count = info.get('playlist_count') or 0
+            playlist_index = info.get('playlist_index') or 0
             
             if playlist_count > 0 and playlist_index > 0:
                 status_msg = f"Processing video {playlist_index}/{playlist_count}: {video_title}"
             else:
                 status_msg = f"Processing file: {video_title}"
                 
-            progress_callback(100, status_msg)
+            downloaded = d.get('downloaded_bytes') or d.get('total_bytes')
+            report(ProgressEvent.DOWNLOADING, 100, status_msg,
+                   downloaded_bytes=downloaded, total_bytes=d.get('total_bytes') or downloaded,
+                   playlist_index=playlist_index or None, playlist_count=playlist_count or None)
+
+    def _postprocessor_hook(self, d, job, report=None):
+        """Report merge and post-processing steps run by yt-dlp."""
+        if d['status'] != 'started':
+            return
+        report = report or job.report
+        info = d.get('info_dict') or {}
+        video_title = info.get('title', '')
+        playlist_index = info.get('playlist_index') or None
+        playlist_count = info.get('playlist_count') or None
+        if d.get('postprocessor') == 'Merger':
+            report(ProgressEvent.MERGING, 100, f"Merging formats: {video_title}",
+                   playlist_index=playlist_index, playlist_count=playlist_count)
+        elif d.get('postprocessor') not in ('MoveFiles',):
+            report(ProgressEvent.POSTPROCESSING, 100, f"Post-processing ({d.get('postprocessor')}): {video_title}",
+                   playlist_index=playlist_index, playlist_count=playlist_count)
+
+    @classmethod
+    def _eta_suffix(cls, eta):
+        """Status message suffix like ' - ETA: 3m 5s', or '' if the ETA is unknown."""
+        return f" - ETA: {cls._format_eta(eta)}" if eta is not None else ""
+
+    @staticmethod
+    def _format_eta(eta):
+        """Format an ETA in seconds as e.g. '42s', '3m 5s' or '1h 2m 3s'."""
+        eta = int(eta)
+        if eta < 60:
+            return f"{eta}s"
+        minutes, seconds = divmod(eta, 60)
+        hours, minutes = divmod(minutes, 60)
+        if hours > 0:
+            return f"{hours}h {minutes}m {seconds}s"
+        return f"{minutes}m {seconds}s"
 
     def get_video_info(self, url, fetch_progress_callback=None):
         """Get information about a YouTube video."""
@@ -443,16 +1844,15 @@ class VideoDownloader:
             print(f"Fetching video info for {url}")
             
             # Update callback if provided
+            fetch_progress_callback = self._coalesce_fetch_progress(fetch_progress_callback)
             if fetch_progress_callback:
                 fetch_progress_callback(0, 1, "Fetching video information...", True)
-                # Small delay to let UI update
-                time.sleep(0.2)
             
             with yt_dlp.YoutubeDL(ydl_opts) as ydl:
                 if fetch_progress_callback:
                     fetch_progress_callback(0, 1, "Retrieving video details from YouTube...", True)
                 
-                info = ydl.extract_info(url, download=False)
+                info = self._extract_info(ydl, url)
                 
                 # Update callback for completion
                 if fetch_progress_callback:
@@ -472,6 +1872,11 @@ class VideoDownloader:
                 else:
                     duration_formatted = f"{minutes}:{seconds:02d}"
                 
+                # Size of the selected format, or of its video and audio parts together
+                filesize = info.get('filesize') or info.get('filesize_approx')
+                if not filesize and info.get('requested_formats'):
+                    filesize = sum(f.get('filesize') or f.get('filesize_approx') or 0 for f in info['requested_formats']) or None
+                
                 return {
                     'title': info.get('title', 'Unknown Video'),
                     'channel': info.get('uploader', 'Unknown Channel'),
@@ -482,6 +1887,18 @@ class VideoDownloader:
                     'upload_date': info.get('upload_date'),
                     'id': info.get('id', ''),
                     'is_live': info.get('is_live', False),
+                    'filesize': filesize,
+                    'formats': [{
+                        'format_id': f.get('format_id'),
+                        'ext': f.get('ext'),
+                        'height': f.get('height'),
+                        'fps': f.get('fps'),
+                        'vcodec': f.get('vcodec'),
+                        'acodec': f.get('acodec'),
+                        'filesize': f.get('filesize') or f.get('filesize_approx'),
+                    } for f in info.get('formats') or []],
+                    'thumbnails': [{'url': t.get('url'), 'width': t.get('width'), 'height': t.get('height')}
+                                   for t in info.get('thumbnails') or []],
                 }
             
             return None
@@ -491,10 +1908,10 @@ class VideoDownloader:
                 fetch_progress_callback(0, 0, f"Error: {str(e)}", True)
             return None
 
-    def pause_download(self):
-        """Pause the current download."""
-        if self.is_downloading and not self.is_paused:
-            self.is_paused = True
+    def pause_download(self, mode=None):
+        """Pause the current download, in pause_mode unless another mode is given."""
+        job = self.current_job
+        if job and job.pause(mode or self.pause_mode):
             # The actual pausing will be handled in the download loop
             print("Download paused")
             return True
@@ -502,57 +1919,51 @@ class VideoDownloader:
     
     def resume_download(self, progress_callback=None):
         """Resume a paused download."""
-        if self.is_paused:
-            self.is_paused = False
-            # If we have all the necessary info to resume
-            if (self.current_url and self.current_output_path and 
-                self.current_quality is not None):
-                print("Resuming download...")
-                # Resume download in a separate thread
-                resume_thread = threading.Thread(
-                    target=self.download_video,
-                    args=(
-                        self.current_url,
-                        self.current_quality,
-                        self.current_output_path,
-                        progress_callback,
-                        self.current_playlist_option,
-                        self.current_playlist_items
-                    ),
-                    kwargs={"resume": True}
-                )
-                resume_thread.daemon = True
-                resume_thread.start()
-                return True
-            else:
-                print("Cannot resume download: missing information")
+        job = self.current_job
+        if job and job.resume():
+            # The transfer was held open, so it just carries on
+            print("Resuming download...")
+            return True
+        if job and job.is_paused:
+            job.is_paused = False
+            print("Resuming download...")
+            # Resume download in a separate thread
+            resume_thread = threading.Thread(
+                target=self.download_video,
+                args=(
+                    job.url,
+                    job.quality,
+                    job.output_path,
+                    progress_callback,
+                    job.playlist_option,
+                    job.playlist_items
+                ),
+                kwargs={"resume": True}
+            )
+            resume_thread.daemon = True
+            resume_thread.start()
+            return True
         return False
         
     def cancel_download(self):
         """Cancel the current download."""
-        if self.is_downloading:
-            self.should_cancel = True
-            self.is_paused = False
-            # The actual cancellation will be handled in the download loop
+        job = self.current_job
+        if job and job.cancel():
+            # The actual cancellation will be handled in the download loop,
+            # a paused download has no loop running so it is finished right away
+            if job.is_done:
+                self.reset_download_state()
             print("Download cancelled")
             return True
         return False
     
     def reset_download_state(self):
         """Reset the download state variables."""
-        self.is_downloading = False
-        self.is_paused = False
-        self.should_cancel = False
-        self.current_url = None
-        self.current_output_path = None
-        self.current_quality = None
-        self.current_playlist_option = None
-        self.current_playlist_items = None
-        self.downloaded_bytes = 0
-        self.resume_file = None
+        self.current_job = None
 
-    def download_youtube_playlist(self, url, quality="best", output_path=None, progress_callback=None):
+    def download_youtube_playlist(self, url, quality="best", output_path=None, progress_callback=None, job=None):
         """Download all videos in a YouTube playlist, attempting to merge audio and video."""
+        job = job or self._create_job(url, quality, output_path, "full", progress_callback=progress_callback)
         try:
             q_val = self.quality_options.get(quality, "best")
 
@@ -560,11 +1971,7 @@ class VideoDownloader:
             if q_val == "audio":
                 format_selector = 'bestaudio/best'  # Select best audio quality
                 output_template = os.path.join(output_path, '%(playlist_title)s/%(playlist_index)s - %(title)s.%(ext)s')
-                postprocessors = [{
-                    'key': 'FFmpegExtractAudio',
-                    'preferredcodec': 'mp3',
-                    'preferredquality': '192',
-                }]
+                postprocessors = self._audio_postprocessors()
             else:
                 # More robust format selection that better handles SABR streaming issues
                 if q_val == "best":
@@ -578,67 +1985,68 @@ class VideoDownloader:
 
             ydl_opts = {
                 'format': format_selector,
-                'outtmpl': output_template,
-                'progress_hooks': [lambda d: self._progress_hook(d, progress_callback)],
-                'quiet': True,
-                'no_warnings': True,
-                'ignoreerrors': True,
-                'merge_output_format': 'mp4' if q_val != "audio" else None,  # Don't merge for audio-only
-                'continuedl': True,  # Continue partially downloaded files
-                'logger': yt_dlp_logger,  # Use our filtered logger
-                'overwrites': False,  # Don't overwrite files
-                'no_color': True,  # Disable color codes in output
-                'postprocessors': postprocessors,  # Add postprocessors for audio conversion
-            }
-            if self.ffmpeg_path:
-                ydl_opts['ffmpeg_location'] = self.ffmpeg_path
-
-            with yt_dlp.YoutubeDL(ydl_opts) as ydl:
-                info = ydl.extract_info(url, download=False)
-                if info:
-                    playlist_title = info.get('title')
-                    entries = info.get('entries', [])
-                    total_videos = len(entries)
-                    print(f"Playlist: {playlist_title}")
-                    print(f"Total Videos: {total_videos}")
-                    
-                    if progress_callback:
-                        progress_callback(0, f"Starting playlist download: {playlist_title} ({total_videos} videos)")
-                    
-                    # Check for cancel before starting
-                    if self.should_cancel:
-                        if progress_callback:
-                            progress_callback(0, "Download cancelled")
-                        return False
-                    
-                    # Download the playlist
-                    ydl.download([url])
-                    
-                    # If download was paused, return False to prevent reset
-                    if self.is_paused:
-                        return False
-                    
-                    # If download completed successfully
-                    if progress_callback and not self.should_cancel:
-                        progress_callback(100, "Playlist download complete")
-                        print(f"Downloaded playlist successfully to {output_path}")
-                        return True
-                    elif self.should_cancel:
-                        if progress_callback:
-                            progress_callback(0, "Download cancelled")
-                        return False
-            
+                'outtmpl': output_template,
+                'progress_hooks': [lambda d: self._progress_hook(d, job)],
+                'postprocessor_hooks': [lambda d: self._postprocessor_hook(d, job)],
+                'quiet': True,
+                'no_warnings': True,
+                'ignoreerrors': True,
+                'merge_output_format': self._merge_output_format() if q_val != "audio" else None,  # Don't merge for audio-only
+                'continuedl': True,  # Continue partially downloaded files
+                'logger': yt_dlp_logger,  # Use our filtered logger
+                'overwrites': False,  # Don't overwrite files
+                'no_color': True,  # Disable color codes in output
+                'postprocessors': postprocessors,  # Add postprocessors for audio conversion
+            }
+            if self.ffmpeg_path:
+                ydl_opts['ffmpeg_location'] = self.ffmpeg_path
+
+            job.report(ProgressEvent.EXTRACTING, 0, "Extracting playlist information...")
+            info = self._resolve_playlist_entries(url, ydl_opts)
+            if info:
+                playlist_title = info.get('title')
+                entries = info.get('entries', [])
+                total_videos = len(entries)
+                print(f"Playlist: {playlist_title}")
+                print(f"Total Videos: {total_videos}")
+                
+                job.report(ProgressEvent.DOWNLOADING, 0, f"Starting playlist download: {playlist_title} ({total_videos} videos)")
+                
+                # Check for cancel before starting
+                if job.should_cancel:
+                    job.report(ProgressEvent.CANCELLED, 0, "Download cancelled")
+                    return False
+                
+                # Download the playlist
+                self._download_playlist_entries(info, ydl_opts, job)
+                
+                # If download was paused, return False to prevent reset
+                if job.is_paused:
+                    return False
+                
+                # If download completed successfully
+                if not job.should_cancel:
+                    job.report(ProgressEvent.COMPLETED, 100, "Playlist download complete")
+                    print(f"Downloaded playlist successfully to {output_path}")
+                    return True
+                elif job.should_cancel:
+                    job.report(ProgressEvent.CANCELLED, 0, "Download cancelled")
+                    return False
+        
             return False
             
         except Exception as e:
+            # Pausing and cancelling stop yt-dlp by raising from the progress hook
+            if job.is_paused or job.should_cancel:
+                return False
             print(f"Error downloading YouTube playlist: {str(e)}")
-            if progress_callback:
-                progress_callback(0, f"Error: {str(e)}")
+            job.report(ProgressEvent.ERROR, 0, f"Error: {str(e)}")
             return False
 
     def download_youtube_playlist_items(self, url, quality="best", output_path=None, 
-                                      progress_callback=None, video_indices=None):
+                                      progress_callback=None, video_indices=None, job=None):
         """Download specific videos from a YouTube playlist by their indices."""
+        job = job or self._create_job(url, quality, output_path, "specific", video_indices, progress_callback)
         try:
             if not video_indices:
                 return False
@@ -649,11 +2057,7 @@ class VideoDownloader:
             if q_val == "audio":
                 format_selector = 'bestaudio/best'  # Select best audio quality
                 output_template = os.path.join(output_path, '%(playlist_title)s/%(playlist_index)s - %(title)s.%(ext)s')
-                postprocessors = [{
-                    'key': 'FFmpegExtractAudio',
-                    'preferredcodec': 'mp3',
-                    'preferredquality': '192',
-                }]
+                postprocessors = self._audio_postprocessors()
             else:
                 # More robust format selection that better handles SABR streaming issues
                 if q_val == "best":
@@ -671,11 +2075,12 @@ class VideoDownloader:
             ydl_opts = {
                 'format': format_selector,
                 'outtmpl': output_template,
-                'progress_hooks': [lambda d: self._progress_hook(d, progress_callback)],
+                'progress_hooks': [lambda d: self._progress_hook(d, job)],
+                'postprocessor_hooks': [lambda d: self._postprocessor_hook(d, job)],
                 'quiet': True,
                 'no_warnings': True,
                 'ignoreerrors': True,
-                'merge_output_format': 'mp4' if q_val != "audio" else None,  # Don't merge for audio-only
+                'merge_output_format': self._merge_output_format() if q_val != "audio" else None,  # Don't merge for audio-only
                 'playlist_items': playlist_items,
                 'continuedl': True,  # Continue partially downloaded files
                 'logger': yt_dlp_logger,  # Use our filtered logger
@@ -686,48 +2091,48 @@ class VideoDownloader:
             if self.ffmpeg_path:
                 ydl_opts['ffmpeg_location'] = self.ffmpeg_path
             
-            with yt_dlp.YoutubeDL(ydl_opts) as ydl:
-                info = ydl.extract_info(url, download=False)
-                if info:
-                    playlist_title = info.get('title')
-                    selected_count = len(video_indices)
-                    if progress_callback:
-                        progress_callback(0, f"Starting download of {selected_count} selected videos from: {playlist_title}")
-                    
-                    # Check for cancel before starting
-                    if self.should_cancel:
-                        if progress_callback:
-                            progress_callback(0, "Download cancelled")
-                        return False
-                    
-                    # Download the videos
-                    ydl.download([url])
-                    
-                    # If download was paused, return False to prevent reset
-                    if self.is_paused:
-                        return False
-                    
-                    # If download completed successfully
-                    if progress_callback and not self.should_cancel:
-                        progress_callback(100, "Download complete")
-                        print(f"Downloaded selected videos successfully to {output_path}")
-                        return True
-                    elif self.should_cancel:
-                        if progress_callback:
-                            progress_callback(0, "Download cancelled")
-                        return False
-            
+            job.report(ProgressEvent.EXTRACTING, 0, "Extracting playlist information...")
+            info = self._resolve_playlist_entries(url, ydl_opts)
+            if info:
+                playlist_title = info.get('title')
+                selected_count = len(video_indices)
+                job.report(ProgressEvent.DOWNLOADING, 0, f"Starting download of {selected_count} selected videos from: {playlist_title}")
+                
+                # Check for cancel before starting
+                if job.should_cancel:
+                    job.report(ProgressEvent.CANCELLED, 0, "Download cancelled")
+                    return False
+                
+                # Download the videos
+                self._download_playlist_entries(info, ydl_opts, job)
+                
+                # If download was paused, return False to prevent reset
+                if job.is_paused:
+                    return False
+                
+                # If download completed successfully
+                if not job.should_cancel:
+                    job.report(ProgressEvent.COMPLETED, 100, "Download complete")
+                    print(f"Downloaded selected videos successfully to {output_path}")
+                    return True
+                elif job.should_cancel:
+                    job.report(ProgressEvent.CANCELLED, 0, "Download cancelled")
+                    return False
+        
             return False
             
         except Exception as e:
+            # Pausing and cancelling stop yt-dlp by raising from the progress hook
+            if job.is_paused or job.should_cancel:
+                return False
             print(f"Error downloading YouTube playlist items: {str(e)}")
-            if progress_callback:
-                progress_callback(0, f"Error: {str(e)}")
+            job.report(ProgressEvent.ERROR, 0, f"Error: {str(e)}")
             return False
     
     def download_youtube_playlist_range(self, url, quality="best", output_path=None, 
-                                      progress_callback=None, range_str=None):
+                                      progress_callback=None, range_str=None, job=None):
         """Download a range of videos from a YouTube playlist."""
+        job = job or self._create_job(url, quality, output_path, "range", range_str, progress_callback)
         try:
             if not range_str:
                 return False
@@ -747,11 +2152,7 @@ class VideoDownloader:
             if q_val == "audio":
                 format_selector = 'bestaudio/best'  # Select best audio quality
                 output_template = os.path.join(output_path, '%(playlist_title)s/%(playlist_index)s - %(title)s.%(ext)s')
-                postprocessors = [{
-                    'key': 'FFmpegExtractAudio',
-                    'preferredcodec': 'mp3',
-                    'preferredquality': '192',
-                }]
+                postprocessors = self._audio_postprocessors()
             else:
                 # More robust format selection that better handles SABR streaming issues
                 if q_val == "best":
@@ -769,11 +2170,12 @@ class VideoDownloader:
             ydl_opts = {
                 'format': format_selector,
                 'outtmpl': output_template,
-                'progress_hooks': [lambda d: self._progress_hook(d, progress_callback)],
+                'progress_hooks': [lambda d: self._progress_hook(d, job)],
+                'postprocessor_hooks': [lambda d: self._postprocessor_hook(d, job)],
                 'quiet': True,
                 'no_warnings': True,
                 'ignoreerrors': True,
-                'merge_output_format': 'mp4' if q_val != "audio" else None,  # Don't merge for audio-only
+                'merge_output_format': self._merge_output_format() if q_val != "audio" else None,  # Don't merge for audio-only
                 'playlist_items': playlist_items,
                 'continuedl': True,  # Continue partially downloaded files
                 'logger': yt_dlp_logger,  # Use our filtered logger
@@ -784,101 +2186,299 @@ class VideoDownloader:
             if self.ffmpeg_path:
                 ydl_opts['ffmpeg_location'] = self.ffmpeg_path
             
-            with yt_dlp.YoutubeDL(ydl_opts) as ydl:
-                info = ydl.extract_info(url, download=False)
-                if info:
-                    playlist_title = info.get('title')
-                    total_in_range = end - start + 1
-                    if progress_callback:
-                        progress_callback(0, f"Starting download of videos {start}-{end} ({total_in_range} videos) from: {playlist_title}")
-                    
-                    # Check for cancel before starting
-                    if self.should_cancel:
-                        if progress_callback:
-                            progress_callback(0, "Download cancelled")
-                        return False
-                    
-                    # Download the videos
-                    ydl.download([url])
-                    
-                    # If download was paused, return False to prevent reset
-                    if self.is_paused:
-                        return False
-                    
-                    # If download completed successfully
-                    if progress_callback and not self.should_cancel:
-                        progress_callback(100, "Download complete")
-                        print(f"Downloaded videos {start}-{end} successfully to {output_path}")
-                        return True
-                    elif self.should_cancel:
-                        if progress_callback:
-                            progress_callback(0, "Download cancelled")
-                        return False
-            
+            job.report(ProgressEvent.EXTRACTING, 0, "Extracting playlist information...")
+            info = self._resolve_playlist_entries(url, ydl_opts)
+            if info:
+                playlist_title = info.get('title')
+                total_in_range = end - start + 1
+                job.report(ProgressEvent.DOWNLOADING, 0, f"Starting download of videos {start}-{end} ({total_in_range} videos) from: {playlist_title}")
+                
+                # Check for cancel before starting
+                if job.should_cancel:
+                    job.report(ProgressEvent.CANCELLED, 0, "Download cancelled")
+                    return False
+                
+                # Download the videos
+                self._download_playlist_entries(info, ydl_opts, job)
+                
+                # If download was paused, return False to prevent reset
+                if job.is_paused:
+                    return False
+                
+                # If download completed successfully
+                if not job.should_cancel:
+                    job.report(ProgressEvent.COMPLETED, 100, "Download complete")
+                    print(f"Downloaded videos {start}-{end} successfully to {output_path}")
+                    return True
+                elif job.should_cancel:
+                    job.report(ProgressEvent.CANCELLED, 0, "Download cancelled")
+                    return False
+        
             return False
             
         except Exception as e:
+            # Pausing and cancelling stop yt-dlp by raising from the progress hook
+            if job.is_paused or job.should_cancel:
+                return False
             print(f"Error downloading YouTube playlist range: {str(e)}")
-            if progress_callback:
-                progress_callback(0, f"Error: {str(e)}")
+            job.report(ProgressEvent.ERROR, 0, f"Error: {str(e)}")
             return False
 
-    def download_web_video(self, url, output_path=None, progress_callback=None):
+    def _resolve_playlist_entries(self, url, ydl_opts):
+        """List the entries of a playlist without extracting each video, then apply playlist_items."""
+        # Same options as a flat get_playlist_info(), so a listing fetched for the UI is reused from the cache
+        list_opts = {
+            'quiet': True,
+            'no_warnings': True,
+            'ignoreerrors': True,
+            'extract_flat': 'in_playlist',  # Entries are fully extracted when they're downloaded
+            'noplaylist': False,
+            'logger': yt_dlp_logger,  # Use our filtered logger
+            'no_color': True,  # Disable color codes in output
+        }
+        
+        with yt_dlp.YoutubeDL(list_opts) as ydl:
+            info = self._extract_info(ydl, url)
+        if not info:
+            return info
+        
+        info = dict(info)
+        entries = list(info.get('entries') or [])
+        indices = list(range(1, len(entries) + 1))
+        if ydl_opts.get('playlist_items'):
+            indices = self._parse_playlist_items(ydl_opts['playlist_items'], len(entries))
+        info['playlist_count'] = info.get('playlist_count') or len(entries)
+        info['entries'] = [entries[i - 1] for i in indices]
+        info['requested_entries'] = indices
+        return info
+
+    @staticmethod
+    def _parse_playlist_items(spec, count):
+        """Turn a playlist_items spec like '1,3,5' or '2-7' into a sorted list of 1-based indices."""
+        indices = set()
+        for part in str(spec).split(','):
+            part = part.strip()
+            if not part:
+                continue
+            if '-' in part:
+                start, end = map(int, part.split('-', 1))
+                indices.update(range(max(start, 1), min(end, count) + 1))
+            elif 1 <= int(part) <= count:
+                indices.add(int(part))
+        return sorted(indices)
+
+    def _download_playlist_entries(self, info, ydl_opts, job):
+        """Download resolved playlist entries, up to playlist_workers at a time.
+        
+        Their post-processing runs on a separate pool, overlapping the downloads of later entries.
+        """
+        entry_opts = dict(ydl_opts)
+        entry_opts.pop('playlist_items', None)
+        
+        pending = [(index, entry) for index, entry in zip(info['requested_entries'], info['entries']) if entry]
+        
+        # Flat entries usually carry their id, so archived videos are skipped without extracting them
+        archived = {index for index, entry in pending if self._in_archive(DownloadArchive.make_key(entry))}
+        if archived:
+            print(f"Skipping {len(archived)} videos already in the download archive")
+            pending = [(index, entry) for index, entry in pending if index not in archived]
+        if not pending:
+            return 0
+        
+        # Playlist fields that yt-dlp would normally add itself, so output
+        # templates like '%(playlist_index)s - %(title)s' keep working
+        playlist_fields = {
+            'playlist': info.get('title'),
+            'playlist_title': info.get('title'),
+            'playlist_id': info.get('id'),
+            'playlist_count': info['playlist_count'],
+            'playlist_uploader': info.get('uploader'),
+            'playlist_uploader_id': info.get('uploader_id'),
+            'n_entries': len(pending),
+            '__last_playlist_index': max(info['requested_entries']),
+        }
+        
+        # Overall progress is the average of the per-entry percentages
+        entry_progress = {}
+        progress_lock = threading.Lock()
+        
+        def download_entry(autonumber, index, entry):
+            if job.is_held and not job.hold():
+                return False
+            if job.should_cancel or job.is_paused:
+                return False
+            
+            def report(phase, percent, message, **fields):
+                # Replace the entry's own percentage with the playlist total
+                with progress_lock:
+                    if phase not in ProgressEvent.FINAL_PHASES:
+                        entry_progress[index] = percent
+                    overall = int(sum(entry_progress.values()) / len(pending))
+                job.report(phase, overall, message, **fields)
+            
+            tracker = PostprocessTracker()
+            opts = dict(entry_opts,
+                        progress_hooks=[lambda d: self._progress_hook(d, job, report)],
+                        postprocessor_hooks=[lambda d: self._postprocessor_hook(d, job, report), tracker])
+            extra_info = dict(playlist_fields, playlist_index=index, playlist_autonumber=autonumber)
+            
+            with contextlib.ExitStack() as resources:
+                try:
+                    ydl = resources.enter_context(deferred_postprocess_ydl_class()(opts))
+                except Exception as e:
+                    print(f"Error downloading playlist entry {index}: {str(e)}")
+                    return False
+                try:
+                    # The flat entry only points at the video, so this is its one and only full extraction
+                    ydl.process_ie_result(dict(entry), download=True, extra_info=extra_info)
+                except Exception as e:
+                    if not (job.should_cancel or job.is_paused):
+                        print(f"Error downloading playlist entry {index}: {str(e)}")
+                if ydl.deferred:
+                    # Waiting for a free slot holds back this worker's next download while the pool
+                    # is backed up. Cancelled entries are left unfinished, like an interrupted download.
+                    while not pp_slots.acquire(timeout=0.1):
+                        if job.should_cancel:
+                            break
+                    else:
+                        # The pool closes the YoutubeDL once the entry is post-processed
+                        return pp_executor.submit(postprocess_entry, resources.pop_all(), ydl, tracker, index)
+                self._archive_finished(tracker, job)
+            if not tracker.finished:
+                return False
+            with progress_lock:
+                entry_progress[index] = 100
+            return True
+        
+        def postprocess_entry(resources, ydl, tracker, index):
+            try:
+                with resources:
+                    # Left unfinished like an interrupted download, but paused jobs finish what they have
+                    if job.should_cancel:
+                        return False
+                    ydl.run_deferred()
+                self._archive_finished(tracker, job)
+                # With ignoreerrors a failed step is only reported, and never finishes
+                if not tracker.finished:
+                    return False
+            except Exception as e:
+                if not job.should_cancel:
+                    print(f"Error post-processing playlist entry {index}: {str(e)}")
+                return False
+            finally:
+                pp_slots.release()
+            with progress_lock:
+                entry_progress[index] = 100
+            return True
+        
+        workers = max(1, min(self.playlist_workers, len(pending)))
+        pp_workers = max(1, self.postprocess_workers or os.cpu_count() or 1)
+        pp_slots = threading.BoundedSemaphore(max(1, self.postprocess_queue_size or 2 * pp_workers))
+        with ThreadPoolExecutor(max_workers=pp_workers) as pp_executor:
+            with ThreadPoolExecutor(max_workers=workers) as executor:
+                futures = [executor.submit(download_entry, autonumber, index, entry)
+                           for autonumber, (index, entry) in enumerate(pending, 1)]
+                outcomes = [future.result() for future in futures]
+            # Entries handed to the post-processing pool count once they're processed
+            downloaded = sum(1 for outcome in outcomes
+                             if (outcome.result() if isinstance(outcome, Future) else outcome))
+        
+        if downloaded < len(pending) and not (job.should_cancel or job.is_paused):
+            print(f"[WARN] {len(pending) - downloaded} of {len(pending)} playlist entries failed to download")
+        return downloaded
+
+    def download_web_video(self, url, output_path=None, progress_callback=None, connections=None, job=None):
         """Download a video from a non-YouTube web URL."""
-        try:
-            response = requests.get(url, stream=True)
-            response.raise_for_status()
+        job = job or self._create_job(url, output_path=output_path, progress_callback=progress_callback)
+        if connections is None:
+            connections = self.connections
             
-            # Extract filename from URL or Content-Disposition header
-            if "Content-Disposition" in response.headers:
-                content_disposition = response.headers["Content-Disposition"]
-                filename = re.findall("filename=(.+)", content_disposition)[0].strip('"')
+        try:
+            # Probe for byte-range support before opening the main stream
+            probe = self._probe_range_support(url)
+            if probe:
+                headers, total_size = probe
+                response = None
             else:
-                filename = os.path.basename(urllib.parse.urlparse(url).path)
-                
-            if not filename:
-                filename = "download.mp4"
+                response = self._http_get(url, stream=True)
+                response.raise_for_status()
+                headers = response.headers
+                total_size = int(headers.get('content-length', 0))
             
+            filename = self._web_filename(url, headers)
             file_path = os.path.join(output_path, filename)
+            job.resume_file = file_path
             
-            # Create progress bar
-            total_size = int(response.headers.get('content-length', 0))
-            if progress_callback:
-                progress_callback(0, f"Starting download: {filename}")
-            
-            # Check if file exists and we're resuming
-            mode = 'ab' if os.path.exists(file_path) and self.is_paused else 'wb'
-            downloaded = os.path.getsize(file_path) if mode == 'ab' else 0
+            job.report(ProgressEvent.DOWNLOADING, 0, f"Starting download: {filename}")
             
-            # If resuming, skip already downloaded chunks
-            if downloaded > 0 and mode == 'ab':
-                headers = {'Range': f'bytes={downloaded}-'}
-                response = requests.get(url, stream=True, headers=headers)
-            
-            with open(file_path, mode) as f:
-                for chunk in response.iter_content(chunk_size=1024*1024):
+            journal = ResumeJournal.load(file_path)
+            if probe:
+                # Ranged download, resumable from the journal if it still describes the same remote file
+                etag, last_modified = headers.get('ETag'), headers.get('Last-Modified')
+                if journal and os.path.exists(file_path) and journal.matches(url, total_size, etag, last_modified):
+                    print(f"Resuming {filename} from journal ({journal.completed_bytes()} of {total_size} bytes done)")
+                else:
+                    journal = ResumeJournal(file_path, url, total_size, etag, last_modified)
+                try:
+                    return self._download_segmented(url, file_path, journal, connections, job)
+                except RemoteFileChangedError:
+                    # If-Range failed, so the remote file changed since the journal was written
+                    print(f"[WARN] {filename} changed on the server, restarting the download")
+                    probe = self._probe_range_support(url)
+                    if not probe:
+                        raise
+                    headers, total_size = probe
+                    journal = ResumeJournal(file_path, url, total_size, headers.get('ETag'), headers.get('Last-Modified'))
+                    return self._download_segmented(url, file_path, journal, connections, job)
+            
+            # Without range support the file can only be fetched from the start
+            if journal:
+                journal.delete()
+            downloaded = 0
+            should_stop = lambda: job.should_cancel or job.is_paused or job.is_held
+            
+            # One buffer, refilled for every chunk, so memory use doesn't grow with the file size
+            sizer = self._new_chunk_sizer()
+            speed = TransferSpeed()
+            speed.start()
+            
+            # Closing the response hands the connection back to the pool
+            with response, open(file_path, 'wb') as f:
+                for chunk in self._iter_into(response, sizer):
+                    if job.is_held:
+                        progress = int((downloaded / total_size) * 100) if total_size > 0 else 0
+                        job.hold(percent=progress)
+                        sizer.skip_sample()
+                        speed.skip_sample()
+                    
                     # Check for cancel
-                    if self.should_cancel:
-                        if progress_callback:
-                            progress_callback(0, "Download cancelled")
+                    if job.should_cancel:
+                        job.report(ProgressEvent.CANCELLED, 0, "Download cancelled")
                         return False
                     
                     # Check for pause
-                    if self.is_paused:
-                        if progress_callback:
-                            progress = int((downloaded / total_size) * 100) if total_size > 0 else 0
-                            progress_callback(progress, "Download paused")
+                    if job.is_paused:
+                        progress = int((downloaded / total_size) * 100) if total_size > 0 else 0
+                        job.report(ProgressEvent.PAUSED, progress, "Download paused",
+                                   downloaded_bytes=downloaded, total_bytes=total_size or None)
                         return False
                     
                     if chunk:
                         f.write(chunk)
                         downloaded += len(chunk)
-                        if total_size > 0 and progress_callback:
+                        job.downloaded_bytes = downloaded
+                        self.bandwidth.consume(len(chunk), job.id, should_stop)
+                        if total_size > 0 and job.progress_due(self.progress_interval):
                             progress = int(downloaded * 100 / total_size)
-                            progress_callback(progress, f"Downloading: {progress}%")
-            
-            if progress_callback and not self.should_cancel:
-                progress_callback(100, "Download complete")
+                            rate, eta = speed.update(downloaded, total_size)
+                            job.report(ProgressEvent.DOWNLOADING, progress,
+                                       f"Downloading: {progress}%{self._eta_suffix(eta)}",
+                                       downloaded_bytes=downloaded, total_bytes=total_size, speed=rate, eta=eta,
+                                       chunk_size=sizer.size)
+            
+            if not job.should_cancel:
+                job.report(ProgressEvent.COMPLETED, 100, "Download complete",
+                           downloaded_bytes=downloaded, total_bytes=total_size or downloaded)
                 print(f"Downloaded successfully to {file_path}")
                 return True
             
@@ -886,9 +2486,566 @@ class VideoDownloader:
             
         except Exception as e:
             print(f"Error downloading web video: {str(e)}")
-            if progress_callback:
-                progress_callback(0, f"Error: {str(e)}")
+            job.report(ProgressEvent.ERROR, 0, f"Error: {str(e)}")
+            return False
+
+    def _new_chunk_sizer(self, limit=None):
+        """Create the read buffer for one web transfer, limit caps it for short ranges."""
+        maximum = min(self.max_chunk_size, limit) if limit else self.max_chunk_size
+        return ChunkSizer(min(self.chunk_size, maximum), min(self.min_chunk_size, maximum), maximum, self.chunk_interval)
+
+    @classmethod
+    def _iter_into(cls, response, sizer):
+        """Yield slices of the sizer's buffer, each refilled from the response body.
+        
+        A slice is only valid until the next one is requested. Bodies that need
+        decoding go through iter_content instead. Raises requests.ConnectionError if
+        the connection closes before the whole body arrived.
+        """
+        raw = response.raw
+        if response.headers.get('Content-Encoding', 'identity').lower() != 'identity' or not hasattr(raw, 'readinto'):
+            yield from response.iter_content(chunk_size=sizer.size)
+            return
+        
+        from urllib3.exceptions import HTTPError as Urllib3HTTPError
+        expected = cls._expected_body_size(response)
+        received = 0
+        sizer.start()
+        try:
+            while True:
+                view = sizer.view()
+                size = raw.readinto(view)
+                if not size:
+                    break
+                received += size
+                yield view[:size]
+                # Timed after the chunk was handled, so pauses for the bandwidth limit count too
+                sizer.update(size)
+        except (Urllib3HTTPError, http_client.HTTPException, OSError) as e:
+            raise requests.ConnectionError(e) from e
+        # A dropped connection looks like the end of the body, unless it was shorter than announced
+        if expected is not None and received < expected:
+            raise requests.ConnectionError(f"Connection closed after {received} of {expected} bytes")
+
+    @staticmethod
+    def _expected_body_size(response):
+        """Length of a response body from its Content-Length or Content-Range, or None if unknown (e.g. chunked)."""
+        headers = response.headers
+        if 'chunked' in headers.get('Transfer-Encoding', '').lower():
+            return None
+        length = headers.get('Content-Length', '').strip()
+        if length.isdigit():
+            return int(length)
+        match = re.match(r'bytes\s+(\d+)-(\d+)/', headers.get('Content-Range', ''))
+        if response.status_code == 206 and match:
+            return int(match.group(2)) - int(match.group(1)) + 1
+        return None
+
+    @staticmethod
+    def _write_all(f, data):
+        """Write all of data to an unbuffered file, which may take less than asked per call."""
+        view = memoryview(data)
+        while view:
+            view = view[f.write(view):]
+
+    @staticmethod
+    def _web_filename(url, headers):
+        """Pick the file name for a web download from the Content-Disposition header or the URL."""
+        if "Content-Disposition" in headers:
+            content_disposition = headers["Content-Disposition"]
+            filename = re.findall("filename=(.+)", content_disposition)[0].strip('"')
+        else:
+            filename = os.path.basename(urllib.parse.urlparse(url).path)
+        return filename or "download.mp4"
+
+    @staticmethod
+    def _content_range_total(headers):
+        """Return the full file size from a Content-Range header like "bytes 0-0/12345", if present."""
+        match = re.match(r'bytes\s+\d+-\d+/(\d+)', headers.get('Content-Range', ''))
+        return int(match.group(1)) if match else None
+
+    def _probe_range_support(self, url):
+        """Check whether the server honours byte ranges, returning (headers, total size) if it does."""
+        try:
+            with self._http_get(url, stream=True, headers={'Range': 'bytes=0-0'}) as response:
+                if response.status_code != 206:
+                    return None
+                total_size = self._content_range_total(response.headers)
+                if total_size is not None:
+                    return response.headers, total_size
+        except Exception as e:
+            print(f"[WARN] Range probe failed, using a single connection: {e}")
+        return None
+
+    def _download_segmented(self, url, file_path, journal, connections=4, job=None):
+        """Fetch the byte ranges still missing from a journal over several connections."""
+        job = job or DownloadJob(url)
+        total_size = journal.total_size
+        if_range = journal.if_range_value()
+        
+        # Split what's left into about one segment per connection, but never smaller than min_segment_size
+        missing = journal.missing_ranges()
+        missing_size = sum(end - start for start, end in missing)
+        segment_size = max(self.min_segment_size, -(-missing_size // max(1, connections)))
+        segments = [(offset, min(offset + segment_size, end))
+                    for start, end in missing
+                    for offset in range(start, end, segment_size)]
+        
+        # Preallocate the output file so every segment can write at its own offset
+        mode = 'r+b' if journal.ranges and os.path.exists(file_path) else 'wb'
+        with open(file_path, mode) as f:
+            f.truncate(total_size)
+        journal.save()
+        
+        segment_done = [0] * len(segments)
+        progress_lock = threading.Lock()
+        save_lock = threading.Lock()
+        last_save = [time.monotonic()]
+        speed = TransferSpeed()
+        speed.start(journal.completed_bytes())
+        
+        if len(segments) > 1:
+            print(f"Downloading {os.path.basename(file_path)} over {min(len(segments), connections)} connections")
+        
+        def report_progress(index, start, chunk_len, chunk_size):
+            snapshot = parts = None
+            with progress_lock:
+                journal.add_range(start, start + chunk_len)
+                segment_done[index] += chunk_len
+                downloaded = journal.completed_bytes()
+                job.downloaded_bytes = downloaded
+                # Persist the journal now and then so a crash loses at most a few seconds of work
+                if time.monotonic() - last_save[0] >= self.journal_interval:
+                    snapshot = [list(r) for r in journal.ranges]
+                    last_save[0] = time.monotonic()
+                # Segments still finishing a chunk mustn't report progress over a pause
+                if not job.is_held and job.progress_due(self.progress_interval):
+                    parts = " ".join(f"{int(done * 100 / (end - begin))}%"
+                                     for done, (begin, end) in zip(segment_done, segments))
+                    rate, eta = speed.update(downloaded, total_size)
+            if snapshot is not None:
+                # Written outside progress_lock, so the other segments don't wait for the fsync
+                with save_lock:
+                    journal.save(snapshot)
+            if parts is None:
+                return
+            progress = int(downloaded * 100 / total_size) if total_size else 100
+            job.report(ProgressEvent.DOWNLOADING, progress, f"Downloading: {progress}% [{parts}]{self._eta_suffix(eta)}",
+                       downloaded_bytes=downloaded, total_bytes=total_size, speed=rate, eta=eta, chunk_size=chunk_size)
+        
+        should_stop = lambda: job.should_cancel or job.is_paused or job.is_held
+        
+        def fetch_segment(index, start, end):
+            sizer = self._new_chunk_sizer(end - start)
+            position = start
+            failures = 0
+            while True:
+                attempt_start = position
+                headers = {'Range': f'bytes={position}-{end - 1}'}
+                if if_range:
+                    # The server sends the whole file instead of the range if it no longer matches
+                    headers['If-Range'] = if_range
+                held = False
+                try:
+                    with self._http_get(url, stream=True, headers=headers) as response:
+                        response.raise_for_status()
+                        if response.status_code != 206:
+                            raise RemoteFileChangedError(f"Server ignored range request for bytes {position}-{end - 1}")
+                        
+                        # Unbuffered, so everything recorded in the journal has reached the OS
+                        with open(file_path, 'r+b', buffering=0) as f:
+                            f.seek(position)
+                            for chunk in self._iter_into(response, sizer):
+                                if job.is_held:
+                                    held = True
+                                    job.hold(percent=int(journal.completed_bytes() * 100 / total_size) if total_size else 0)
+                                    sizer.skip_sample()
+                                    with progress_lock:
+                                        speed.skip_sample()
+                                # Stop early on pause or cancel, the other segments do the same
+                                if job.should_cancel or job.is_paused:
+                                    return False
+                                if chunk:
+                                    self._write_all(f, chunk)
+                                    report_progress(index, position, len(chunk), sizer.size)
+                                    position += len(chunk)
+                                    self.bandwidth.consume(len(chunk), job.id, should_stop)
+                    return True
+                except requests.RequestException as e:
+                    # The server may drop a connection that sat idle through a long hold,
+                    # so ask for the rest of the segment again
+                    if held:
+                        print(f"[WARN] Connection dropped while paused, reconnecting: {e}")
+                        continue
+                    # The journal has everything up to position, so carry on from there. Only
+                    # failures in a row count, a flaky server still gets through long segments.
+                    failures = 1 if position > attempt_start else failures + 1
+                    if failures > self.segment_retries or job.should_cancel or job.is_paused:
+                        print(f"[WARN] Giving up on bytes {position}-{end - 1}: {e}")
+                        return False
+                    print(f"[WARN] Connection failed at byte {position}, retrying ({failures}/{self.segment_retries}): {e}")
+                    time.sleep(0.5 * failures)
+        
+        try:
+            with ThreadPoolExecutor(max_workers=max(1, min(connections, len(segments)))) as executor:
+                futures = [executor.submit(fetch_segment, index, start, end)
+                           for index, (start, end) in enumerate(segments)]
+                results = [future.result() for future in futures]
+        finally:
+            with save_lock:
+                journal.save()
+        
+        if job.should_cancel:
+            # The user doesn't want this file anymore, so don't resume into it later
+            journal.delete()
+            job.report(ProgressEvent.CANCELLED, 0, "Download cancelled")
+            return False
+        
+        if job.is_paused:
+            downloaded = journal.completed_bytes()
+            job.report(ProgressEvent.PAUSED, int(downloaded * 100 / total_size) if total_size else 0, "Download paused",
+                       downloaded_bytes=downloaded, total_bytes=total_size)
+            return False
+        
+        missing = journal.missing_ranges()
+        if all(results) and not missing:
+            journal.delete()
+            job.report(ProgressEvent.COMPLETED, 100, "Download complete",
+                       downloaded_bytes=total_size, total_bytes=total_size)
+            print(f"Downloaded successfully to {file_path}")
+            return True
+        
+        # The journal is kept, so the download can be resumed later
+        downloaded = journal.completed_bytes()
+        gaps = ", ".join(f"{start}-{end - 1}" for start, end in missing[:3]) + (", ..." if len(missing) > 3 else "")
+        print(f"Error downloading web video: {os.path.basename(file_path)} is missing bytes {gaps}")
+        job.report(ProgressEvent.ERROR, int(downloaded * 100 / total_size) if total_size else 0,
+                   f"Error: download incomplete, missing bytes {gaps}",
+                   downloaded_bytes=downloaded, total_bytes=total_size)
+        return False
+
+
+    def download_web_videos(self, urls, output_path=None, concurrency=None):
+        """Download many web URLs with the asyncio engine and return their finished DownloadJobs."""
+        jobs = [self._create_job(url, output_path=output_path) for url in urls]
+        asyncio.run(self.run_web_jobs_async(jobs, concurrency))
+        return jobs
+
+    async def run_web_jobs_async(self, jobs, concurrency=None):
+        """Run web download jobs on the current event loop, at most concurrency at a time.
+        
+        A job paused in "teardown" mode can be continued by running it again.
+        """
+        semaphore = asyncio.Semaphore(concurrency or self.async_concurrency)
+        
+        async def run(job):
+            async with semaphore:
+                return await self.download_web_video_async(job.url, job.output_path, job=job)
+        
+        return await asyncio.gather(*(run(job) for job in jobs))
+
+    async def download_web_video_async(self, url, output_path=None, job=None):
+        """Download a web URL on the running event loop, with the same progress and resume handling as download_web_video."""
+        job = job or self._create_job(url, output_path=output_path)
+        output_path = output_path or job.output_path or self.download_path
+        os.makedirs(output_path, exist_ok=True)
+        job.output_path = output_path
+        job.is_paused = False
+        job.status = "downloading"
+        
+        result = False
+        try:
+            result = await self._fetch_web_async(job)
+        except Exception as e:
+            print(f"Error downloading web video: {str(e)}")
+            job.report(ProgressEvent.ERROR, 0, f"Error: {str(e)}")
+        finally:
+            job.finish(result)
+        return result
+
+    async def _fetch_web_async(self, job):
+        url = job.url
+        journal = None
+        
+        # "bytes=0-" asks for the whole file, and a 206 answer shows the server supports ranges
+        response = await async_http_get(url, {'Range': 'bytes=0-'}, self.http_timeout)
+        try:
+            response.raise_for_status()
+            filename = self._web_filename(url, response.headers)
+            file_path = os.path.join(job.output_path, filename)
+            job.resume_file = file_path
+            job.report(ProgressEvent.DOWNLOADING, 0, f"Starting download: {filename}")
+            
+            journal = ResumeJournal.load(file_path)
+            total_size = self._content_range_total(response.headers) if response.status_code == 206 else None
+            if total_size is not None:
+                etag, last_modified = response.headers.get('ETag'), response.headers.get('Last-Modified')
+                if journal and journal.ranges and os.path.exists(file_path) and \
+                        journal.matches(url, total_size, etag, last_modified):
+                    print(f"Resuming {filename} from journal ({journal.completed_bytes()} of {total_size} bytes done)")
+                    await response.aclose()
+                    return await self._resume_web_async(job, journal)
+                journal = ResumeJournal(file_path, url, total_size, etag, last_modified)
+            else:
+                # Without range support, or a total size to journal against ("bytes 0-N/*"),
+                # the file can only be fetched from the start
+                total_size = int(response.headers.get('Content-Length') or 0)
+                if journal:
+                    journal.delete()
+                    journal = None
+            
+            with open(file_path, 'wb') as f:
+                done = await self._stream_web_async(response, f, 0, job, journal, total_size)
+        finally:
+            await response.aclose()
+        return await self._finish_web_async(job, journal, file_path, total_size, done)
+
+    async def _resume_web_async(self, job, journal):
+        """Fetch the ranges a journal is missing, one after another over single connections."""
+        done = True
+        for start, end in journal.missing_ranges():
+            headers = {'Range': f'bytes={start}-{end - 1}'}
+            if journal.if_range_value():
+                headers['If-Range'] = journal.if_range_value()
+            response = await async_http_get(journal.url, headers, self.http_timeout)
+            try:
+                response.raise_for_status()
+                if response.status_code != 206:
+                    # If-Range failed, so the file changed and this response carries all of the new one
+                    print(f"[WARN] {os.path.basename(journal.file_path)} changed on the server, restarting the download")
+                    journal = ResumeJournal(journal.file_path, journal.url, int(response.headers.get('Content-Length') or 0),
+                                            response.headers.get('ETag'), response.headers.get('Last-Modified'))
+                    with open(journal.file_path, 'wb') as f:
+                        done = await self._stream_web_async(response, f, 0, job, journal, journal.total_size)
+                    break
+                with open(journal.file_path, 'r+b') as f:
+                    f.seek(start)
+                    done = await self._stream_web_async(response, f, start, job, journal, journal.total_size)
+                if not done:
+                    break
+            finally:
+                await response.aclose()
+        return await self._finish_web_async(job, journal, journal.file_path, journal.total_size, done)
+
+    async def _stream_web_async(self, response, f, position, job, journal, total_size):
+        """Write a response body to f from position on. Returns False if the job was paused or cancelled."""
+        should_stop = lambda: job.should_cancel or job.is_paused or job.is_held
+        last_save = time.monotonic()
+        speed = TransferSpeed()
+        speed.start(journal.completed_bytes() if journal else position)
+        try:
+            async for chunk in response.iter_content(1024*1024):
+                if job.is_held:
+                    await job.hold_async(percent=int(job.downloaded_bytes * 100 / total_size) if total_size else 0)
+                    speed.skip_sample()
+                if job.should_cancel or job.is_paused:
+                    return False
+                
+                f.write(chunk)
+                if journal:
+                    journal.add_range(position, position + len(chunk))
+                position += len(chunk)
+                job.downloaded_bytes = journal.completed_bytes() if journal else position
+                
+                if journal and time.monotonic() - last_save >= self.journal_interval:
+                    # Saving fsyncs the file, so keep it off the event loop
+                    f.flush()
+                    await asyncio.get_running_loop().run_in_executor(None, journal.save)
+                    last_save = time.monotonic()
+                if total_size and job.progress_due(self.progress_interval):
+                    progress = int(job.downloaded_bytes * 100 / total_size)
+                    rate, eta = speed.update(job.downloaded_bytes, total_size)
+                    job.report(ProgressEvent.DOWNLOADING, progress, f"Downloading: {progress}%{self._eta_suffix(eta)}",
+                               downloaded_bytes=job.downloaded_bytes, total_bytes=total_size, speed=rate, eta=eta)
+                await self.bandwidth.consume_async(len(chunk), job.id, should_stop)
+            return True
+        finally:
+            f.flush()
+            if journal:
+                await asyncio.get_running_loop().run_in_executor(None, journal.save)
+
+    async def _finish_web_async(self, job, journal, file_path, total_size, done):
+        if job.should_cancel:
+            # The user doesn't want this file anymore, so don't resume into it later
+            if journal:
+                journal.delete()
+            job.report(ProgressEvent.CANCELLED, 0, "Download cancelled")
             return False
+        
+        if job.is_paused:
+            progress = int(job.downloaded_bytes * 100 / total_size) if total_size else 0
+            job.report(ProgressEvent.PAUSED, progress, "Download paused",
+                       downloaded_bytes=job.downloaded_bytes, total_bytes=total_size or None)
+            return False
+        
+        if done and not (journal and journal.missing_ranges()):
+            if journal:
+                journal.delete()
+            job.report(ProgressEvent.COMPLETED, 100, "Download complete",
+                       downloaded_bytes=job.downloaded_bytes, total_bytes=total_size or job.downloaded_bytes)
+            print(f"Downloaded successfully to {file_path}")
+            return True
+        
+        return False
+
+
+class DownloadQueue:
+    """Run several downloads at once on a bounded worker pool."""
+    def __init__(self, downloader=None, max_workers=3):
+        self.downloader = downloader or VideoDownloader()
+        self.max_workers = max_workers
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="download")
+        self._jobs = {}
+        self._lock = threading.Lock()
+
+    def submit(self, url, quality="highest", output_path=None, playlist_option=None,
+               playlist_items=None, progress_callback=None):
+        """Queue a download and return its DownloadJob."""
+        job = self.downloader._create_job(url, quality, output_path, playlist_option, playlist_items, progress_callback)
+        with self._lock:
+            self._jobs[job.id] = job
+        self._executor.submit(self._run, job)
+        return job
+
+    def _run(self, job):
+        # The job may have been cancelled while it was waiting for a worker
+        if job.should_cancel:
+            job.finish(False)
+            return
+        self.downloader.download_video(job.url, job.quality, job.output_path, job.progress_callback,
+                                       job.playlist_option, job.playlist_items, job=job)
+
+    def list_jobs(self):
+        """Return all jobs in submission order."""
+        with self._lock:
+            return list(self._jobs.values())
+
+    def get_job(self, job_id):
+        with self._lock:
+            return self._jobs.get(job_id)
+
+    def pause(self, job_id, mode=None):
+        """Pause a running job, in the downloader's pause_mode unless another mode is given."""
+        job = self.get_job(job_id)
+        return bool(job) and job.pause(mode or self.downloader.pause_mode)
+
+    def resume(self, job_id):
+        """Wake a held job, or put a torn-down one back on the queue."""
+        job = self.get_job(job_id)
+        if job and job.resume():
+            return True
+        if job and job.status == "paused":
+            job.is_paused = False
+            job.status = "queued"
+            self._executor.submit(self._run, job)
+            return True
+        return False
+
+    def cancel(self, job_id):
+        """Cancel a queued, running or paused job."""
+        job = self.get_job(job_id)
+        return bool(job) and job.cancel()
+
+    def wait(self, job_id, timeout=None):
+        """Wait for one job to finish. Paused jobs only finish once resumed or cancelled."""
+        job = self.get_job(job_id)
+        return bool(job) and job.wait(timeout)
+
+    def wait_all(self, timeout=None):
+        """Wait for every submitted job to finish."""
+        deadline = time.time() + timeout if timeout is not None else None
+        for job in self.list_jobs():
+            remaining = max(0, deadline - time.time()) if deadline is not None else None
+            if not job.wait(remaining):
+                return False
+        return True
+
+    def shutdown(self, cancel=False):
+        """Stop the worker pool, optionally cancelling everything that is still pending."""
+        if cancel:
+            for job in self.list_jobs():
+                job.cancel()
+        self._executor.shutdown(wait=True)
+
+
+class PlaylistSelectionModel:
+    """Checked state and filtered view of the entries in the playlist selection dialog.
+    
+    Rows are addressed by their 0-based position in the playlist. Bulk changes are a single
+    pass over this model and never touch widgets, the dialog only redraws the rows on screen.
+    """
+    _INVERT = bytes.maketrans(b"\x00\x01", b"\x01\x00")
+
+    def __init__(self, videos):
+        self.videos = videos
+        self._selected = bytearray(len(videos))  # 1 for each checked row
+        self.selected_count = 0
+        self.filter_text = ""
+        self.visible = range(len(videos))  # Positions of the rows matching the filter
+        self._search_text = None  # Lower-cased "index title" of every row, built on first filter
+
+    def __len__(self):
+        return len(self.videos)
+
+    def is_selected(self, position):
+        return bool(self._selected[position])
+
+    def set_selected(self, position, selected):
+        if self.is_selected(position) != bool(selected):
+            self._selected[position] = 1 if selected else 0
+            self.selected_count += 1 if selected else -1
+
+    def toggle(self, position):
+        self.set_selected(position, not self._selected[position])
+
+    def select_all(self):
+        """Check every row matching the filter."""
+        self._set_visible(1)
+
+    def select_none(self):
+        """Uncheck every row matching the filter."""
+        self._set_visible(0)
+
+    def invert(self):
+        """Flip every row matching the filter."""
+        if self.filter_text:
+            for position in self.visible:
+                self._selected[position] ^= 1
+        else:
+            self._selected = self._selected.translate(self._INVERT)
+        self.selected_count = self._selected.count(1)
+
+    def select_range(self, start, end):
+        """Check entries start to end (1-based, inclusive) and uncheck all others."""
+        start, end = max(start, 1), min(end, len(self.videos))
+        self._selected = bytearray(len(self.videos))
+        if start <= end:
+            self._selected[start - 1:end] = b"\x01" * (end - start + 1)
+        self.selected_count = self._selected.count(1)
+
+    def _set_visible(self, value):
+        if self.filter_text:
+            for position in self.visible:
+                self._selected[position] = value
+        else:
+            self._selected = bytearray([value]) * len(self.videos)
+        self.selected_count = self._selected.count(1)
+
+    def set_filter(self, text):
+        """Show only the rows whose index or title contains text, ignoring case. Returns their positions."""
+        self.filter_text = text.strip().lower()
+        if not self.filter_text:
+            self.visible = range(len(self.videos))
+            return self.visible
+        if self._search_text is None:
+            self._search_text = [f"{video.get('index', position + 1)} {video.get('title', '')}".lower()
+                                 for position, video in enumerate(self.videos)]
+        self.visible = [position for position, text in enumerate(self._search_text) if self.filter_text in text]
+        return self.visible
+
+    def selected_indices(self):
+        """1-based playlist indices of the checked rows, whether or not they match the filter."""
+        return [position + 1 for position, selected in enumerate(self._selected) if selected]
 
 
 class DownloaderGUI:
@@ -905,6 +3062,10 @@ class DownloaderGUI:
         self.selected_videos = []
         self.range_var = tk.StringVar()
         self.is_downloading = False
+        self.last_phase = None  # Phase of the last progress event shown
+        
+        # Progress events arrive on download threads, apply them on the Tk thread
+        self.downloader.add_progress_listener(lambda event: self.root.after(0, self.update_progress, event))
         
         self.setup_ui()
     
@@ -965,6 +3126,11 @@ class DownloaderGUI:
         )
         quality_combo.pack(side=tk.LEFT, padx=5)
         
+        # Off by default, the archive skips a video whatever quality or folder it was saved with
+        self.archive_var = tk.BooleanVar(value=self.downloader.use_download_archive)
+        ttk.Checkbutton(quality_frame, text="Skip videos in the download archive",
+                        variable=self.archive_var).pack(side=tk.LEFT, padx=15)
+        
         # Store reference to quality_frame for later use
         self.quality_frame = quality_frame
         
@@ -1067,9 +3233,7 @@ class DownloaderGUI:
     
     def resume_download(self):
         """Resume a paused download."""
-        if self.downloader.resume_download(
-            progress_callback=lambda p, s: self.root.after(0, self.update_progress, p, s)
-        ):
+        if self.downloader.resume_download():
             self.status_var.set("Resuming download...")
             self.update_download_controls(downloading=True, paused=False)
     
@@ -1116,17 +3280,18 @@ class DownloaderGUI:
             self.status_var.set("Ready to download web video")
             self.download_btn.config(state=tk.NORMAL)
     
-    def update_progress(self, progress, status):
-        """Update progress bar and status text."""
-        self.progress_var.set(progress)
-        self.status_var.set(status)
-        
-        # Update control buttons based on status text
-        if "paused" in status.lower():
+    def update_progress(self, event):
+        """Update progress bar and status text from a ProgressEvent."""
+        self.last_phase = event.phase
+        self.progress_var.set(event.percent)
+        self.status_var.set(event.message)
+        
+        # Update control buttons based on the download phase
+        if event.phase == ProgressEvent.PAUSED:
             self.update_download_controls(downloading=True, paused=True)
-        elif "complete" in status.lower() or "cancelled" in status.lower() or "error" in status.lower():
+        elif event.is_final:
             self.update_download_controls(downloading=False)
-        elif progress > 0:
+        elif event.percent > 0:
             self.update_download_controls(downloading=True, paused=False)
             
         self.root.update_idletasks()
@@ -1166,6 +3331,8 @@ class DownloaderGUI:
             else:  # "full"
                 playlist_option = "full"
         
+        self.downloader.use_download_archive = self.archive_var.get()
+        
         # Update button states
         self.update_download_controls(downloading=True, paused=False)
         self.status_var.set("Preparing download...")
@@ -1184,7 +3351,6 @@ class DownloaderGUI:
             url, 
             quality, 
             output_path,
-            progress_callback=lambda p, s: self.root.after(0, self.update_progress, p, s),
             playlist_option=playlist_option,
             playlist_items=playlist_items
         )
@@ -1192,7 +3358,9 @@ class DownloaderGUI:
         def finish():
             if not self.downloader.is_paused:
                 self.update_download_controls(downloading=False)
-                if success:
+                if success and self.last_phase == ProgressEvent.SKIPPED:
+                    messagebox.showinfo("Skipped", "This video is already in the download archive, nothing was downloaded.")
+                elif success:
                     messagebox.showinfo("Success", "Download completed successfully!")
                 else:
                     messagebox.showerror("Error", "Failed to download. See console for details.")
@@ -1216,6 +3384,10 @@ class DownloaderGUI:
             
             # Define a progress callback that will update the UI
             def fetch_progress_callback(current, total, status_text, force_update=False):
+                # Updates can still be queued after the fetch finished and the label is gone
+                if not fetch_status_label.winfo_exists():
+                    return
+                
                 # Calculate elapsed time
                 elapsed = time.time() - start_time
                 
@@ -1272,11 +3444,8 @@ class DownloaderGUI:
                     self.status_var.set(f"{status_text}")
                     fetch_status_label.config(text="Preparing to fetch videos...")
                 
-                # Force immediate UI update to ensure the status and progress are visible
-                if force_update:
-                    self.root.update()  # More aggressive update
-                else:
-                    self.root.update_idletasks()
+                # Updates arrive on the main thread at a limited rate, so idle tasks are enough to repaint
+                self.root.update_idletasks()
                     
                 # Log to console without the eta_text variable if it's not defined
                 if current > 1 and total > 0:
@@ -1285,7 +3454,8 @@ class DownloaderGUI:
                     print(f"Progress update: {status_text}")
             
             # Fetch the video info with our callback
-            self.video_info = self.downloader.get_video_info(url, fetch_progress_callback)
+            self.video_info = self.downloader.get_video_info(url, 
+                lambda *args: self.root.after(0, fetch_progress_callback, *args))
             
             # Clean up the fetch status frame
             fetch_status_frame.destroy()
@@ -1343,6 +3513,10 @@ class DownloaderGUI:
             
             # Define a progress callback that will update the UI
             def fetch_progress_callback(current, total, status_text, force_update=False):
+                # Updates can still be queued after the fetch finished and the label is gone
+                if not fetch_status_label.winfo_exists():
+                    return
+                
                 # Calculate elapsed time
                 elapsed = time.time() - start_time
                 
@@ -1399,11 +3573,8 @@ class DownloaderGUI:
                     self.status_var.set(f"{status_text}")
                     fetch_status_label.config(text="Preparing to fetch videos...")
                 
-                # Force immediate UI update to ensure the status and progress are visible
-                if force_update:
-                    self.root.update()  # More aggressive update
-                else:
-                    self.root.update_idletasks()
+                # Updates arrive on the main thread at a limited rate, so idle tasks are enough to repaint
+                self.root.update_idletasks()
                     
                 # Log to console without the eta_text variable if it's not defined
                 if current > 1 and total > 0:
@@ -1411,8 +3582,37 @@ class DownloaderGUI:
                 else:
                     print(f"Progress update: {status_text}")
             
-            # Fetch the playlist info with our callback
-            self.playlist_info = self.downloader.get_playlist_info(url, fetch_progress_callback)
+            # Entries arrive a page at a time, so the playlist shows up after its first page
+            playlist = {'title': 'Unknown Playlist'}
+            videos = []
+            total_duration = 0
+            listing_done = [False]
+            
+            def show_partial(count, duration):
+                # Queued updates can run after the final ones below
+                if listing_done[0]:
+                    return
+                self.info_title_var.set(playlist['title'])
+                self.info_details_var.set(f"Videos: {count} so far...")
+                self.info_duration_var.set(f"Total duration: {self.downloader._format_total_duration(duration)} so far")
+                self.info_frame.pack(fill=tk.X, padx=5, pady=5, after=self.quality_frame)
+            
+            for video in self.downloader.iter_playlist_entries(
+                    url, fetch_progress_callback=lambda *args: self.root.after(0, fetch_progress_callback, *args),
+                    playlist_callback=playlist.update):
+                videos.append(video)
+                total_duration += video['duration']
+                if len(videos) % 100 == 1:
+                    self.root.after(0, show_partial, len(videos), total_duration)
+            listing_done[0] = True
+            
+            self.playlist_info = {
+                'title': playlist['title'],
+                'total_videos': len(videos),
+                'total_duration': total_duration,
+                'total_duration_str': self.downloader._format_total_duration(total_duration),
+                'videos': videos
+            } if videos else None
             
             # Clean up the fetch status frame
             fetch_status_frame.destroy()
@@ -1480,7 +3680,6 @@ class DownloaderGUI:
         select_dialog.grab_set()
         select_dialog.resizable(True, True)  # Allow resizing
         
-        # Create a frame with scrollable content
         frame = ttk.Frame(select_dialog, padding=10)
         frame.pack(fill=tk.BOTH, expand=True)
         
@@ -1495,120 +3694,97 @@ class DownloaderGUI:
         ttk.Label(details_frame, text=f"Total videos: {self.playlist_info.get('total_videos', 0)}").pack(side=tk.LEFT, padx=(0, 20))
         ttk.Label(details_frame, text=f"Total duration: {self.playlist_info.get('total_duration_str', '0:00')}").pack(side=tk.LEFT)
         
-        # Create a canvas with scrollbar for the video list
-        canvas_frame = ttk.Frame(frame)
-        canvas_frame.pack(fill=tk.BOTH, expand=True)
-        
-        # Create header for columns
-        header_frame = ttk.Frame(frame)
-        header_frame.pack(fill=tk.X, pady=(5, 0))
-        
-        ttk.Label(header_frame, text="#", width=5, anchor=tk.W, font=('Helvetica', 10, 'bold')).pack(side=tk.LEFT)
-        ttk.Label(header_frame, text="Title", anchor=tk.W, font=('Helvetica', 10, 'bold')).pack(side=tk.LEFT, fill=tk.X, expand=True)
-        ttk.Label(header_frame, text="Duration", width=10, anchor=tk.E, font=('Helvetica', 10, 'bold')).pack(side=tk.RIGHT)
-        
-        # Separator below header
-        ttk.Separator(frame, orient=tk.HORIZONTAL).pack(fill=tk.X, pady=(5, 0))
-        
-        canvas = tk.Canvas(canvas_frame, highlightthickness=0)
-        scrollbar = ttk.Scrollbar(canvas_frame, orient="vertical", command=canvas.yview)
-        scrollable_frame = ttk.Frame(canvas)
-        
-        scrollable_frame.bind(
-            "<Configure>",
-            lambda e: canvas.configure(scrollregion=canvas.bbox("all"))
-        )
-        
-        canvas.create_window((0, 0), window=scrollable_frame, anchor="nw")
-        canvas.configure(yscrollcommand=scrollbar.set)
-        
-        # Add checkboxes for each video
-        video_vars = []
-        
-        # Get the videos
-        videos = self.playlist_info['videos']
-        
-        # Alternate row colors for better readability
-        colors = ['#f0f0f0', 'white']
-        
-        for i, video in enumerate(videos):
-            var = tk.BooleanVar(value=False)
-            video_vars.append(var)
-            
-            # Create a frame for each video with alternating background color
-            video_frame = ttk.Frame(scrollable_frame)
-            video_frame.pack(fill=tk.X, pady=1, anchor=tk.W)
-            
-            # Get the video details
-            index = video.get('index', i+1)
-            title = video.get('title', f'Video {i+1}')
-            duration_str = video.get('duration_str', '0:00')
-            
-            # Row content
-            row_frame = ttk.Frame(video_frame)
-            row_frame.pack(fill=tk.X, expand=True)
-            
-            # Set a different color for odd and even rows
-            bg_color = colors[i % 2]
-            
-            # Index checkbox
-            cb = ttk.Checkbutton(row_frame, text=f"{index}", variable=var, width=5)
-            cb.pack(side=tk.LEFT, anchor=tk.W)
-            
-            # Title - use a fixed label instead of a StringVar for better compatibility
-            title_text = title
-            if len(title_text) > 60:
-                title_text = title_text[:57] + "..."
-                
-            title_label = ttk.Label(row_frame, text=title_text, anchor=tk.W)
-            title_label.pack(side=tk.LEFT, fill=tk.X, expand=True, padx=(0, 10))
-            
-            # Create tooltip for long titles
-            def create_tooltip(widget, text):
-                def show_tooltip(event):
-                    x, y, _, _ = widget.bbox("all")
-                    x += widget.winfo_rootx() + 25
-                    y += widget.winfo_rooty() + 25
-                    
-                    # Create a toplevel window
-                    tooltip = tk.Toplevel(widget)
-                    tooltip.wm_overrideredirect(True)   
-                    tooltip.wm_geometry(f"+{x}+{y}")
-                    
-                    label = ttk.Label(tooltip, text=text, wraplength=400, 
-                                   background="#ffffe0", relief="solid", borderwidth=1)
-                    label.pack()
-                    
-                    def hide_tooltip(event=None):
-                        tooltip.destroy()
-                    
-                    widget.tooltip = tooltip
-                    widget.bind("<Leave>", hide_tooltip)
-                    
-                if len(text) > 40:  # Only show tooltip for long titles
-                    widget.bind("<Enter>", show_tooltip)
-            
-            create_tooltip(title_label, title)
-            
-            # Duration
-            ttk.Label(row_frame, text=duration_str, width=10, anchor=tk.E).pack(side=tk.RIGHT)
-            
-            # Add a subtle separator between rows
-            ttk.Separator(video_frame, orient=tk.HORIZONTAL).pack(fill=tk.X, pady=(3, 0))
-        
-        # Configure the canvas to expand with the window
-        canvas.pack(side=tk.LEFT, fill=tk.BOTH, expand=True, padx=5, pady=5)
-        scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
-        
-        # Make sure the scrollable area adjusts when the window size changes
-        canvas_frame.bind("<Configure>", lambda e: canvas.configure(width=e.width-20))
-        
-        # Allow mouse wheel scrolling - bind only to the canvas widget itself, not globally
-        def _on_mousewheel(event):
-            canvas.yview_scroll(int(-1*(event.delta/120)), "units")
-        
-        # Bind mousewheel to the canvas only
-        canvas.bind("<MouseWheel>", _on_mousewheel)
+        # Type-to-filter search box
+        filter_frame = ttk.Frame(frame)
+        filter_frame.pack(fill=tk.X, pady=(0, 5))
+        ttk.Label(filter_frame, text="Filter:").pack(side=tk.LEFT, padx=(0, 5))
+        filter_var = tk.StringVar()
+        filter_entry = ttk.Entry(filter_frame, textvariable=filter_var)
+        filter_entry.pack(side=tk.LEFT, fill=tk.X, expand=True)
+        
+        # The checked state lives in the model. The Treeview only draws the rows on
+        # screen, so the dialog opens quickly and stays light even for huge playlists.
+        model = PlaylistSelectionModel(self.playlist_info['videos'])
+        
+        list_frame = ttk.Frame(frame)
+        list_frame.pack(fill=tk.BOTH, expand=True)
+        
+        columns = ("selected", "index", "title", "size", "duration")
+        tree = ttk.Treeview(list_frame, columns=columns, show="headings", selectmode="extended")
+        tree.heading("selected", text="")
+        tree.heading("index", text="#", anchor=tk.W)
+        tree.heading("title", text="Title", anchor=tk.W)
+        tree.heading("size", text="Size", anchor=tk.E)
+        tree.heading("duration", text="Duration", anchor=tk.E)
+        tree.column("selected", width=30, minwidth=30, stretch=False, anchor=tk.CENTER)
+        tree.column("index", width=60, minwidth=40, stretch=False, anchor=tk.W)
+        tree.column("title", width=480, anchor=tk.W)
+        tree.column("size", width=80, minwidth=60, stretch=False, anchor=tk.E)
+        tree.column("duration", width=90, minwidth=60, stretch=False, anchor=tk.E)
+        
+        scrollbar = ttk.Scrollbar(list_frame, orient="vertical", command=tree.yview)
+        
+        def format_size(size):
+            if not size:
+                return "?"
+            for unit in ("B", "KB", "MB"):
+                if size < 1024:
+                    return f"{size:.0f} {unit}"
+                size /= 1024
+            return f"{size:.1f} GB"
+        
+        def size_text(video):
+            # Known once the entry's details were fetched, see Fetch Details below
+            return format_size(video['details'].get('filesize')) if video.get('details') else ""
+        
+        def check_mark(position):
+            return "☑" if model.is_selected(position) else "☐"
+        
+        for position, video in enumerate(model.videos):
+            tree.insert("", tk.END, iid=str(position), values=(
+                check_mark(position),
+                video.get('index', position + 1),
+                video.get('title', f'Video {position + 1}'),
+                size_text(video),
+                video.get('duration_str', '0:00'),
+            ))
+        
+        def refresh_rows():
+            # Redraw the check marks of the rows on screen, worked out from the scroll position
+            # (identify_row near the top would hit the heading). Rows further away are brought
+            # up to date when they are scrolled into view.
+            first, last = tree.yview()
+            count = len(model.visible)
+            for position in model.visible[int(first * count):min(count, int(last * count) + 1)]:
+                tree.set(str(position), "selected", check_mark(position))
+        
+        def on_scroll(first, last):
+            scrollbar.set(first, last)
+            refresh_rows()
+        
+        tree.configure(yscrollcommand=on_scroll)
+        tree.pack(side=tk.LEFT, fill=tk.BOTH, expand=True, padx=(5, 0), pady=5)
+        scrollbar.pack(side=tk.RIGHT, fill=tk.Y, pady=5)
+        
+        # Full title of the highlighted row, since long titles are cut off in the list
+        title_var = tk.StringVar()
+        ttk.Label(frame, textvariable=title_var, anchor=tk.W, wraplength=760).pack(fill=tk.X, pady=(5, 0))
+        
+        def show_title(event=None):
+            row = tree.focus()
+            if not row:
+                title_var.set("")
+                return
+            text = tree.set(row, "title")
+            details = model.videos[int(row)].get('details')
+            if details:
+                heights = sorted({f['height'] for f in details.get('formats', []) if f.get('height')})
+                text += f" - {details.get('channel')}"
+                if heights:
+                    text += f", up to {heights[-1]}p"
+            title_var.set(text)
+        
+        tree.bind("<<TreeviewSelect>>", show_title)
         
         # Selection controls
         control_frame = ttk.Frame(frame)
@@ -1618,17 +3794,66 @@ class DownloaderGUI:
         btn_frame = ttk.Frame(control_frame)
         btn_frame.pack(fill=tk.X)
         
+        # Selection info with a StringVar to update dynamically
+        selection_info = tk.StringVar()
+        
+        def selection_changed():
+            text = f"Selected: {model.selected_count}/{len(model)}"
+            if model.filter_text:
+                text += f" (showing {len(model.visible)})"
+            selection_info.set(text)
+            refresh_rows()
+        
+        # Clicking the check mark or double-clicking a row toggles it, space toggles the highlighted rows
+        def on_click(event):
+            row = tree.identify_row(event.y)
+            if row and tree.identify_column(event.x) == "#1":
+                model.toggle(int(row))
+                selection_changed()
+        
+        def on_double_click(event):
+            row = tree.identify_row(event.y)
+            if row and tree.identify_column(event.x) != "#1":
+                model.toggle(int(row))
+                selection_changed()
+        
+        def on_space(event):
+            for row in tree.selection():
+                model.toggle(int(row))
+            selection_changed()
+            return "break"
+        
+        tree.bind("<Button-1>", on_click)
+        tree.bind("<Double-1>", on_double_click)
+        tree.bind("<space>", on_space)
+        
+        # Filtering waits for a pause in typing, then shows the matching rows in one call
+        pending_filter = [None]
+        
+        def apply_filter():
+            pending_filter[0] = None
+            visible = model.set_filter(filter_var.get())
+            tree.set_children("", *map(str, visible))
+            selection_changed()
+        
+        def on_filter_change(*args):
+            if pending_filter[0]:
+                select_dialog.after_cancel(pending_filter[0])
+            pending_filter[0] = select_dialog.after(150, apply_filter)
+        
+        filter_var.trace_add("write", on_filter_change)
+        
         def select_all():
-            for var in video_vars:
-                var.set(True)
+            model.select_all()
+            selection_changed()
                 
         def select_none():
-            for var in video_vars:
-                var.set(False)
+            model.select_none()
+            selection_changed()
                 
         def invert_selection():
-            for var in video_vars:
-                var.set(not var.get())
+            model.invert()
+            selection_changed()
                 
         def select_range():
             try:
@@ -1639,55 +3864,79 @@ class DownloaderGUI:
                     
                 # Parse range
                 start, end = map(int, range_input.split('-'))
-                if start < 1:
-                    start = 1
-                if end > len(video_vars):
-                    end = len(video_vars)
-                    
-                # Select the range
-                for i in range(len(video_vars)):
-                    # +1 because range is 1-based, but our list is 0-based
-                    is_in_range = start <= (i+1) <= end
-                    video_vars[i].set(is_in_range)
             except:
                 messagebox.showerror("Error", "Invalid range format. Use start-end (e.g., 1-5)", 
                                   parent=select_dialog)
+                return
+            model.select_range(start, end)
+            selection_changed()
         
         ttk.Button(btn_frame, text="Select All", command=select_all).pack(side=tk.LEFT, padx=5)
         ttk.Button(btn_frame, text="Select None", command=select_none).pack(side=tk.LEFT, padx=5)
         ttk.Button(btn_frame, text="Invert Selection", command=invert_selection).pack(side=tk.LEFT, padx=5)
         ttk.Button(btn_frame, text="Select Range...", command=select_range).pack(side=tk.LEFT, padx=5)
-        
-        # Selection info with a StringVar to update dynamically
-        selection_info = tk.StringVar(value=f"Selected: 0/{len(video_vars)}")
         ttk.Label(btn_frame, textvariable=selection_info).pack(side=tk.RIGHT, padx=5)
-        
-        # Update selected count when checkbox state changes
-        def update_selection_count(*args):
-            selected = sum(1 for var in video_vars if var.get())
-            selection_info.set(f"Selected: {selected}/{len(video_vars)}")
+        selection_changed()
+        
+        # Full details of the checked entries are fetched in the background, and the
+        # fetch is cancelled when the dialog closes
+        hydrate_frame = ttk.Frame(control_frame)
+        hydrate_frame.pack(fill=tk.X, pady=(5, 0))
+        details_var = tk.StringVar()
+        details_cancel = threading.Event()
+        
+        def show_details(position, details):
+            if details_cancel.is_set():
+                return
+            tree.set(str(position), "size", format_size(details.get('filesize')) if details else "failed")
+            if tree.focus() == str(position):
+                show_title()
+        
+        def show_details_progress(current, total, status_text, force_update=False):
+            if not details_cancel.is_set():
+                details_var.set(status_text)
+        
+        def fetch_details():
+            positions = [position for position in range(len(model)) if model.is_selected(position)]
+            if not positions:
+                messagebox.showinfo("Fetch Details", "Check the videos to fetch details for first.", parent=select_dialog)
+                return
+            fetch_btn.config(state=tk.DISABLED)
+            details_var.set(f"Fetching details of {len(positions)} videos...")
+            
+            def run():
+                def on_result(i, video, details):
+                    if not details_cancel.is_set():
+                        select_dialog.after(0, show_details, positions[i], details)
+                
+                def on_progress(*args):
+                    if not details_cancel.is_set():
+                        select_dialog.after(0, show_details_progress, *args)
+                
+                self.downloader.hydrate_playlist_entries(
+                    [model.videos[position] for position in positions], details_cancel, on_result, on_progress)
+                if not details_cancel.is_set():
+                    select_dialog.after(0, lambda: fetch_btn.config(state=tk.NORMAL))
             
-        # Bind checkboxes to update selection count
-        for var in video_vars:
-            var.trace_add("write", update_selection_count)
+            threading.Thread(target=run, daemon=True).start()
+        
+        fetch_btn = ttk.Button(hydrate_frame, text="Fetch Details", command=fetch_details)
+        fetch_btn.pack(side=tk.LEFT, padx=5)
+        ttk.Label(hydrate_frame, textvariable=details_var).pack(side=tk.LEFT, padx=5)
         
         # Add OK/Cancel buttons
         action_frame = ttk.Frame(frame)
         action_frame.pack(fill=tk.X, pady=10)
         
-        # Helper function to ensure cleanup when dialog is closed
         def cleanup_and_close():
-            try:
-                # Unbind mousewheel event to prevent errors after dialog closes
-                canvas.unbind("<MouseWheel>")
-            except Exception as e:
-                print(f"Warning during cleanup: {e}")
-            finally:
-                select_dialog.destroy()
+            details_cancel.set()
+            if pending_filter[0]:
+                select_dialog.after_cancel(pending_filter[0])
+            select_dialog.destroy()
                 
         def on_ok():
             # Get selected video indices (1-based for yt-dlp)
-            self.selected_videos = [i+1 for i, var in enumerate(video_vars) if var.get()]
+            self.selected_videos = model.selected_indices()
             cleanup_and_close()
             if self.selected_videos:
                 self.status_var.set(f"Selected {len(self.selected_videos)} videos")
@@ -1704,6 +3953,8 @@ class DownloaderGUI:
         ttk.Button(action_frame, text="Download Selected", command=on_ok).pack(side=tk.RIGHT, padx=5)
         ttk.Button(action_frame, text="Cancel", command=on_cancel).pack(side=tk.RIGHT)
         
+        filter_entry.focus_set()
+        
         # Wait for the dialog to close
         self.root.wait_window(select_dialog)
     
@@ -1715,7 +3966,7 @@ class DownloaderGUI:
 
 def main():
     parser = argparse.ArgumentParser(description="Video Downloader for YouTube and Web")
-    parser.add_argument("url", nargs="?", help="URL of the video or playlist to download")
+    parser.add_argument("url", nargs="*", help="URL(s) of the videos or playlists to download")
     parser.add_argument("-q", "--quality", 
                         choices=["2160p", "1440p", "1080p", "720p", "480p", "360p", "highest", "audio only"], 
                         default="highest", 
@@ -1724,6 +3975,23 @@ def main():
     parser.add_argument("-g", "--gui", action="store_true", help="Launch the GUI interface")
     parser.add_argument("--playlist-range", help="Download range of videos from playlist (e.g. 1-5)")
     parser.add_argument("--playlist-items", help="Download specific items from playlist (comma-separated indices, e.g. 1,3,5)")
+    parser.add_argument("--connections", type=int, default=4,
+                        help="Number of parallel connections for web downloads (default: 4, 1 disables segmenting)")
+    parser.add_argument("--playlist-workers", type=int, default=3,
+                        help="Number of playlist videos to download at the same time (default: 3)")
+    parser.add_argument("--postprocess-workers", type=int,
+                        help="Number of playlist videos merged or converted at the same time (default: CPU cores)")
+    parser.add_argument("--no-cache", action="store_true",
+                        help="Don't use the metadata cache, always extract video info from the network")
+    parser.add_argument("--download-archive", metavar="FILE",
+                        help="Record downloaded videos in FILE and skip them on later runs")
+    parser.add_argument("--limit-rate", metavar="RATE",
+                        help="Maximum total download rate in bytes per second, shared by all downloads (e.g. 500K, 2M)")
+    parser.add_argument("-j", "--jobs", type=int,
+                        help="Number of downloads to run at once when several URLs are given "
+                             "(default: 3, or 100 with --async-web)")
+    parser.add_argument("--async-web", action="store_true",
+                        help="Download direct web URLs with the asyncio engine, suited to many short files")
     
     args = parser.parse_args()
     
@@ -1734,28 +4002,77 @@ def main():
         root.mainloop()
         return
     
-    # Command line mode
+    # Command line mode, which never imports tkinter
+    import colorama
+    colorama.init()
     downloader = VideoDownloader()
+    downloader.connections = max(1, args.connections)
+    downloader.playlist_workers = max(1, args.playlist_workers)
+    if args.postprocess_workers:
+        downloader.postprocess_workers = max(1, args.postprocess_workers)
+    downloader.use_metadata_cache = not args.no_cache
+    if args.limit_rate:
+        rate = yt_dlp.utils.parse_bytes(args.limit_rate)
+        if not rate:
+            parser.error(f"invalid rate limit: {args.limit_rate}")
+        downloader.set_rate_limit(rate)
+    if args.download_archive:
+        downloader.use_download_archive = True
+        downloader.download_archive = DownloadArchive(args.download_archive)
     output_path = args.output if args.output else downloader.download_path
     
-    if not downloader.validate_url(args.url):
-        print("Invalid URL. Please provide a valid URL.")
-        return
+    def print_progress(event):
+        # Prefix updates with the job id when several downloads run at once
+        prefix = f"[{event.job_id}] " if len(args.url) > 1 else ""
+        if event.phase == ProgressEvent.DOWNLOADING and len(args.url) == 1:
+            # Keep the running download on a single line
+            print(f"\r{event.message[:100]:<100}", end="", flush=True)
+        elif event.phase != ProgressEvent.DOWNLOADING or event.percent == 100:
+            print(f"\r{prefix}{event.message}")
     
-    # Handle playlist options for command line
-    playlist_option = None
-    playlist_items = None
+    downloader.add_progress_listener(print_progress)
+    
+    for url in args.url:
+        if not downloader.validate_url(url):
+            print(f"Invalid URL: {url}. Please provide a valid URL.")
+            return
     
-    if downloader.is_youtube_url(args.url) and downloader.is_playlist(args.url):
-        if args.playlist_items:
-            playlist_option = "specific"
-            playlist_items = [int(i) for i in args.playlist_items.split(',')]
-        elif args.playlist_range:
-            playlist_option = "range"
-            playlist_items = args.playlist_range
+    def playlist_options(url):
+        # Handle playlist options for command line
+        if downloader.is_youtube_url(url) and downloader.is_playlist(url):
+            if args.playlist_items:
+                return "specific", [int(i) for i in args.playlist_items.split(',')]
+            elif args.playlist_range:
+                return "range", args.playlist_range
+        return None, None
     
-    downloader.download_video(args.url, args.quality, output_path, 
-                            playlist_option=playlist_option, playlist_items=playlist_items)
+    try:
+        if args.async_web:
+            if any(downloader.is_youtube_url(url) for url in args.url):
+                parser.error("--async-web only handles direct web URLs, not YouTube")
+            jobs = downloader.download_web_videos(args.url, output_path, args.jobs or downloader.async_concurrency)
+            if len(jobs) > 1:
+                for job in jobs:
+                    print(f"[{job.status}] {job.url}")
+            return
+        
+        if len(args.url) == 1:
+            playlist_option, playlist_items = playlist_options(args.url[0])
+            downloader.download_video(args.url[0], args.quality, output_path, 
+                                    playlist_option=playlist_option, playlist_items=playlist_items)
+            return
+        
+        # Several URLs: download them concurrently, each as its own job
+        queue = DownloadQueue(downloader, max_workers=max(1, args.jobs or 3))
+        for url in args.url:
+            playlist_option, playlist_items = playlist_options(url)
+            queue.submit(url, args.quality, output_path, playlist_option, playlist_items)
+        queue.wait_all()
+        queue.shutdown()
+        for job in queue.list_jobs():
+            print(f"[{job.status}] {job.url}")
+    finally:
+        downloader.close()
 
 if __name__ == "__main__":
     main()